@@ -0,0 +1,64 @@
+"""
+Compare HTMLNode serialization strategies on a large markdown document.
+
+Builds a ~5 MB synthetic markdown document, parses it once, then measures
+wall time and peak traced memory for:
+
+- to_html:  building the whole document as one string
+- join:     a single "".join over iter_html()
+- write_to: streaming the fragments straight into a file
+
+Usage:
+    python3 benchmarks/bench_html_serialization.py [--size-mb 5] [--seed 0]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from corpus import generate_markdown
+from markdown_to_html import markdown_to_html_node
+
+def measure(name, func):
+    # Time without tracing first, since tracemalloc slows allocation down
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<10} {elapsed * 1000:10.1f} ms {peak / (1024 * 1024):10.2f} MiB peak")
+    return elapsed, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mb", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    markdown = generate_markdown(int(args.size_mb * 1024 * 1024), args.seed)
+    node = markdown_to_html_node(markdown)
+    expected = node.to_html()
+    assert "".join(node.iter_html()) == expected
+    print(f"Markdown: {len(markdown) / (1024 * 1024):.2f} MiB, HTML: {len(expected) / (1024 * 1024):.2f} MiB")
+    del expected
+
+    print(f"{'strategy':<10} {'wall':>13} {'memory':>16}")
+    measure("to_html", node.to_html)
+    measure("join", lambda: "".join(node.iter_html()))
+    with tempfile.TemporaryFile("w", encoding="utf-8") as file:
+        def write():
+            file.seek(0)
+            node.write_to(file)
+        measure("write_to", write)
+
+
+if __name__ == "__main__":
+    main()
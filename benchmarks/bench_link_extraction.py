@@ -0,0 +1,83 @@
+"""
+Compare link extraction and splitting on a paragraph with many links.
+
+The baseline is the previous implementation: re.findall followed by an
+uncompiled re.search over the whole text for every match to filter out
+images, then str.find on the remaining text for every link.
+
+Usage:
+    python3 benchmarks/bench_link_extraction.py [--links 10000] [--seed 0]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from htmlnode import TextNode, TextType
+from text_processing import split_nodes_link
+
+
+def generate_paragraph(links, seed=0):
+    """
+    Generate a paragraph with the given number of links and one image per
+    ten links, from a seeded RNG.
+    """
+    rng = random.Random(seed)
+    parts = []
+    for i in range(links):
+        parts.append(f"word{rng.randrange(1000)} [link {i}](/page/{i})")
+        if i % 10 == 0:
+            parts.append(f"![image {i}](/images/{i}.png)")
+    return " ".join(parts)
+
+
+def baseline_split_nodes_link(old_nodes):
+    new_nodes = []
+    for old_node in old_nodes:
+        text = old_node.text
+        matches = re.findall(r"\[(.*?)\]\((.*?)\)", text)
+        links = [(anchor, url) for anchor, url in matches
+                 if not re.search(r"!\[" + re.escape(anchor) + r"\]\(" + re.escape(url) + r"\)", text)]
+        remaining_text = text
+        for anchor_text, url in links:
+            link_syntax = f"[{anchor_text}]({url})"
+            start_pos = remaining_text.find(link_syntax)
+            if start_pos == -1:
+                continue
+            if start_pos > 0:
+                new_nodes.append(TextNode(remaining_text[:start_pos], TextType.TEXT))
+            new_nodes.append(TextNode(anchor_text, TextType.LINK).set_url(url))
+            remaining_text = remaining_text[start_pos + len(link_syntax):]
+        if remaining_text:
+            new_nodes.append(TextNode(remaining_text, TextType.TEXT))
+    return new_nodes
+
+
+def measure(name, func):
+    start = time.perf_counter()
+    nodes = func()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<10} {elapsed * 1000:10.1f} ms")
+    return [(node.text, node.text_type, node.url) for node in nodes]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--links", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    paragraph = generate_paragraph(args.links, args.seed)
+    print(f"Paragraph: {len(paragraph)} chars, {args.links} links")
+
+    baseline = measure("baseline", lambda: baseline_split_nodes_link([TextNode(paragraph, TextType.TEXT)]))
+    current = measure("finditer", lambda: split_nodes_link([TextNode(paragraph, TextType.TEXT)]))
+    assert baseline == current
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Seeded synthetic markdown for the benchmarks.
+
+The same size and seed always give the same document, so timings taken on
+different commits measure the same input.
+"""
+import random
+
+WORDS = ["the", "ring", "hobbit", "shire", "elf", "wizard", "mountain", "river",
+         "journey", "fellowship", "shadow", "light", "tower", "forest", "road"]
+
+
+def _sentence(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def _inline_paragraph(rng):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(20, 80))]
+    decorations = [
+        lambda: f"**{rng.choice(WORDS)}**",
+        lambda: f"_{rng.choice(WORDS)}_",
+        lambda: f"`{rng.choice(WORDS)}`",
+        lambda: f"[{rng.choice(WORDS)}](/blog/{rng.choice(WORDS)})",
+        lambda: f"![{rng.choice(WORDS)}](/images/{rng.choice(WORDS)}.png)",
+    ]
+    for _ in range(rng.randint(1, 5)):
+        words[rng.randrange(len(words))] = rng.choice(decorations)()
+    return " ".join(words)
+
+
+def generate_markdown(size_bytes, seed=0):
+    """
+    Generate a markdown document of roughly size_bytes.
+
+    The document starts with an h1 title and mixes paragraphs with inline
+    formatting, headings, quotes, code blocks and both kinds of list.
+
+    Args:
+        size_bytes: Approximate size of the document in bytes
+        seed: Seed for the random number generator
+
+    Returns:
+        The markdown text
+    """
+    rng = random.Random(seed)
+    blocks = ["# Benchmark Document"]
+    size = len(blocks[0])
+    while size < size_bytes:
+        kind = rng.random()
+        if kind < 0.5:
+            block = _inline_paragraph(rng)
+        elif kind < 0.6:
+            block = "#" * rng.randint(2, 6) + " " + _sentence(rng, 5)
+        elif kind < 0.7:
+            block = "\n".join(f"> {_sentence(rng, 10)}" for _ in range(rng.randint(1, 5)))
+        elif kind < 0.8:
+            block = "```\n" + "\n".join(_sentence(rng, 8) for _ in range(rng.randint(2, 10))) + "\n```"
+        elif kind < 0.9:
+            block = "\n".join(f"- {_inline_paragraph(rng)[:60]}" for _ in range(rng.randint(2, 20)))
+        else:
+            block = "\n".join(f"{i}. {_sentence(rng, 6)}" for i in range(1, rng.randint(2, 20)))
+        blocks.append(block)
+        size += len(block) + 2
+    return "\n\n".join(blocks)
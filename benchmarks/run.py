@@ -0,0 +1,177 @@
+"""
+Micro-benchmarks for each stage of the markdown pipeline.
+
+Each stage is timed with timeit over a seeded synthetic corpus and the best
+time per call is reported. Results are printed and can be written as JSON.
+Given a baseline JSON file, --compare flags every stage that got slower by
+more than the threshold and exits with status 1. The bytes per node of the
+node classes, before and after __slots__, are reported alongside.
+
+Usage:
+    python3 benchmarks/run.py --output benchmarks/baseline.json
+    python3 benchmarks/run.py --compare benchmarks/baseline.json --threshold 0.10
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from block_parser import block_to_block_type
+from corpus import generate_markdown
+from extract_title import extract_title
+from markdown_blocks import markdown_to_blocks
+from markdown_to_html import markdown_to_html_node, text_to_textnodes
+from node_memory import measure_node_memory, print_node_memory
+
+
+def build_stages(markdown):
+    """
+    Prepare the input for each stage and return a callable per stage.
+
+    Every stage gets its input precomputed so that only the stage itself is
+    timed.
+    """
+    blocks = markdown_to_blocks(markdown)
+    paragraphs = [block for block in blocks if not block.startswith(("```", "#"))]
+    node = markdown_to_html_node(markdown)
+
+    def classify_blocks():
+        for block in blocks:
+            block_to_block_type(block)
+
+    def parse_inline():
+        for paragraph in paragraphs:
+            text_to_textnodes(paragraph)
+
+    return {
+        "markdown_to_blocks": lambda: markdown_to_blocks(markdown),
+        "block_to_block_type": classify_blocks,
+        "text_to_textnodes": parse_inline,
+        "markdown_to_html_node": lambda: markdown_to_html_node(markdown),
+        "to_html": node.to_html,
+        "extract_title": lambda: extract_title(markdown),
+    }
+
+
+def run_benchmarks(size_bytes, seed=0, repeat=5, min_time=0.2, stages=None):
+    """
+    Time every stage.
+
+    Args:
+        size_bytes: Approximate size of the synthetic document
+        seed: Seed for the corpus generator
+        repeat: Number of timing rounds per stage
+        min_time: Minimum seconds each round should take
+        stages: Names of the stages to run (defaults to all)
+
+    Returns:
+        dict: The results, ready to be written as JSON
+    """
+    markdown = generate_markdown(size_bytes, seed)
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "size_bytes": len(markdown),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "stages": {},
+        "memory": measure_node_memory(),
+    }
+
+    for name, func in build_stages(markdown).items():
+        if stages and name not in stages:
+            continue
+        timer = timeit.Timer(func)
+        number, _ = timer.autorange()
+        number = max(1, int(number * min_time / 0.2))
+        times = [total / number for total in timer.repeat(repeat=repeat, number=number)]
+        results["stages"][name] = {
+            "best_s": min(times),
+            "median_s": statistics.median(times),
+            "number": number,
+        }
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare results with a baseline.
+
+    Args:
+        results: Results from run_benchmarks
+        baseline: Results loaded from a baseline JSON file
+        threshold: Allowed slowdown as a fraction (0.10 means 10%)
+
+    Returns:
+        list: (stage, baseline_s, current_s, ratio) for every regressed stage
+    """
+    regressions = []
+    for name, current in results["stages"].items():
+        previous = baseline["stages"].get(name)
+        if previous is None:
+            continue
+        ratio = current["best_s"] / previous["best_s"]
+        if ratio > 1 + threshold:
+            regressions.append((name, previous["best_s"], current["best_s"], ratio))
+    return regressions
+
+
+def print_results(results, baseline=None):
+    print(f"{'stage':<24} {'best':>12} {'median':>12} {'vs baseline':>12}")
+    for name, result in results["stages"].items():
+        line = f"{name:<24} {result['best_s'] * 1000:9.3f} ms {result['median_s'] * 1000:9.3f} ms"
+        if baseline and name in baseline["stages"]:
+            ratio = result["best_s"] / baseline["stages"][name]["best_s"]
+            line += f" {ratio:11.2f}x"
+        print(line)
+    print()
+    print_node_memory(results["memory"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the markdown pipeline stages")
+    parser.add_argument("--size-kb", type=int, default=256, help="Size of the synthetic document")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the corpus generator")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing rounds per stage")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per round")
+    parser.add_argument("--stage", action="append", help="Only run this stage (may be repeated)")
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    parser.add_argument("--compare", help="Baseline JSON to compare the results with")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Slowdown that counts as a regression (defaults to 0.10)")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+
+    results = run_benchmarks(args.size_kb * 1024, args.seed, args.repeat, args.min_time, args.stage)
+    if baseline is not None and baseline["meta"]["size_bytes"] != results["meta"]["size_bytes"]:
+        print("Warning: the baseline was recorded on a different corpus (check --size-kb and --seed)")
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+        print(f"Results written to {args.output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for name, previous, current, ratio in regressions:
+            print(f"REGRESSION {name}: {previous * 1000:.3f} ms -> {current * 1000:.3f} ms ({ratio:.2f}x)")
+        if regressions:
+            return 1
+        print(f"No stage regressed by more than {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,8 @@
 #!/bin/bash
 
-# Run the static site generator
+# Build the static site, then serve it on port 8888 and rebuild changed
+# pages on save. Open browser tabs reload automatically.
 echo "Generating static site..."
-python3 src/main.py
+python3 src/main.py --watch --port 8888
 
-# Start a simple HTTP server in the public directory
-echo "Starting HTTP server on port 8888..."
-cd docs && python3 -m http.server 8888
-
-echo "Server stopped."
\ No newline at end of file
+echo "Server stopped."
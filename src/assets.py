@@ -0,0 +1,135 @@
+import json
+import os
+from utility import fingerprint_file, open_for_replace
+
+# Written next to the static files it describes, so deploy tooling can
+# find every fingerprinted name
+ASSET_MANIFEST_FILENAME = "asset-manifest.json"
+ASSET_MANIFEST_VERSION = 1
+
+# Hex digits of the content hash put in a fingerprinted name
+HASH_LENGTH = 8
+
+
+def fingerprinted_name(rel_path, content_hash):
+    """
+    Return the name a static file is published under for a content hash.
+
+    Args:
+        rel_path: Path of the file relative to the static directory
+        content_hash: Hex digest of the file's contents
+
+    Returns:
+        The path with the shortened hash before its extension, such as
+        images/logo.1a2b3c4d.png
+    """
+    root, ext = os.path.splitext(rel_path)
+    return f"{root}.{content_hash[:HASH_LENGTH]}{ext}"
+
+
+def fingerprint_path(path, assets):
+    """
+    Map a site-relative URL path through an asset table.
+
+    Args:
+        path: A URL path without its leading slash, optionally followed by
+            a query string or fragment
+        assets: Dict of static file path -> fingerprinted name
+
+    Returns:
+        The path with the fingerprinted name, or path unchanged if it does
+        not name a static file
+    """
+    end = len(path)
+    for separator in "?#":
+        index = path.find(separator)
+        if index != -1:
+            end = min(end, index)
+    name = assets.get(path[:end])
+    if name is None:
+        return path
+    return name + path[end:]
+
+
+class AssetManifest:
+    """
+    Maps static files to content-fingerprinted names.
+
+    A file's fingerprinted name changes whenever its content does, so it can
+    be cached by browsers and CDNs forever. The manifest is saved as JSON in
+    the output directory and keeps two tables:
+    - assets: static path -> fingerprinted name, both relative to the
+      static directory
+    - fingerprints: static path -> size, mtime and content hash, so a file
+      whose stat data is unchanged is not hashed again on the next build
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.assets = {}
+        self.fingerprints = {}
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a manifest from disk, or return an empty one if the file is
+        missing, unreadable or written by a different manifest version.
+
+        Args:
+            path: Path to the manifest JSON file
+
+        Returns:
+            AssetManifest: The loaded manifest
+        """
+        manifest = cls(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return manifest
+
+        if data.get("version") != ASSET_MANIFEST_VERSION:
+            return manifest
+
+        manifest.assets = data.get("assets", {})
+        manifest.fingerprints = data.get("fingerprints", {})
+        return manifest
+
+    def save(self):
+        """
+        Write the manifest back to disk.
+        """
+        data = {
+            "version": ASSET_MANIFEST_VERSION,
+            "assets": self.assets,
+            "fingerprints": self.fingerprints,
+        }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open_for_replace(self.path) as file:
+            json.dump(data, file, indent=1, sort_keys=True)
+
+    def add(self, rel_path, source_path, stat=None):
+        """
+        Record a static file, hashing it only if its stat data changed.
+
+        Args:
+            rel_path: Path of the file relative to the static directory
+            source_path: Path to the file
+            stat: The file's os.stat result, if the caller already has it
+
+        Returns:
+            The fingerprinted name, relative to the static directory
+        """
+        content_hash = fingerprint_file(source_path, self.fingerprints, rel_path, stat)
+        name = fingerprinted_name(rel_path, content_hash)
+        self.assets[rel_path] = name
+        return name
+
+    def retain(self, rel_paths):
+        """
+        Forget every static file not in rel_paths.
+        """
+        rel_paths = set(rel_paths)
+        for table in (self.assets, self.fingerprints):
+            for rel_path in [rel_path for rel_path in table if rel_path not in rel_paths]:
+                del table[rel_path]
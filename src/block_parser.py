@@ -9,6 +9,10 @@ class BlockType(Enum):
     UNORDERED_LIST = 5
     ORDERED_LIST = 6
 
+# Matches a heading marker: 1-6 # characters followed by a space
+HEADING_PATTERN = re.compile(r"#{1,6} ")
+
+
 def block_to_block_type(block):
     """
     Determine the type of a markdown block.
@@ -19,65 +23,67 @@ def block_to_block_type(block):
     Returns:
         BlockType: The type of the markdown block
     """
-    # If the block is empty, it's a paragraph
-    if not block.strip():
-        return BlockType.PARAGRAPH
+    return classify_block(block)[0]
+
+
+def classify_block(block):
+    """
+    Determine the type of a markdown block and split it into lines.
+
+    The quote, unordered list and ordered list checks are all made in a
+    single sweep over the lines, which stops as soon as none of them can
+    match. The lines are returned so callers building the block's HTML
+    don't have to split it again.
     
+    Args:
+        block: A string containing a block of markdown text
+        
+    Returns:
+        tuple: (BlockType, list of the block's lines)
+    """
     # Split the block into lines to check patterns
     lines = block.split("\n")
-    first_line = lines[0] if lines else ""
+
+    # If the block is empty, it's a paragraph
+    if not block.strip():
+        return BlockType.PARAGRAPH, lines
     
     # Check for heading (starts with 1-6 # characters followed by a space)
-    if re.match(r"^#{1,6} ", first_line):
-        return BlockType.HEADING
+    if HEADING_PATTERN.match(block):
+        return BlockType.HEADING, lines
     
     # Check for code block (starts and ends with three backticks)
     if block.startswith("```") and block.endswith("```"):
-        return BlockType.CODE
+        return BlockType.CODE, lines
     
-    # Check for quote block (every line starts with >)
-    if all(line.startswith(">") for line in lines if line.strip()):
-        # Make sure there's at least one non-empty line
-        if any(line.strip() for line in lines):
-            return BlockType.QUOTE
+    # Every non-empty line must start with > for a quote, with "- " for an
+    # unordered list, or with "1. ", "2. ", ... in sequence for an ordered list
+    is_quote = True
+    is_unordered = True
+    is_ordered = True
+    item_number = 0
     
-    # Check for unordered list (every line starts with - followed by a space)
-    if all(line.startswith("- ") for line in lines if line.strip()):
-        # Make sure there's at least one non-empty line
-        if any(line.strip() for line in lines):
-            return BlockType.UNORDERED_LIST
+    for line in lines:
+        if not line.strip():
+            continue
+        if is_quote and not line.startswith(">"):
+            is_quote = False
+        if is_unordered and not line.startswith("- "):
+            is_unordered = False
+        if is_ordered:
+            item_number += 1
+            if not line.startswith(f"{item_number}. "):
+                is_ordered = False
+        if not (is_quote or is_unordered or is_ordered):
+            return BlockType.PARAGRAPH, lines
     
-    # Check for ordered list
-    if _is_ordered_list(lines):
-        return BlockType.ORDERED_LIST
+    # The block is not empty, so at least one line was checked
+    if is_quote:
+        return BlockType.QUOTE, lines
+    if is_unordered:
+        return BlockType.UNORDERED_LIST, lines
+    if is_ordered:
+        return BlockType.ORDERED_LIST, lines
     
     # Default to paragraph
-    return BlockType.PARAGRAPH
-
-
-def _is_ordered_list(lines):
-    """
-    Helper function to determine if lines form an ordered list.
-    
-    An ordered list must:
-    - Have each line start with a number followed by a . and a space
-    - The numbers must start at 1 and increment by 1 for each line
-    
-    Args:
-        lines: A list of strings representing lines of text
-        
-    Returns:
-        bool: True if the lines form an ordered list, False otherwise
-    """
-    # Filter out empty lines
-    non_empty_lines = [line for line in lines if line.strip()]
-    
-    if not non_empty_lines:
-        return False
-    
-    # Check if all lines start with a number followed by . and space
-    for i, line in enumerate(non_empty_lines, 1):
-        if not re.match(f"^{i}\\. ", line):
-            return False
-    
-    return True
\ No newline at end of file
+    return BlockType.PARAGRAPH, lines
@@ -0,0 +1,179 @@
+import json
+import os
+from utility import fingerprint_file, open_for_replace, remove_output
+
+MANIFEST_FILENAME = ".build-manifest.json"
+MANIFEST_VERSION = 1
+
+
+class BuildManifest:
+    """
+    Records what every generated page was built from so that unchanged
+    pages can be skipped on the next build.
+
+    The manifest keeps two tables:
+    - fingerprints: path -> size, mtime and content hash, so a file whose
+      stat data is unchanged is never re-read
+    - pages: source path -> source hash, template hash, basepath, the
+      output path relative to the destination directory and, when they are
+      collected, the link and image URLs in the page and the static file
+      table entries it used
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.fingerprints = {}
+        self.pages = {}
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a manifest from disk, or return an empty one if the file is
+        missing, unreadable or written by a different manifest version.
+
+        Args:
+            path: Path to the manifest JSON file
+
+        Returns:
+            BuildManifest: The loaded manifest
+        """
+        manifest = cls(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return manifest
+
+        if data.get("version") != MANIFEST_VERSION:
+            return manifest
+
+        manifest.fingerprints = data.get("fingerprints", {})
+        manifest.pages = data.get("pages", {})
+        return manifest
+
+    def save(self):
+        """
+        Write the manifest back to disk.
+        """
+        data = {
+            "version": MANIFEST_VERSION,
+            "fingerprints": self.fingerprints,
+            "pages": self.pages,
+        }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # Compact and encoded in one go, which uses the C encoder; with every
+        # page's links recorded, json.dump's pure Python one is slow
+        with open_for_replace(self.path) as file:
+            file.write(json.dumps(data, separators=(",", ":"), sort_keys=True))
+
+    def fingerprint(self, path):
+        """
+        Return the content hash of a file, re-reading it only when its size
+        or modification time differs from the recorded fingerprint.
+
+        Args:
+            path: Path to the file
+
+        Returns:
+            The hex digest of the file's contents
+        """
+        return fingerprint_file(path, self.fingerprints)
+
+    def is_fresh(self, source_path, output_path, source_hash, template_hash, basepath):
+        """
+        Check whether a page's recorded inputs match the current ones and its
+        output still exists.
+
+        Args:
+            source_path: Path to the markdown source
+            output_path: Output path relative to the destination directory
+            source_hash: Current hash of the markdown source
+            template_hash: Current hash of the template
+            basepath: Base path the page is being built for
+
+        Returns:
+            bool: True if the page does not need to be rendered again
+        """
+        entry = self.pages.get(source_path)
+        if entry is None:
+            return False
+
+        if (entry["hash"] != source_hash or
+                entry["template"] != template_hash or
+                entry["basepath"] != basepath or
+                entry["output"] != output_path):
+            return False
+
+        return os.path.exists(self.output_file(output_path))
+
+    def record(self, source_path, output_path, source_hash, template_hash, basepath, links=None,
+               dependencies=None):
+        """
+        Record the inputs a page was just rendered from, and optionally the
+        [kind, url] pairs of its links and images and the static file table
+        entries it used (see UrlResolver.dependencies).
+
+        If the same source was previously written to a different output path,
+        the old output file is removed.
+        """
+        previous = self.pages.get(source_path)
+        if previous is not None and previous["output"] != output_path:
+            self._remove_output(previous["output"])
+
+        self.pages[source_path] = {
+            "hash": source_hash,
+            "template": template_hash,
+            "basepath": basepath,
+            "output": output_path,
+        }
+        if links is not None:
+            self.pages[source_path]["links"] = links
+        if dependencies:
+            self.pages[source_path]["dependencies"] = dependencies
+
+    def remove_stale(self, current_sources):
+        """
+        Delete outputs whose source no longer exists and forget them.
+
+        Args:
+            current_sources: Collection of source paths seen in this build
+
+        Returns:
+            list: The output paths (relative to the destination) that were removed
+        """
+        current_sources = set(current_sources)
+        removed = []
+        for source_path in sorted(self.pages):
+            if source_path not in current_sources:
+                removed.append(self.forget(source_path))
+        return removed
+
+    def forget(self, source_path):
+        """
+        Delete the output recorded for a source and forget the source.
+
+        Args:
+            source_path: Path to the markdown source
+
+        Returns:
+            The output path (relative to the destination) that was removed,
+            or None if the source was not recorded
+        """
+        entry = self.pages.pop(source_path, None)
+        self.fingerprints.pop(source_path, None)
+        if entry is None:
+            return None
+        self._remove_output(entry["output"])
+        return entry["output"]
+
+    def output_file(self, output_path):
+        """
+        Resolve an output path relative to the directory holding the manifest.
+        """
+        return os.path.join(os.path.dirname(self.path), output_path)
+
+    def _remove_output(self, output_path):
+        path = self.output_file(output_path)
+        if os.path.exists(path):
+            remove_output(path)
+            print(f"Removed stale output: {path}")
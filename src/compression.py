@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from tracing import span
+from utility import open_for_replace
+
+# Records the content hash each .gz file was compressed from, so unchanged
+# outputs are not compressed again
+GZIP_MANIFEST_FILENAME = ".gzip-manifest.json"
+GZIP_MANIFEST_VERSION = 1
+
+# Outputs that get a pre-compressed .gz sibling. JSON is left out, as every
+# search shard and build table would get one too.
+COMPRESSIBLE_EXTENSIONS = (".html", ".css", ".js", ".svg", ".txt", ".xml")
+
+# zlib window bits selecting a gzip header and trailer
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def gzip_bytes(data):
+    """
+    Compress bytes into the gzip format at zlib's maximum level.
+
+    The header carries no timestamp, so the same input always gives the
+    same output.
+    """
+    compressor = zlib.compressobj(zlib.Z_BEST_COMPRESSION, zlib.DEFLATED, GZIP_WBITS, 9)
+    return compressor.compress(data) + compressor.flush()
+
+
+class CompressionReport:
+    """
+    Counts of what a compression pass did, with sizes per file type.
+    """
+
+    def __init__(self):
+        self.compressed_files = 0
+        self.skipped_files = 0
+        self.removed_files = 0
+        # (path relative to the output directory, error message) for each
+        # output that could not be compressed
+        self.failed = []
+        # Extension -> [files, original bytes, compressed bytes]
+        self.types = {}
+
+    def add(self, ext, original_bytes, compressed_bytes):
+        """
+        Count one output of the given type, compressed now or before.
+        """
+        totals = self.types.setdefault(ext, [0, 0, 0])
+        totals[0] += 1
+        totals[1] += original_bytes
+        totals[2] += compressed_bytes
+
+    def __repr__(self):
+        return (f"CompressionReport(compressed={self.compressed_files}, skipped={self.skipped_files}, "
+                f"removed={self.removed_files}, failed={len(self.failed)})")
+
+    def summary_lines(self):
+        """
+        Describe the pass and the compression ratio of each file type.
+        """
+        lines = [f"Compressed {self.compressed_files} files, skipped {self.skipped_files} unchanged, "
+                 f"removed {self.removed_files} stale .gz"]
+        if self.failed:
+            lines.append(f"Could not compress {len(self.failed)} files:")
+            lines.extend(f"  {rel_path}: {error}" for rel_path, error in self.failed)
+        for ext, (files, original, compressed) in sorted(self.types.items()):
+            ratio = compressed / original if original else 1.0
+            lines.append(f"  {ext:<6} {files:>5} files {original:>11} -> {compressed:>10} bytes ({ratio:.1%})")
+        return lines
+
+
+def _compress_file(path, entry):
+    """
+    Write path + ".gz" unless it already holds path's current content.
+
+    Args:
+        path: Path of the output file
+        entry: The manifest entry recorded for it last time, or None
+
+    Returns:
+        tuple: (the file's new manifest entry, whether it was compressed)
+    """
+    stat = os.stat(path)
+    gz_path = path + ".gz"
+    gz_exists = os.path.exists(gz_path)
+    # Unchanged stat data means unchanged content, as for BuildManifest
+    if entry and gz_exists and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return entry, False
+
+    with open(path, 'rb') as file:
+        data = file.read()
+    content_hash = hashlib.sha256(data).hexdigest()
+    # Rewritten with the same content, as pages often are
+    if entry and gz_exists and entry["hash"] == content_hash:
+        return dict(entry, size=stat.st_size, mtime_ns=stat.st_mtime_ns), False
+
+    with span(os.path.basename(path), "gzip", bytes=len(data)):
+        compressed = gzip_bytes(data)
+        with open_for_replace(gz_path, 'wb') as file:
+            file.write(compressed)
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "hash": content_hash,
+        "gzip_size": len(compressed),
+    }, True
+
+
+def compress_outputs(output_dir, threads=None):
+    """
+    Write a gzip-compressed .gz sibling of every HTML, CSS and other text
+    file in output_dir, for servers that send pre-compressed files.
+
+    Files are compressed on a thread pool (zlib releases the GIL while it
+    works). A file whose content hash matches the one its .gz was made from
+    is skipped. .gz files made for outputs that no longer exist are removed.
+    An output that can't be read, such as one removed while the pass runs,
+    is left out and reported in the report's failed list rather than
+    failing the pass. Like every other write to the output directory, .gz
+    files are replaced rather than modified in place.
+
+    Args:
+        output_dir: Path to the output directory
+        threads: Number of compression threads (defaults to one per CPU)
+
+    Returns:
+        CompressionReport: What was compressed, with ratios per file type
+    """
+    report = CompressionReport()
+    manifest_path = os.path.join(output_dir, GZIP_MANIFEST_FILENAME)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        previous = data["files"] if data.get("version") == GZIP_MANIFEST_VERSION else {}
+    except (OSError, ValueError, KeyError):
+        previous = {}
+
+    outputs = []
+    for root, dirs, files in os.walk(output_dir):
+        dirs.sort()
+        for filename in sorted(files):
+            if filename.startswith(".") or not filename.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            outputs.append(os.path.relpath(os.path.join(root, filename), output_dir))
+
+    entries = {}
+    with ThreadPoolExecutor(threads or os.cpu_count(), thread_name_prefix="gzip") as executor:
+        futures = [
+            executor.submit(_compress_file, os.path.join(output_dir, rel_path), previous.get(rel_path))
+            for rel_path in outputs
+        ]
+        for rel_path, future in zip(outputs, futures):
+            try:
+                entry, compressed = future.result()
+            except OSError as e:
+                report.failed.append((rel_path, f"{type(e).__name__}: {e}"))
+                continue
+            entries[rel_path] = entry
+            if compressed:
+                report.compressed_files += 1
+            else:
+                report.skipped_files += 1
+            report.add(os.path.splitext(rel_path)[1], entry["size"], entry["gzip_size"])
+
+    # Remove .gz files whose output is gone
+    for rel_path in sorted(set(previous) - set(entries)):
+        gz_path = os.path.join(output_dir, rel_path + ".gz")
+        try:
+            os.unlink(gz_path)
+        except FileNotFoundError:
+            continue
+        report.removed_files += 1
+
+    with open_for_replace(manifest_path) as file:
+        json.dump({"version": GZIP_MANIFEST_VERSION, "files": entries}, file, indent=1, sort_keys=True)
+    return report
@@ -3,14 +3,18 @@ def extract_title(markdown):
     Extract the h1 header (title) from a markdown string.
     
     Args:
-        markdown: A string containing markdown text
+        markdown: A string containing markdown text, or an iterable of its
+            lines (such as an open file, which is only read up to the title)
         
     Returns:
         The title without the # prefix and leading/trailing whitespace,
         or raises an exception if no h1 header is found
     """
     # Split the markdown into lines
-    lines = markdown.split('\n')
+    if isinstance(markdown, str):
+        lines = markdown.split('\n')
+    else:
+        lines = markdown
     
     # Look for a line that starts with a single #
     for line in lines:
@@ -1,20 +1,33 @@
+import re
+
+# Attribute values that may be written without quotes, following the
+# HTML unquoted attribute value syntax
+UNQUOTED_VALUE = re.compile(r"[^\s\"'=<>`]+\Z")
+
+
 class HTMLNode:
+    # Pages create a node for every text fragment, so skip the per-instance dict
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
         self.children = children
         self.props = props
 
-    def to_html(self):
+    def to_html(self, minify=False):
         """
         Convert the HTMLNode to an HTML string.
+
+        With minify, attribute values that don't need quotes are written
+        without them. Text is never changed, so code blocks stay byte-exact.
         """
         if self.tag is None:
             # If no tag, just use the value or empty string
             return self.value or ""
         
         # Start with opening tag and properties
-        html = f"<{self.tag}{self.props_to_html()}>"
+        html = f"<{self.tag}{self.props_to_html(minify)}>"
         
         # Add the value if present
         if self.value is not None:
@@ -23,20 +36,61 @@ class HTMLNode:
         # Add children if present
         if self.children is not None:
             for child in self.children:
-                html += child.to_html()
+                html += child.to_html(minify)
         
         # Close the tag
         html += f"</{self.tag}>"
         
         return html
 
-    def props_to_html(self):
+    def iter_html(self, minify=False):
+        """
+        Generate the HTML for this node as a sequence of string fragments.
+
+        Joining the fragments gives the same result as to_html, but the
+        whole document is never held in memory as one string. Children
+        without children of their own are small, so each is emitted as a
+        single fragment.
+        """
+        if self.tag is None:
+            # If no tag, just use the value or empty string
+            yield self.value or ""
+            return
+        
+        # Start with opening tag and properties
+        yield f"<{self.tag}{self.props_to_html(minify)}>"
+        
+        # Add the value if present
+        if self.value is not None:
+            yield self.value
+        
+        # Add children if present
+        if self.children is not None:
+            for child in self.children:
+                if child.children:
+                    yield from child.iter_html(minify)
+                else:
+                    yield child.to_html(minify)
+        
+        # Close the tag
+        yield f"</{self.tag}>"
+
+    def write_to(self, fp, minify=False):
+        """
+        Stream the HTML for this node into a writable text file object.
+        """
+        fp.writelines(self.iter_html(minify))
+
+    def props_to_html(self, minify=False):
         if not self.props:
             return ""
         
         props_string = ""
         for key, value in self.props.items():
-            props_string += f" {key}=\"{value}\""
+            if minify and UNQUOTED_VALUE.match(value):
+                props_string += f" {key}={value}"
+            else:
+                props_string += f" {key}=\"{value}\""
         
         return props_string
     
@@ -49,19 +103,24 @@ class ValueError(Exception):
 
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag=None, value=None, props=None):
         if value is None:
             raise ValueError("LeafNode must have a value")
         super().__init__(tag, value, None, props)
     
-    def to_html(self):
+    def to_html(self, minify=False):
         if self.value is None:
             raise ValueError("LeafNode must have a value")
         
         if self.tag is None:
             return self.value
         
-        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+        return f"<{self.tag}{self.props_to_html(minify)}>{self.value}</{self.tag}>"
+
+    def iter_html(self, minify=False):
+        yield self.to_html(minify)
 
 
 from enum import Enum
@@ -75,6 +134,8 @@ class TextType(Enum):
     IMAGE = 6
 
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type):
         self.text = text
         self.text_type = text_type
@@ -84,31 +145,58 @@ class TextNode:
         self.url = url
         return self
 
-def text_node_to_html_node(text_node):
+def _link_node(text_node, resolver):
+    if text_node.url is None:
+        raise ValueError("TextNode of type LINK must have a URL")
+    url = text_node.url if resolver is None else resolver.resolve(text_node.url)
+    return LeafNode("a", text_node.text, {"href": url})
+
+
+def _image_node(text_node, resolver):
+    if text_node.url is None:
+        raise ValueError("TextNode of type IMAGE must have a URL")
+    if resolver is None:
+        return LeafNode("img", "", {"src": text_node.url, "alt": text_node.text})
+    props = {"src": resolver.resolve(text_node.url), "alt": text_node.text}
+    # Intrinsic dimensions let the browser lay out the page before the
+    # image arrives
+    size = resolver.image_size(text_node.url)
+    if size is not None:
+        props["width"], props["height"] = str(size[0]), str(size[1])
+    return LeafNode("img", "", props)
+
+
+# Tag for each TextType that renders as a plain leaf
+LEAF_TAGS = {
+    TextType.TEXT: None,
+    TextType.BOLD: "b",
+    TextType.ITALIC: "i",
+    TextType.CODE: "code",
+}
+
+# Builders for the TextTypes that need props
+_NODE_BUILDERS = {
+    TextType.LINK: _link_node,
+    TextType.IMAGE: _image_node,
+}
+
+
+def text_node_to_html_node(text_node, resolver=None):
+    """
+    Convert a TextNode to the LeafNode that renders it.
+
+    Args:
+        text_node: The TextNode to convert
+        resolver: Optional UrlResolver for link and image URLs
+    """
     if not isinstance(text_node, TextNode):
         raise Exception("Expected a TextNode")
     
-    if text_node.text_type == TextType.TEXT:
-        return LeafNode(value=text_node.text)
-    
-    elif text_node.text_type == TextType.BOLD:
-        return LeafNode("b", text_node.text)
-    
-    elif text_node.text_type == TextType.ITALIC:
-        return LeafNode("i", text_node.text)
-    
-    elif text_node.text_type == TextType.CODE:
-        return LeafNode("code", text_node.text)
-    
-    elif text_node.text_type == TextType.LINK:
-        if text_node.url is None:
-            raise ValueError("TextNode of type LINK must have a URL")
-        return LeafNode("a", text_node.text, {"href": text_node.url})
-    
-    elif text_node.text_type == TextType.IMAGE:
-        if text_node.url is None:
-            raise ValueError("TextNode of type IMAGE must have a URL")
-        return LeafNode("img", "", {"src": text_node.url, "alt": text_node.text})
+    text_type = text_node.text_type
+    if text_type in LEAF_TAGS:
+        return LeafNode(LEAF_TAGS[text_type], text_node.text)
     
-    else:
-        raise Exception(f"Invalid TextType: {text_node.text_type}")
\ No newline at end of file
+    builder = _NODE_BUILDERS.get(text_type)
+    if builder is None:
+        raise Exception(f"Invalid TextType: {text_type}")
+    return builder(text_node, resolver)
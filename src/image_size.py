@@ -0,0 +1,243 @@
+import json
+import os
+import struct
+from utility import open_for_replace
+
+# Kept next to the other build state in the output directory, so a build
+# never opens an image whose size and mtime match what was probed before
+IMAGE_SIZES_FILENAME = ".image-sizes.json"
+IMAGE_SIZES_VERSION = 2
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+JPEG_SIGNATURE = b"\xff\xd8"
+
+# Start of frame markers, which hold a JPEG's dimensions. 0xC4 (huffman
+# tables), 0xC8 (reserved) and 0xCC (arithmetic coding) share the range.
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Markers without a length field
+JPEG_STANDALONE_MARKERS = frozenset(range(0xD0, 0xD8)) | {0x01}
+# Start of scan; the compressed image data follows, so no frame header came first
+JPEG_SOS_MARKER = 0xDA
+# APP1, which holds the EXIF data
+JPEG_APP1_MARKER = 0xE1
+EXIF_HEADER = b"Exif\x00\x00"
+EXIF_ORIENTATION_TAG = 0x0112
+# Orientations that rotate the image a quarter turn, so it is displayed with
+# the width and height of its frame swapped
+EXIF_TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+# Extensions of the files that are probed; other static files are never opened
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg"}
+
+
+def _probe_png(file):
+    # The IHDR chunk follows the signature: chunk length, "IHDR", width, height
+    header = file.read(16)
+    if len(header) < 16 or header[4:8] != b"IHDR":
+        return None
+    return struct.unpack(">II", header[8:16])
+
+
+def _read_exif_orientation(file, length):
+    # Reads the Orientation tag from the first IFD of an APP1 segment whose
+    # body of the given length starts at the current position. Returns None
+    # if the segment is not EXIF or has no usable tag.
+    header = file.read(14)
+    if len(header) < 14 or header[:6] != EXIF_HEADER:
+        return None
+    byte_order = {b"II": "<", b"MM": ">"}.get(header[6:8])
+    if byte_order is None:
+        return None
+    tiff_start = file.tell() - 8
+    ifd_offset = struct.unpack(byte_order + "I", header[10:14])[0]
+    if ifd_offset < 8 or 6 + ifd_offset + 2 > length:
+        return None
+    file.seek(tiff_start + ifd_offset)
+    count_bytes = file.read(2)
+    if len(count_bytes) < 2:
+        return None
+    count = struct.unpack(byte_order + "H", count_bytes)[0]
+    entries = file.read(12 * min(count, (length - 6 - ifd_offset - 2) // 12))
+    for offset in range(0, len(entries) - 11, 12):
+        tag, value_type = struct.unpack(byte_order + "HH", entries[offset:offset + 4])
+        # A SHORT, stored in the first two bytes of the value field
+        if tag == EXIF_ORIENTATION_TAG and value_type == 3:
+            return struct.unpack(byte_order + "H", entries[offset + 8:offset + 10])[0]
+    return None
+
+
+def _probe_jpeg(file):
+    # Walk the segments up to the first start of frame, skipping the bodies
+    # of the others (thumbnails, tables) without reading them. Only the
+    # first IFD of the EXIF data is read, for the orientation, which decides
+    # whether the frame's width and height are swapped for display.
+    file.seek(2)
+    orientation = None
+    while True:
+        byte = file.read(1)
+        if not byte:
+            return None
+        if byte != b"\xff":
+            continue
+        marker = file.read(1)
+        # Any number of 0xFF fill bytes may come before a marker
+        while marker == b"\xff":
+            marker = file.read(1)
+        if not marker:
+            return None
+        marker = marker[0]
+        if marker in JPEG_STANDALONE_MARKERS or marker == 0:
+            continue
+        if marker == JPEG_SOS_MARKER:
+            return None
+        length_bytes = file.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack(">H", length_bytes)[0]
+        if marker in JPEG_SOF_MARKERS:
+            frame = file.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack(">HH", frame[1:5])
+            if orientation in EXIF_TRANSPOSED_ORIENTATIONS:
+                return height, width
+            return width, height
+        segment_end = file.tell() + length - 2
+        if marker == JPEG_APP1_MARKER and orientation is None:
+            orientation = _read_exif_orientation(file, length - 2)
+        file.seek(segment_end)
+
+
+def probe_size(path):
+    """
+    Read the intrinsic dimensions of a PNG or JPEG from its header.
+
+    Only the PNG IHDR chunk, or the JPEG segments up to its start of frame
+    marker, are read; the image data never is. A JPEG's EXIF orientation is
+    applied, so a photo taken in portrait is reported in portrait.
+
+    Args:
+        path: Path to the image
+
+    Returns:
+        tuple: (width, height) in pixels, or None if the file is not a PNG
+        or JPEG, is truncated or can't be read
+    """
+    try:
+        with open(path, 'rb') as file:
+            signature = file.read(len(PNG_SIGNATURE))
+            if signature == PNG_SIGNATURE:
+                size = _probe_png(file)
+            elif signature.startswith(JPEG_SIGNATURE):
+                size = _probe_jpeg(file)
+            else:
+                return None
+    except OSError:
+        return None
+    if size is None or not all(size):
+        return None
+    return size
+
+
+class ImageSizes:
+    """
+    Records the dimensions of the images among the static files.
+
+    The table is saved as JSON in the output directory. Each image is keyed
+    by its path relative to the static directory, with the size and mtime
+    it was probed at, so an unchanged image is not opened again by later
+    builds. Images that could not be probed are remembered too.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # Static path -> size, mtime_ns, width and height (None if unknown)
+        self.images = {}
+        self.probed = 0
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a table from disk, or return an empty one if the file is
+        missing, unreadable or written by a different version.
+
+        Args:
+            path: Path to the table's JSON file
+
+        Returns:
+            ImageSizes: The loaded table
+        """
+        table = cls(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return table
+
+        if data.get("version") != IMAGE_SIZES_VERSION:
+            return table
+
+        table.images = data.get("images", {})
+        return table
+
+    def save(self):
+        """
+        Write the table back to disk.
+        """
+        data = {
+            "version": IMAGE_SIZES_VERSION,
+            "images": self.images,
+        }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open_for_replace(self.path) as file:
+            json.dump(data, file, indent=1, sort_keys=True)
+
+    def add(self, rel_path, source_path, stat=None):
+        """
+        Record a static file, probing it only if it is an image whose stat
+        data changed.
+
+        Args:
+            rel_path: Path of the file relative to the static directory
+            source_path: Path to the file
+            stat: The file's os.stat result, if the caller already has it
+
+        Returns:
+            tuple: (width, height), or None if the file is not a readable
+            PNG or JPEG
+        """
+        if os.path.splitext(rel_path)[1].lower() not in IMAGE_EXTENSIONS:
+            return None
+        if stat is None:
+            stat = os.stat(source_path)
+        entry = self.images.get(rel_path)
+        if entry is None or entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+            size = probe_size(source_path)
+            self.probed += 1
+            width, height = size if size is not None else (None, None)
+            entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "width": width, "height": height}
+            self.images[rel_path] = entry
+        if entry["width"] is None:
+            return None
+        return entry["width"], entry["height"]
+
+    def retain(self, rel_paths):
+        """
+        Forget every static file not in rel_paths.
+        """
+        rel_paths = set(rel_paths)
+        for rel_path in [rel_path for rel_path in self.images if rel_path not in rel_paths]:
+            del self.images[rel_path]
+
+    def sizes(self):
+        """
+        Return the dimensions of every probed image.
+
+        Returns:
+            dict: Static path, with "/" separators -> [width, height]
+        """
+        return {
+            rel_path.replace(os.sep, "/"): [entry["width"], entry["height"]]
+            for rel_path, entry in self.images.items()
+            if entry["width"] is not None
+        }
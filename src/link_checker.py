@@ -0,0 +1,149 @@
+import os
+from operator import attrgetter
+from urllib.parse import unquote
+from htmlnode import TextType
+
+_url = attrgetter("url")
+
+
+class PageLinks:
+    """
+    Collects the link and image URLs of one page while it is rendered.
+
+    The page renderer passes it to the markdown converter as a text sink,
+    so URLs are taken from the TextNodes as they are made; the generated
+    HTML is never read back. URLs are kept as written in the markdown, and
+    each one only once per kind.
+    """
+
+    def __init__(self):
+        self.links = []
+        self._seen = set()
+
+    def add(self, text_nodes):
+        """
+        Record the URLs of the link and image TextNodes in a list.
+        """
+        # Only links and images have a URL; filtering on it in C keeps the far
+        # more common plain text nodes from costing a Python loop iteration.
+        # Empty URLs are skipped too, as they aren't checked.
+        for text_node in filter(_url, text_nodes):
+            kind = "image" if text_node.text_type is TextType.IMAGE else "link"
+            if (kind, text_node.url) not in self._seen:
+                self._seen.add((kind, text_node.url))
+                self.links.append([kind, text_node.url])
+
+
+class BrokenLink:
+    """
+    A link or image in a page whose target the build does not produce.
+    """
+
+    def __init__(self, source_path, line, kind, url):
+        self.source_path = source_path
+        self.line = line
+        self.kind = kind
+        self.url = url
+
+    def __repr__(self):
+        return f"BrokenLink({self.source_path!r}, {self.line}, {self.kind!r}, {self.url!r})"
+
+    def __str__(self):
+        location = self.source_path if self.line is None else f"{self.source_path}:{self.line}"
+        return f"{location}: {self.kind} target {self.url} does not exist"
+
+
+def target_path(url, page_output):
+    """
+    Return the site path a URL points at, or None if it isn't checked.
+
+    Args:
+        url: A link or image URL as written in the markdown
+        page_output: Output path of the linking page, relative to the site
+            root, with "/" separators
+
+    Returns:
+        The target path relative to the site root, with "/" separators and
+        without any query string or fragment. None for absolute,
+        protocol-relative and fragment-only URLs.
+    """
+    for separator in "#?":
+        url = url.split(separator, 1)[0]
+    if not url or url.startswith("//") or ":" in url.split("/", 1)[0]:
+        return None
+
+    if url.startswith("/"):
+        path = url[1:]
+    else:
+        path = os.path.dirname(page_output) + "/" + url
+    return os.path.normpath("/" + unquote(path)).replace(os.sep, "/").lstrip("/")
+
+
+def exists(path, targets):
+    """
+    Check whether a site path is served by one of the targets, the way a
+    static file server resolves it: as a file, a directory's index.html,
+    or a page with its .html extension left off.
+    """
+    if path in targets:
+        return True
+    index = path.rstrip("/") + "/index.html" if path.rstrip("/") else "index.html"
+    return index in targets or path + ".html" in targets
+
+
+def find_lines(source_path, urls):
+    """
+    Find the line of a markdown file where each URL is first linked.
+
+    Only called for pages with broken links, so re-reading the markdown
+    source is cheap; line numbers are not tracked while rendering.
+
+    Returns:
+        dict: URL -> line number, for the URLs that were found
+    """
+    lines = {}
+    targets = {f"]({url})": url for url in urls}
+    try:
+        with open(source_path, 'r', encoding='utf-8') as file:
+            for number, line in enumerate(file, start=1):
+                for target, url in targets.items():
+                    if url not in lines and target in line:
+                        lines[url] = number
+    except OSError:
+        pass
+    return lines
+
+
+def check_links(pages, targets):
+    """
+    Find the links and images whose targets don't exist.
+
+    Args:
+        pages: Iterable of (source path, output path relative to the site
+            root, list of [kind, url] pairs)
+        targets: Set of every path the site serves, relative to the site
+            root with "/" separators
+
+    Returns:
+        list: A BrokenLink for each dangling URL, in page order
+    """
+    broken = []
+    # Most URLs are linked from many pages; root-relative ones resolve the
+    # same from every page and relative ones from every page in a directory
+    found = {}
+    for source_path, page_output, links in pages:
+        page_output = page_output.replace(os.sep, "/")
+        page_dir = os.path.dirname(page_output)
+        page_broken = []
+        for kind, url in links:
+            key = (None if url.startswith("/") else page_dir, url)
+            ok = found.get(key)
+            if ok is None:
+                path = target_path(url, page_output)
+                ok = found[key] = path is None or exists(path, targets)
+            if not ok:
+                page_broken.append((kind, url))
+        if page_broken:
+            lines = find_lines(source_path, [url for _, url in page_broken])
+            broken.extend(BrokenLink(source_path, lines.get(url), kind, url) for kind, url in page_broken)
+    return broken
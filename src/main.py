@@ -1,17 +1,191 @@
 from utility import copy_directory
-from page_generator import generate_pages_recursive
+from assets import ASSET_MANIFEST_FILENAME, AssetManifest
+from compression import compress_outputs
+from image_size import IMAGE_SIZES_FILENAME, ImageSizes
+from page_generator import BUILD_MODES, BuildError, SiteBuilder
+from pipeline import DEFAULT_IO_THREADS
+from render_cache import CACHE_DIRNAME
+from staging import publish_output, stage_output
+from watch import LiveReloadServer, watch
+from profiling import BuildProfile
+from tracing import span, start_tracing, stop_tracing
+import argparse
+import cProfile
 import os
-import shutil
 import sys
+import time
 
-def main():
+def positive_int(value):
+    """
+    Parse a command line value that must be a whole number of at least 1.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def parse_args(argv=None):
+    """
+    Parse the command line arguments for the static site generator.
+    """
+    parser = argparse.ArgumentParser(description="Build the static site into docs/")
+    parser.add_argument("basepath", nargs="?", default="/",
+                        help="Base path the site is served from (defaults to '/')")
+    parser.add_argument("-j", "--jobs", type=positive_int, default=1,
+                        help="Number of worker processes used to render pages (defaults to 1)")
+    parser.add_argument("--mode", choices=BUILD_MODES, default="batch",
+                        help="batch renders pages one after another (in --jobs processes); pipeline "
+                             "overlaps reading and writing with rendering, for slow storage (defaults to batch)")
+    parser.add_argument("--io-threads", type=positive_int, default=DEFAULT_IO_THREADS,
+                        help=f"Reader and writer threads in pipeline mode (defaults to {DEFAULT_IO_THREADS})")
+    parser.add_argument("--checksum", action="store_true",
+                        help="Compare static files by content hash instead of size and mtime")
+    parser.add_argument("--fingerprint", action="store_true",
+                        help="Also publish static files as name.<hash>.ext, point the template and pages at "
+                             f"those names and list them in {ASSET_MANIFEST_FILENAME}")
+    parser.add_argument("--image-sizes", action="store_true",
+                        help="Give images width and height from their PNG or JPEG headers, so pages don't "
+                             "shift as they load")
+    parser.add_argument("--minify", action="store_true",
+                        help="Write pages without the template's indentation and with unneeded attribute "
+                             "quotes dropped")
+    parser.add_argument("--search", action="store_true",
+                        help="Maintain a client-side search index in docs/search/, split into JSON shards "
+                             "by term prefix")
+    parser.add_argument("--check-links", action="store_true",
+                        help="Report links and images that point at pages or static files the site "
+                             "doesn't have, with the markdown file and line they are on")
+    parser.add_argument("--gzip", action="store_true",
+                        help="Write a maximally compressed .gz next to every HTML, CSS and text output, "
+                             "for servers that send pre-compressed files")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"Don't reuse or store rendered pages in {CACHE_DIRNAME}/")
+    parser.add_argument("--profile", nargs="?", const="build-profile.json", metavar="REPORT",
+                        help="Time each stage of every rendered page and write a JSON report "
+                             "(defaults to build-profile.json)")
+    parser.add_argument("--profile-slowest", type=int, default=10, metavar="N",
+                        help="Number of slowest pages listed in the --profile report (defaults to 10)")
+    parser.add_argument("--cprofile", metavar="STATS",
+                        help="Run the whole build under cProfile and dump the stats to this file")
+    parser.add_argument("--trace", metavar="OUT",
+                        help="Write a timeline of the build phases and pages in Chrome trace format "
+                             "(open it in Perfetto or chrome://tracing)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Serve docs/ and rebuild changed pages on save, reloading open browsers")
+    parser.add_argument("--port", type=int, default=8888,
+                        help="Port for the --watch development server (defaults to 8888)")
+    parser.add_argument("--poll-interval", type=float, default=0.05,
+                        help="Seconds between checks for changed files in --watch mode (defaults to 0.05)")
+    return parser.parse_args(argv)
+
+
+def watch_site(builder, args, static_dir, content_dir, template_path, docs_dir, assets=None, images=None):
+    """
+    Serve the built site and rebuild whatever changes until interrupted.
+
+    Static files are synced, a changed template (or, with fingerprinting or
+    image sizes, a changed static file) rebuilds every page and changed
+    markdown files rebuild only their own pages. Every open browser is then
+    told to reload.
+    """
+    server = LiveReloadServer(docs_dir, args.port)
+    server.start()
+    print(f"Serving {docs_dir} on http://localhost:{args.port}/ (Ctrl+C to stop)")
+
+    static_prefix = os.path.join(static_dir, "")
+
+    def rebuild(changed):
+        start = time.perf_counter()
+        print(f"Changed: {', '.join(changed)}")
+        try:
+            assets_changed = False
+            if any(path.startswith(static_prefix) for path in changed):
+                previous_assets = dict(assets.assets) if assets is not None else None
+                sync_report = copy_directory(static_dir, docs_dir, checksum=args.checksum, assets=assets,
+                                             images=images)
+                builder.static_files = sync_report.files
+                assets_changed = assets is not None and assets.assets != previous_assets
+                if images is not None and images.sizes() != builder.image_sizes:
+                    builder.image_sizes = images.sizes()
+                    assets_changed = True
+            if template_path in changed or assets_changed:
+                builder.build(save=False)
+            else:
+                pages = [path for path in changed if path.endswith('.md')]
+                if pages:
+                    builder.build(sources=pages, save=False)
+        except BuildError as e:
+            print(e)
+        if args.gzip:
+            for rel_path, error in compress_outputs(docs_dir).failed:
+                print(f"Could not compress {rel_path}: {error}")
+        server.notify_reload()
+        print(f"Rebuilt in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    try:
+        watch([content_dir, static_dir, template_path], rebuild, args.poll_interval)
+    except KeyboardInterrupt:
+        print("Stopping watch mode")
+    finally:
+        builder.manifest.save()
+        server.shutdown()
+
+
+def main(argv=None):
     """
     Main function to run the static site generator
+
+    Returns:
+        int: The exit status, 1 if any page failed to generate
+    """
+    args = parse_args(argv)
+    if args.trace:
+        start_tracing()
+    try:
+        run_profiled(args)
+    except BuildError as e:
+        # The published docs were left as they were
+        print(e)
+        return 1
+    finally:
+        # Written even when the build fails, which is when it is most useful
+        recorder = stop_tracing()
+        if recorder is not None:
+            recorder.write(args.trace)
+            print(f"Wrote build trace to {args.trace}")
+    return 0
+
+
+def run_profiled(args):
+    """
+    Build the site, under cProfile if --cprofile was given.
+    """
+    if not args.cprofile:
+        build_site(args)
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        build_site(args)
+    finally:
+        profiler.disable()
+        profiler.dump_stats(args.cprofile)
+        print(f"Wrote cProfile stats to {args.cprofile} (view with: python3 -m pstats {args.cprofile})")
+
+
+def build_site(args):
+    """
+    Build the site as configured by the command line arguments.
     """
     print("Starting static site generator...")
     
     # Get basepath from command line argument or default to '/'
-    basepath = sys.argv[1] if len(sys.argv) > 1 else "/"
+    basepath = args.basepath
     print(f"Using basepath: {basepath}")
     
     # Define directories
@@ -19,29 +193,71 @@ def main():
     docs_dir = "docs"  # Changed from public to docs for GitHub Pages
     content_dir = "content"
     template_path = "template.html"
+    cache_dir = None if args.no_cache else CACHE_DIRNAME
+    profile = BuildProfile(args.profile_slowest) if args.profile else None
+    assets = None
+    images = None
     
-    # 1. Delete anything in the docs directory if it exists
-    if os.path.exists(docs_dir):
-        print(f"Cleaning {docs_dir} directory")
-        shutil.rmtree(docs_dir)
-    
-    # 2. Copy all the static files from static to docs
-    print(f"Copying static files from {static_dir} to {docs_dir}")
-    copy_directory(static_dir, docs_dir)
+    # 1. Build into a staging directory next to docs. It starts as hard
+    # links to the current docs, so only new or changed files are written
+    # and unchanged pages don't have to be rendered again. If the build
+    # fails, the published docs are left as they were.
+    with span("stage output"):
+        staging_dir = stage_output(docs_dir)
+
+    # 2. Sync the static files from static into the staging directory,
+    # also under fingerprinted names and reading image sizes if asked to
+    print(f"Copying static files from {static_dir} to {staging_dir}")
+    with span("sync static", dir=static_dir):
+        if args.fingerprint:
+            assets = AssetManifest.load(os.path.join(staging_dir, ASSET_MANIFEST_FILENAME))
+        if args.image_sizes:
+            images = ImageSizes.load(os.path.join(staging_dir, IMAGE_SIZES_FILENAME))
+        sync_report = copy_directory(static_dir, staging_dir, checksum=args.checksum, assets=assets,
+                                     images=images)
+    asset_table = assets.assets if assets is not None else None
+    image_table = images.sizes() if images is not None else None
     
-    # 3. Generate HTML files for all markdown files in the content directory
-    print(f"Generating pages from {content_dir} to {docs_dir}")
-    generate_pages_recursive(content_dir, template_path, docs_dir, basepath)
-
-    # After copying all static files
-    print("Ensuring CSS is in the root directory...")
-    if os.path.exists(os.path.join(static_dir, "index.css")):
-        shutil.copy2(
-            os.path.join(static_dir, "index.css"), 
-            os.path.join(docs_dir, "index.css")
-        )
-        
+    # 3. Generate HTML files for changed markdown files in the content directory
+    print(f"Generating pages from {content_dir} to {staging_dir}")
+    with span("build pages", dir=content_dir):
+        SiteBuilder(content_dir, template_path, staging_dir, basepath, jobs=args.jobs, cache_dir=cache_dir,
+                    profile=profile, mode=args.mode, io_threads=args.io_threads, assets=asset_table,
+                    minify=args.minify, search=args.search, check_links=args.check_links,
+                    static_files=sync_report.files, image_sizes=image_table).build()
+
+    # 4. Compress the outputs that changed
+    if args.gzip:
+        with span("compress"):
+            report = compress_outputs(staging_dir)
+        for line in report.summary_lines():
+            print(line)
+
+    # 5. Swap the finished build in for the published docs
+    with span("publish"):
+        publish_output(staging_dir, docs_dir)
+
     print("Static site generation complete!")
 
+    if profile is not None:
+        profile.write(args.profile)
+        for line in profile.summary_lines():
+            print(line)
+        print(f"Wrote profile report to {args.profile}")
+
+    # 6. Optionally keep serving the site and rebuilding it as files change.
+    # Watch mode rebuilds single pages in place for the fastest reload.
+    if args.watch:
+        if assets is not None:
+            assets = AssetManifest.load(os.path.join(docs_dir, ASSET_MANIFEST_FILENAME))
+            asset_table = assets.assets
+        if images is not None:
+            images = ImageSizes.load(os.path.join(docs_dir, IMAGE_SIZES_FILENAME))
+        builder = SiteBuilder(content_dir, template_path, docs_dir, basepath, jobs=args.jobs, cache_dir=cache_dir,
+                              assets=asset_table, minify=args.minify, search=args.search,
+                              check_links=args.check_links, static_files=sync_report.files,
+                              image_sizes=image_table)
+        watch_site(builder, args, static_dir, content_dir, template_path, docs_dir, assets, images)
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -1,5 +1,28 @@
 import re
 
+# Matches both ![alt](url) and [text](url). The optional leading ! is part of
+# the match, so an image and a link are told apart by what sits at the start
+# of the match rather than by searching the text again. Labels can't hold
+# brackets and URLs can't hold parentheses, so a stray "[" earlier in the
+# text never swallows the link or image after it; neither crosses a line.
+LINK_OR_IMAGE_PATTERN = re.compile(r"(!?)\[([^\[\]\n]*)\]\(([^()\n]*)\)")
+
+
+def iter_markdown_spans(text):
+    """
+    Scan text once for markdown links and images.
+    
+    Args:
+        text: A string containing markdown text
+        
+    Yields:
+        Tuples of (start, end, is_image, label, url) in order of appearance,
+        where text[start:end] is the full link or image syntax
+    """
+    for match in LINK_OR_IMAGE_PATTERN.finditer(text):
+        yield match.start(), match.end(), bool(match.group(1)), match.group(2), match.group(3)
+
+
 def extract_markdown_images(text):
     """
     Extract all markdown images from text.
@@ -10,14 +33,11 @@ def extract_markdown_images(text):
     Returns:
         A list of tuples, each containing (alt_text, url)
     """
-    # Regex pattern for markdown images: ![alt text](url)
-    pattern = r"!\[(.*?)\]\((.*?)\)"
-    matches = re.findall(pattern, text)
-    return matches
+    return [(label, url) for _, _, is_image, label, url in iter_markdown_spans(text) if is_image]
 
 def extract_markdown_links(text):
     """
-    Extract all markdown links from text.
+    Extract all markdown links from text, not including images.
     
     Args:
         text: A string containing markdown text
@@ -25,7 +45,4 @@ def extract_markdown_links(text):
     Returns:
         A list of tuples, each containing (anchor_text, url)
     """
-    # Regex pattern for markdown links: [anchor text](url)
-    pattern = r"\[(.*?)\]\((.*?)\)"
-    matches = re.findall(pattern, text)
-    return matches
\ No newline at end of file
+    return [(label, url) for _, _, is_image, label, url in iter_markdown_spans(text) if not is_image]
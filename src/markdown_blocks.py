@@ -1,3 +1,7 @@
+# Characters read at a time when streaming blocks from a file
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
 def markdown_to_blocks(markdown):
     """
     Split a markdown string into blocks based on double newlines.
@@ -22,4 +26,53 @@ def markdown_to_blocks(markdown):
         if block:
             processed_blocks.append(block)
     
-    return processed_blocks
\ No newline at end of file
+    return processed_blocks
+
+
+def iter_markdown_blocks(chunks):
+    """
+    Split markdown arriving in pieces into blocks, yielding each block as
+    soon as it is complete.
+
+    Gives exactly the blocks markdown_to_blocks would give for the joined
+    text, but only the current block is ever held in memory.
+
+    Args:
+        chunks: Iterable of markdown text pieces, split anywhere
+
+    Yields:
+        str: Each non-empty, stripped block
+    """
+    buffer = ""
+    for chunk in chunks:
+        # A separator may straddle the previous chunk and this one
+        search_from = max(len(buffer) - 1, 0)
+        buffer += chunk
+        start = 0
+        index = buffer.find("\n\n", search_from)
+        while index != -1:
+            block = buffer[start:index].strip()
+            if block:
+                yield block
+            start = index + 2
+            index = buffer.find("\n\n", start)
+        buffer = buffer[start:]
+
+    block = buffer.strip()
+    if block:
+        yield block
+
+
+def read_markdown_blocks(path, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Stream the blocks of a markdown file without reading it all at once.
+
+    Args:
+        path: Path to the markdown file
+        chunk_size: Characters to read at a time
+
+    Yields:
+        str: Each non-empty, stripped block
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        yield from iter_markdown_blocks(iter(lambda: file.read(chunk_size), ""))
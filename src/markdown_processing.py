@@ -1,5 +1,4 @@
-from htmlnode import TextNode, TextType
-from text_processing import split_nodes_delimiter, split_nodes_image, split_nodes_link
+from inline_parser import parse_inline
 
 def text_to_textnodes(text):
     """
@@ -11,17 +10,5 @@ def text_to_textnodes(text):
     Returns:
         A list of TextNode objects representing the formatted text
     """
-    # Start with a single text node
-    nodes = [TextNode(text, TextType.TEXT)]
-    
-    # Split by different delimiters and syntax in sequence
-    
-    # 1. Process bold text with ** delimiter
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    nodes = split_nodes_image(nodes)
-    # Process links with [text](url) syntax
-    nodes = split_nodes_link(nodes)
-    
-    return nodes
\ No newline at end of file
+    # Scan the text once, emitting bold, italic, code, image and link nodes
+    return parse_inline(text)
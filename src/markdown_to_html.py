@@ -1,71 +1,129 @@
-from htmlnode import HTMLNode, LeafNode, TextNode, TextType
+from htmlnode import HTMLNode, LeafNode, TextNode, TextType, text_node_to_html_node
 from markdown_blocks import markdown_to_blocks
-from block_parser import BlockType, block_to_block_type
+from block_parser import BlockType, classify_block
+from inline_parser import parse_inline
+# The link and image helpers are shared with text_processing and re-exported here
+from markdown import extract_markdown_images, extract_markdown_links
+from text_processing import split_nodes_image, split_nodes_link
 import re
 
-def markdown_to_html_node(markdown):
+# Matches the heading marker and the whitespace after it
+HEADING_LEVEL_PATTERN = re.compile(r"^(#{1,6})\s+")
+
+# Matches an ordered list item, capturing the text after the number
+ORDERED_ITEM_PATTERN = re.compile(r"^\d+\.\s+(.*)$")
+
+class TextSinks:
+    """
+    A text sink that passes every list of TextNodes on to several others.
+    """
+
+    def __init__(self, sinks):
+        self.sinks = sinks
+
+    def add(self, text_nodes):
+        for sink in self.sinks:
+            sink.add(text_nodes)
+
+
+def combine_text_sinks(*sinks):
+    """
+    Combine optional text sinks into one.
+
+    Args:
+        sinks: Text sinks, any of which may be None
+
+    Returns:
+        None if every sink is None, the only sink if there is one, or a
+        TextSinks feeding all of them
     """
-    Convert a markdown string to a parent HTMLNode with nested children.
+    sinks = [sink for sink in sinks if sink is not None]
+    if len(sinks) <= 1:
+        return sinks[0] if sinks else None
+    return TextSinks(sinks)
+
+
+def markdown_to_html_node(markdown, resolver=None, text_sink=None):
+    """
+    Convert markdown to a parent HTMLNode with nested children.
     
     Args:
-        markdown: A string containing markdown text
+        markdown: A string containing markdown text, or an iterable of
+            already-split blocks (see markdown_blocks.read_markdown_blocks)
+        resolver: Optional UrlResolver for link and image URLs
+        text_sink: Optional text sink, passed through to text_to_children
         
     Returns:
         HTMLNode: A parent div node containing all the HTML elements
     """
     # Split the markdown into blocks
-    blocks = markdown_to_blocks(markdown)
+    if isinstance(markdown, str):
+        blocks = markdown_to_blocks(markdown)
+    else:
+        blocks = markdown
     
     # Create a parent div to hold all the blocks
-    parent_node = HTMLNode("div", None, [], None)
-    
+    return HTMLNode("div", None, list(iter_block_nodes(blocks, resolver, text_sink)), None)
+
+
+def iter_block_nodes(blocks, resolver=None, text_sink=None):
+    """
+    Convert markdown blocks to HTMLNodes one block at a time.
+
+    Args:
+        blocks: An iterable of markdown blocks
+        resolver: Optional UrlResolver for link and image URLs
+        text_sink: Optional text sink, passed through to text_to_children
+
+    Yields:
+        HTMLNode: The node for each block, in order
+    """
     # Process each block
     for block in blocks:
-        # Determine the type of block
-        block_type = block_to_block_type(block)
+        # Determine the type of block, keeping its lines for the node builders
+        block_type, lines = classify_block(block)
         
         # Create an HTMLNode based on the block type
         if block_type == BlockType.PARAGRAPH:
-            node = create_paragraph_node(block)
+            yield create_paragraph_node(block, resolver, text_sink)
         elif block_type == BlockType.HEADING:
-            node = create_heading_node(block)
+            yield create_heading_node(block, resolver, text_sink)
         elif block_type == BlockType.CODE:
-            node = create_code_node(block)
+            yield create_code_node(block, lines)
         elif block_type == BlockType.QUOTE:
-            node = create_quote_node(block)
+            yield create_quote_node(block, lines, resolver, text_sink)
         elif block_type == BlockType.UNORDERED_LIST:
-            node = create_unordered_list_node(block)
+            yield create_unordered_list_node(block, lines, resolver, text_sink)
         elif block_type == BlockType.ORDERED_LIST:
-            node = create_ordered_list_node(block)
+            yield create_ordered_list_node(block, lines, resolver, text_sink)
         else:
             # This shouldn't happen with proper block type detection
-            node = create_paragraph_node(block)
-        
-        # Add the node to the parent
-        if parent_node.children is None:
-            parent_node.children = []
-        parent_node.children.append(node)
-    
-    return parent_node
+            yield create_paragraph_node(block, resolver, text_sink)
 
 
-def text_to_children(text):
+def text_to_children(text, resolver=None, text_sink=None):
     """
     Convert markdown text to a list of HTMLNode objects representing inline elements.
     
     Args:
         text: A string containing markdown text with inline formatting
+        resolver: Optional UrlResolver for link and image URLs
+        text_sink: Optional collector whose add() receives the list of
+            inline TextNodes of each run of text, such as
+            search_index.PageTerms (see combine_text_sinks)
         
     Returns:
         list: A list of HTMLNode objects
     """
     # First convert the text to TextNode objects
     text_nodes = text_to_textnodes(text)
+    if text_sink is not None:
+        text_sink.add(text_nodes)
     
     # Then convert each TextNode to an HTMLNode
     html_nodes = []
     for text_node in text_nodes:
-        html_node = text_node_to_html_node(text_node)
+        html_node = text_node_to_html_node(text_node, resolver)
         html_nodes.append(html_node)
     
     return html_nodes
@@ -81,27 +139,8 @@ def text_to_textnodes(text):
     Returns:
         A list of TextNode objects representing the formatted text
     """
-    # Start with a single text node
-    nodes = [TextNode(text, TextType.TEXT)]
-    
-    # Split by different delimiters and syntax in sequence
-    
-    # 1. Process bold text with ** delimiter
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    
-    # 2. Process italic text with _ delimiter
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    
-    # 3. Process code blocks with ` delimiter
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    
-    # 4. Process images with ![alt](url) syntax
-    nodes = split_nodes_image(nodes)
-    
-    # 5. Process links with [text](url) syntax
-    nodes = split_nodes_link(nodes)
-    
-    return nodes
+    # Scan the text once, emitting bold, italic, code, image and link nodes
+    return parse_inline(text)
 
 
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
@@ -171,239 +210,59 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
     return new_nodes
 
 
-def extract_markdown_images(text):
-    """
-    Extract all markdown images from text.
-    
-    Args:
-        text: A string containing markdown text
-        
-    Returns:
-        A list of tuples, each containing (alt_text, url)
-    """
-    # Regex pattern for markdown images: ![alt text](url)
-    pattern = r"!\[(.*?)\]\((.*?)\)"
-    matches = re.findall(pattern, text)
-    return matches
-
-
-def extract_markdown_links(text):
-    """
-    Extract all markdown links from text.
-    
-    Args:
-        text: A string containing markdown text
-        
-    Returns:
-        A list of tuples, each containing (anchor_text, url)
-    """
-    # Regex pattern for markdown links: [anchor text](url)
-    pattern = r"\[(.*?)\]\((.*?)\)"
-    matches = re.findall(pattern, text)
-    
-    # Filter out image matches (those preceded by !)
-    return [(anchor, url) for anchor, url in matches if not re.search(f"!\[{re.escape(anchor)}\]\({re.escape(url)}\)", text)]
-
-
-def split_nodes_image(old_nodes):
-    """
-    Split TextNodes of type TEXT that contain markdown image syntax ![alt](url).
-    
-    Args:
-        old_nodes: List of TextNode objects
-    
-    Returns:
-        List of TextNode objects with markdown images converted to IMAGE nodes
-    """
-    new_nodes = []
-    
-    for old_node in old_nodes:
-        # Only process TEXT type nodes, add others as-is
-        if old_node.text_type != TextType.TEXT:
-            new_nodes.append(old_node)
-            continue
-        
-        # Process the text for this node
-        text = old_node.text
-        
-        # Extract all markdown images
-        images = extract_markdown_images(text)
-        
-        if not images:
-            # No images found, keep the node as is
-            new_nodes.append(old_node)
-            continue
-        
-        # Process text with images
-        remaining_text = text
-        
-        for alt_text, url in images:
-            # Find the position of the image syntax
-            image_syntax = f"![{alt_text}]({url})"
-            start_pos = remaining_text.find(image_syntax)
-            
-            if start_pos == -1:
-                # This shouldn't happen if extract_markdown_images is working correctly
-                continue
-            
-            # Add text before the image if it exists
-            if start_pos > 0:
-                new_nodes.append(TextNode(remaining_text[:start_pos], TextType.TEXT))
-            
-            # Add the image node
-            image_node = TextNode(alt_text, TextType.IMAGE)
-            image_node.url = url
-            new_nodes.append(image_node)
-            
-            # Update remaining text
-            remaining_text = remaining_text[start_pos + len(image_syntax):]
-        
-        # Add any remaining text
-        if remaining_text:
-            new_nodes.append(TextNode(remaining_text, TextType.TEXT))
-    
-    return new_nodes
-
-
-def split_nodes_link(old_nodes):
-    """
-    Split TextNodes of type TEXT that contain markdown link syntax [text](url).
-    
-    Args:
-        old_nodes: List of TextNode objects
-    
-    Returns:
-        List of TextNode objects with markdown links converted to LINK nodes
-    """
-    new_nodes = []
-    
-    for old_node in old_nodes:
-        # Only process TEXT type nodes, add others as-is
-        if old_node.text_type != TextType.TEXT:
-            new_nodes.append(old_node)
-            continue
-        
-        # Process the text for this node
-        text = old_node.text
-        
-        # Extract all markdown links (but not images)
-        links = extract_markdown_links(text)
-        
-        if not links:
-            # No links found, keep the node as is
-            new_nodes.append(old_node)
-            continue
-        
-        # Process text with links
-        remaining_text = text
-        
-        for anchor_text, url in links:
-            # Find the position of the link syntax
-            link_syntax = f"[{anchor_text}]({url})"
-            start_pos = remaining_text.find(link_syntax)
-            
-            if start_pos == -1:
-                # This shouldn't happen if extract_markdown_links is working correctly
-                continue
-            
-            # Add text before the link if it exists
-            if start_pos > 0:
-                new_nodes.append(TextNode(remaining_text[:start_pos], TextType.TEXT))
-            
-            # Add the link node
-            link_node = TextNode(anchor_text, TextType.LINK)
-            link_node.url = url
-            new_nodes.append(link_node)
-            
-            # Update remaining text
-            remaining_text = remaining_text[start_pos + len(link_syntax):]
-        
-        # Add any remaining text
-        if remaining_text:
-            new_nodes.append(TextNode(remaining_text, TextType.TEXT))
-    
-    return new_nodes
-
-
-def text_node_to_html_node(text_node):
-    """
-    Convert a TextNode to an HTMLNode.
-    
-    Args:
-        text_node: A TextNode object
-        
-    Returns:
-        HTMLNode: An HTMLNode representing the TextNode
-    """
-    if text_node.text_type == TextType.TEXT:
-        return LeafNode(None, text_node.text)
-    
-    elif text_node.text_type == TextType.BOLD:
-        return LeafNode("b", text_node.text)
-    
-    elif text_node.text_type == TextType.ITALIC:
-        return LeafNode("i", text_node.text)
-    
-    elif text_node.text_type == TextType.CODE:
-        return LeafNode("code", text_node.text)
-    
-    elif text_node.text_type == TextType.LINK:
-        return LeafNode("a", text_node.text, {"href": text_node.url})
-    
-    elif text_node.text_type == TextType.IMAGE:
-        return LeafNode("img", "", {"src": text_node.url, "alt": text_node.text})
-    
-    else:
-        raise ValueError(f"Invalid TextType: {text_node.text_type}")
-
-
-def create_paragraph_node(block):
+def create_paragraph_node(block, resolver=None, text_sink=None):
     """
     Create an HTMLNode for a paragraph block.
     
     Args:
         block: A string containing the paragraph text
+        resolver: Optional UrlResolver for link and image URLs
+        text_sink: Optional text sink, passed through to text_to_children
         
     Returns:
         HTMLNode: An HTMLNode with tag 'p' and children representing the inline elements
     """
-    children = text_to_children(block)
+    children = text_to_children(block, resolver, text_sink)
     return HTMLNode("p", None, children, None)
 
 
-def create_heading_node(block):
+def create_heading_node(block, resolver=None, text_sink=None):
     """
     Create an HTMLNode for a heading block.
     
     Args:
         block: A string containing the heading text
+        resolver: Optional UrlResolver for link and image URLs
+        text_sink: Optional text sink, passed through to text_to_children
         
     Returns:
         HTMLNode: An HTMLNode with tag 'h1'-'h6' and children representing the inline elements
     """
     # Determine the heading level (h1-h6) by counting # characters
-    match = re.match(r"^(#{1,6})\s+", block)
+    match = HEADING_LEVEL_PATTERN.match(block)
     level = len(match.group(1)) if match else 1
     
     # Remove the # characters and space from the text
     text = block.lstrip("#").lstrip()
     
-    children = text_to_children(text)
+    children = text_to_children(text, resolver, text_sink)
     return HTMLNode(f"h{level}", None, children, None)
 
 
-def create_code_node(block):
+def create_code_node(block, lines=None):
     """
     Create an HTMLNode for a code block.
     
     Args:
         block: A string containing the code text with triple backtick delimiters
+        lines: The block already split into lines, if available
         
     Returns:
         HTMLNode: A nested HTMLNode with pre and code tags
     """
     # Remove the triple backticks and any language specification
-    lines = block.split("\n")
+    if lines is None:
+        lines = block.split("\n")
     if len(lines) >= 2:  # Multiple lines
         # Skip the first and last lines (which contain the backticks)
         code_content = "\n".join(lines[1:-1])
@@ -417,68 +276,80 @@ def create_code_node(block):
     return HTMLNode("pre", None, [code_node], None)
 
 
-def create_quote_node(block):
+def create_quote_node(block, lines=None, resolver=None, text_sink=None):
     """
     Create an HTMLNode for a quote block.
     
     Args:
         block: A string containing the quote text with > characters
+        lines: The block already split into lines, if available
+        resolver: Optional UrlResolver for link and image URLs
+        text_sink: Optional text sink, passed through to text_to_children
         
     Returns:
         HTMLNode: An HTMLNode with tag 'blockquote' and children representing the inline elements
     """
     # Remove the > characters from each line
-    lines = block.split("\n")
+    if lines is None:
+        lines = block.split("\n")
     processed_lines = [line.lstrip(">").lstrip() for line in lines]
     processed_block = "\n".join(processed_lines)
     
-    children = text_to_children(processed_block)
+    children = text_to_children(processed_block, resolver, text_sink)
     return HTMLNode("blockquote", None, children, None)
 
 
-def create_unordered_list_node(block):
+def create_unordered_list_node(block, lines=None, resolver=None, text_sink=None):
     """
     Create an HTMLNode for an unordered list block.
     
     Args:
         block: A string containing the list items with - characters
+        lines: The block already split into lines, if available
+        resolver: Optional UrlResolver for link and image URLs
+        text_sink: Optional text sink, passed through to text_to_children
         
     Returns:
         HTMLNode: An HTMLNode with tag 'ul' and children representing list items
     """
-    lines = block.split("\n")
+    if lines is None:
+        lines = block.split("\n")
     list_items = []
     
     for line in lines:
         if line.strip():
             # Remove the - character and space from the line
             item_text = line.lstrip("-").lstrip()
-            item_children = text_to_children(item_text)
+            item_children = text_to_children(item_text, resolver, text_sink)
             list_items.append(HTMLNode("li", None, item_children, None))
     
     return HTMLNode("ul", None, list_items, None)
 
 
-def create_ordered_list_node(block):
+def create_ordered_list_node(block, lines=None, resolver=None, text_sink=None):
     """
     Create an HTMLNode for an ordered list block.
     
     Args:
         block: A string containing the list items with numbers
+        lines: The block already split into lines, if available
+        resolver: Optional UrlResolver for link and image URLs
+        text_sink: Optional text sink, passed through to text_to_children
         
     Returns:
         HTMLNode: An HTMLNode with tag 'ol' and children representing list items
     """
-    lines = block.split("\n")
+    if lines is None:
+        lines = block.split("\n")
     list_items = []
     
     for line in lines:
         if line.strip():
             # Remove the number, period, and space from the line
-            match = re.match(r"^\d+\.\s+(.*)$", line)
+            match = ORDERED_ITEM_PATTERN.match(line)
             if match:
                 item_text = match.group(1)
-                item_children = text_to_children(item_text)
+                item_children = text_to_children(item_text, resolver, text_sink)
                 list_items.append(HTMLNode("li", None, item_children, None))
     
     return HTMLNode("ol", None, list_items, None)
\ No newline at end of file
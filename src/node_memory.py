@@ -0,0 +1,69 @@
+"""
+Measure the bytes per node of the node classes, before and after __slots__.
+
+The "before" figures come from copies of the old layout, which kept its
+attributes in an instance __dict__. benchmarks/run.py reports them, and
+test_htmlnode checks that the slotted layout stays smaller.
+"""
+import sys
+import tracemalloc
+from htmlnode import LeafNode, TextNode, TextType
+
+
+class DictLeafNode:
+    # The node layout before __slots__, for comparison
+    def __init__(self, tag=None, value=None, props=None):
+        self.tag = tag
+        self.value = value
+        self.children = None
+        self.props = props
+
+
+class DictTextNode:
+    def __init__(self, text, text_type):
+        self.text = text
+        self.text_type = text_type
+        self.url = None
+
+
+# Each node shares its text with the others so only the node itself is counted
+CASES = [
+    ("LeafNode", lambda i: DictLeafNode("b", "text"), lambda i: LeafNode("b", "text")),
+    ("TextNode", lambda i: DictTextNode("text", TextType.BOLD), lambda i: TextNode("text", TextType.BOLD)),
+]
+
+
+def bytes_per_node(factory, count=20000):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    nodes = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    # The list holding the nodes is not part of a node's cost
+    allocated -= sys.getsizeof(nodes)
+    return allocated / count
+
+
+def measure_node_memory(count=20000):
+    """
+    Measure the bytes per node of each node class, before and after
+    __slots__.
+
+    Args:
+        count: Number of nodes to allocate per measurement
+
+    Returns:
+        dict: Class name -> {"before": bytes, "after": bytes}
+    """
+    return {
+        name: {"before": bytes_per_node(before_factory, count), "after": bytes_per_node(after_factory, count)}
+        for name, before_factory, after_factory in CASES
+    }
+
+
+def print_node_memory(memory):
+    print(f"{'node':<24} {'before':>12} {'after':>12}")
+    for name, result in memory.items():
+        print(f"{name:<24} {result['before']:8.0f} B/n {result['after']:8.0f} B/n")
+
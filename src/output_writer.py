@@ -0,0 +1,134 @@
+import io
+import os
+import threading
+
+# Bytes buffered before a streamed page is written out
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+
+class WriteStats:
+    """
+    Counts of the file system calls made by an OutputWriter.
+    """
+
+    FIELDS = ("files", "bytes", "open", "write", "rename", "mkdir", "mkdir_skipped")
+
+    def __init__(self):
+        for field in self.FIELDS:
+            setattr(self, field, 0)
+
+    def add(self, other):
+        """
+        Add another WriteStats' counts to these, such as a worker's.
+        """
+        for field in self.FIELDS:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+    def __repr__(self):
+        counts = ", ".join(f"{field}={getattr(self, field)}" for field in self.FIELDS)
+        return f"WriteStats({counts})"
+
+    def summary(self):
+        """
+        Describe the counts in one line for the build summary.
+        """
+        return (f"Wrote {self.files} files ({self.bytes} bytes): {self.open} open, {self.write} write, "
+                f"{self.rename} rename, {self.mkdir} makedirs ({self.mkdir_skipped} skipped as already created)")
+
+
+class _CountingFileIO(io.FileIO):
+    """
+    A raw file that counts the write calls reaching the operating system.
+    """
+
+    def __init__(self, path, stats):
+        super().__init__(path, 'w')
+        self.stats = stats
+
+    def write(self, data):
+        self.stats.write += 1
+        return super().write(data)
+
+
+class OutputWriter:
+    """
+    Writes generated files with as few system calls as possible.
+
+    Directories are created once and remembered, so writing many pages to
+    the same directory does not stat or mkdir it again for each one. Page
+    text is encoded to UTF-8 up front and handed to the operating system in
+    one write; streamed pages go through a large buffer instead. Like
+    utility.open_for_replace, every file is written next to its path and
+    renamed over it.
+
+    A writer may be shared by several threads. Its stats attribute counts
+    the calls it made.
+    """
+
+    def __init__(self, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self.stats = WriteStats()
+        self._created = set()
+        self._lock = threading.Lock()
+
+    def ensure_dir(self, dir_path):
+        """
+        Create a directory and its parents unless this writer already has.
+        """
+        if dir_path in self._created:
+            with self._lock:
+                self.stats.mkdir_skipped += 1
+            return
+        os.makedirs(dir_path, exist_ok=True)
+        with self._lock:
+            self.stats.mkdir += 1
+            # Parents exist now too
+            while dir_path and dir_path not in self._created:
+                self._created.add(dir_path)
+                dir_path = os.path.dirname(dir_path)
+
+    def write(self, path, content):
+        """
+        Write a file, replacing any existing one.
+
+        Args:
+            path: Path of the file to write
+            content: The text, or an iterable of text fragments to stream
+
+        Returns:
+            int: Number of bytes written
+        """
+        self.ensure_dir(os.path.dirname(path) or ".")
+        temp_path = path + ".tmp"
+        stats = WriteStats()
+        try:
+            try:
+                raw = _CountingFileIO(temp_path, stats)
+            except FileNotFoundError:
+                # The directory was removed after this writer created it
+                with self._lock:
+                    self._created.clear()
+                self.ensure_dir(os.path.dirname(path) or ".")
+                raw = _CountingFileIO(temp_path, stats)
+            stats.open += 1
+            with io.BufferedWriter(raw, self.buffer_size) as file:
+                if isinstance(content, str):
+                    data = content.encode('utf-8')
+                    file.write(data)
+                    stats.bytes += len(data)
+                else:
+                    for fragment in content:
+                        data = fragment.encode('utf-8')
+                        file.write(data)
+                        stats.bytes += len(data)
+            os.replace(temp_path, path)
+            stats.rename += 1
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        finally:
+            stats.files = stats.rename
+            with self._lock:
+                self.stats.add(stats)
+        return stats.bytes
@@ -1,6 +1,30 @@
+import hashlib
+import json
 import os
-from markdown_to_html import markdown_to_html_node
+import time
+from time import perf_counter_ns
+from concurrent.futures import ProcessPoolExecutor
+from markdown_blocks import read_markdown_blocks
+from markdown_to_html import combine_text_sinks, iter_block_nodes, markdown_to_html_node
+from htmlnode import HTMLNode
+from pipeline import DEFAULT_DEPTH, DEFAULT_IO_THREADS, run_pipeline
 from extract_title import extract_title
+from build_manifest import BuildManifest, MANIFEST_FILENAME
+from profiling import NULL_TIMER, begin_page, parser_hooks
+from render_cache import RenderCache
+from search_index import SEARCH_DIRNAME, PageTerms, SearchIndex, page_url
+from link_checker import PageLinks, check_links
+from template import Template, asset_paths
+from tracing import add_event, is_tracing, make_event, span
+from output_writer import OutputWriter
+from url_resolver import UrlResolver
+
+# Markdown files larger than this are streamed block by block instead of
+# being read and parsed whole, so memory stays bounded by the largest block
+STREAMING_THRESHOLD = 16 * 1024 * 1024
+
+# How SiteBuilder can render the changed pages
+BUILD_MODES = ("batch", "pipeline")
 
 def generate_page(from_path, template_path, dest_path, basepath="/"):
     """
@@ -13,83 +37,716 @@ def generate_page(from_path, template_path, dest_path, basepath="/"):
         basepath: Base path for the site (defaults to '/')
     """
     print(f"Generating page from {from_path} to {dest_path} using {template_path}")
-    
+    render_page(from_path, Template.load(template_path, basepath), dest_path, basepath)
+
+
+def render_page(from_path, template, dest_path, basepath="/", cache=None, timer=NULL_TIMER, writer=None,
+                resolver=None, page_terms=None, page_links=None):
+    """
+    Generate an HTML page from a markdown file using a compiled template.
+
+    Args:
+        from_path: Path to the markdown file
+        template: Compiled Template, with the basepath already substituted
+        dest_path: Path where the generated HTML file will be saved
+        basepath: Base path for the site (defaults to '/')
+        cache: Optional RenderCache holding previously rendered page bodies
+        timer: Optional profiling.PageTimer charged with each stage's time
+        writer: OutputWriter to write the page with (defaults to a new one)
+        resolver: UrlResolver for link and image URLs (defaults to a new
+            one for the basepath)
+        page_terms: Optional search_index.PageTerms to collect the page's
+            title and search terms in
+        page_links: Optional link_checker.PageLinks to collect the page's
+            link and image URLs in
+
+    Returns:
+        bool: True if the page body came from the cache
+    """
+    if writer is None:
+        writer = OutputWriter()
+    if resolver is None:
+        resolver = UrlResolver(basepath)
+
+    if os.path.getsize(from_path) > STREAMING_THRESHOLD:
+        stream_page(from_path, template, dest_path, basepath, writer, resolver, page_terms, page_links)
+        # Streaming interleaves every stage; what the parser hooks did not
+        # see is charged to nodes
+        timer.lap("nodes")
+        return False
+
     # Read the markdown file
     with open(from_path, 'r', encoding='utf-8') as file:
         markdown_content = file.read()
-    
-    # Read the template file
-    with open(template_path, 'r', encoding='utf-8') as file:
-        template_content = file.read()
-    
-    # Extract the title from the markdown
-    title = extract_title(markdown_content)
-    
-    # Convert markdown to HTML
-    html_node = markdown_to_html_node(markdown_content)
-    html_content = html_node.to_html()
-    
-    # Replace basepath placeholder
-    template_content = template_content.replace('{{ basepath }}', basepath)
-    
-    # Replace content placeholders in the template
-    full_html = template_content.replace('{{ Title }}', title).replace('{{ Content }}', html_content)
-    
-    # Replace any remaining href="/" and src="/" with the basepath
-    full_html = full_html.replace('href="/', f'href="{basepath}')
-    full_html = full_html.replace('src="/', f'src="{basepath}')
-    
-    # Create destination directory if it doesn't exist
-    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-    
-    # Write the new HTML page to the destination path
-    with open(dest_path, 'w', encoding='utf-8') as file:
-        file.write(full_html)
+
+    title, body, hit = render_content(markdown_content, resolver, cache, timer, template.minify, page_terms,
+                                      page_links)
+
+    # Fill in the template and write the page as UTF-8 in one go
+    page = template.render(Title=title, Content=body)
+    timer.lap("template")
+    writer.write(dest_path, page)
+    timer.lap("write")
     
     print(f"Successfully generated {dest_path}")
+    return hit
+
+
+def render_content(markdown_content, resolver=None, cache=None, timer=NULL_TIMER, minify=False, page_terms=None,
+                   page_links=None):
+    """
+    Render markdown to the title and body HTML of a page.
+
+    Args:
+        markdown_content: The markdown text
+        resolver: Optional UrlResolver for link and image URLs
+        cache: Optional RenderCache holding previously rendered page bodies
+        timer: Optional profiling.PageTimer charged with each stage's time
+        minify: Whether to serialize the body minified
+        page_terms: Optional search_index.PageTerms to collect the page's
+            title and search terms in
+        page_links: Optional link_checker.PageLinks to collect the page's
+            link and image URLs in
+
+    Returns:
+        tuple: (title, body HTML, whether the body came from the cache)
+    """
+    # A cached body is only reused if the static file table entries its
+    # links and images resolved through are unchanged, which needs its links
+    if cache is not None and resolver is not None and resolver.has_tables and page_links is None:
+        page_links = PageLinks()
+    timer.lap("read")
+
+    cached = None
+    if cache is not None:
+        settings = resolver.cache_key if resolver is not None else ""
+        if minify:
+            settings += ";minify"
+        if page_terms is not None:
+            settings += ";search"
+        if page_links is not None:
+            settings += ";links"
+        key = cache.key(markdown_content, settings)
+        cached = cache.get(key)
+        if cached is not None and resolver is not None:
+            if not resolver.dependencies_match(cached[2].get("dependencies", {})):
+                cached = None
+        timer.lap("cache")
+
+    if cached is not None:
+        title, body, extras = cached
+        if page_terms is not None:
+            page_terms.counts.update(extras.get("terms", {}))
+        if page_links is not None:
+            page_links.links.extend(extras.get("links", []))
+    else:
+        # Extract the title from the markdown
+        title = extract_title(markdown_content)
+
+        # Convert markdown to HTML, collecting search terms and links on the way
+        text_sink = combine_text_sinks(page_terms, page_links)
+        html_node = markdown_to_html_node(markdown_content, resolver, text_sink)
+        timer.lap("nodes")
+        body = html_node.to_html(minify)
+        timer.lap("to_html")
+        if cache is not None:
+            extras = {}
+            if page_terms is not None:
+                extras["terms"] = dict(page_terms.counts)
+            if page_links is not None:
+                extras["links"] = page_links.links
+                if resolver is not None and resolver.has_tables:
+                    extras["dependencies"] = resolver.dependencies(page_links.links)
+            cache.put(key, title, body, extras)
+            timer.lap("cache")
+    if page_terms is not None:
+        page_terms.title = title
+    return title, body, cached is not None
+
+
+def stream_page(from_path, template, dest_path, basepath="/", writer=None, resolver=None, page_terms=None,
+                page_links=None):
+    """
+    Generate an HTML page from a markdown file too large to hold in memory.
+
+    The file is read twice: once up to its title, then block by block while
+    each block's HTML is written out. Only one block and its nodes are in
+    memory at a time. The output is the same as render_page's.
+
+    Args:
+        from_path: Path to the markdown file
+        template: Compiled Template, with the basepath already substituted
+        dest_path: Path where the generated HTML file will be saved
+        basepath: Base path for the site (defaults to '/')
+        writer: OutputWriter to write the page with (defaults to a new one)
+        resolver: UrlResolver for link and image URLs (defaults to a new
+            one for the basepath)
+        page_terms: Optional search_index.PageTerms to collect the page's
+            title and search terms in. Only term counts are kept, so memory
+            stays bounded by the page's vocabulary.
+        page_links: Optional link_checker.PageLinks to collect the page's
+            link and image URLs in
+    """
+    if writer is None:
+        writer = OutputWriter()
+    if resolver is None:
+        resolver = UrlResolver(basepath)
+
+    with open(from_path, 'r', encoding='utf-8') as file:
+        title = extract_title(file)
+    if page_terms is not None:
+        page_terms.title = title
+
+    # The div consumes the block nodes lazily as iter_html walks it
+    blocks = read_markdown_blocks(from_path)
+    text_sink = combine_text_sinks(page_terms, page_links)
+    body = HTMLNode("div", None, iter_block_nodes(blocks, resolver, text_sink), None)
+    writer.write(dest_path, template.iter_render(Title=title, Content=body.iter_html(template.minify)))
+
+    print(f"Successfully generated {dest_path} (streamed)")
+
+
+def output_path_for(markdown_path, dir_path_content, dest_dir_path):
+    """
+    Determine where the HTML page for a markdown file should be written.
+
+    Args:
+        markdown_path: Path to the markdown file
+        dir_path_content: Path to the content directory containing markdown files
+        dest_dir_path: Path to the destination directory for generated HTML files
+
+    Returns:
+        The output HTML path
+    """
+    # Calculate the relative path from content directory to the markdown file
+    rel_path = os.path.relpath(markdown_path, dir_path_content)
+    filename = os.path.basename(rel_path)
+    output_dir = os.path.join(dest_dir_path, os.path.dirname(rel_path))
+
+    if filename == 'index.md':
+        # For index.md files, maintain the directory structure
+        return os.path.join(output_dir, 'index.html')
+
+    # For other markdown files, replace .md with .html
+    output_name = os.path.splitext(filename)[0] + '.html'
+    return os.path.join(output_dir, output_name)
+
+
+class BuildError(Exception):
+    """
+    Raised when one or more pages fail to generate.
+
+    Attributes:
+        errors: List of (markdown_path, message) tuples, one per failed page
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        details = "\n".join(f"  {path}: {message}" for path, message in errors)
+        super().__init__(f"Failed to generate {len(errors)} page(s):\n{details}")
+
+
+def _render_chunk(chunk, template, basepath, cache=None, profile=False, trace=False, writer=None, resolver=None,
+                  search=False, links=False):
+    """
+    Render a chunk of pages, collecting errors instead of stopping at the
+    first failure. Runs in a worker process when building with several jobs.
 
+    Args:
+        chunk: List of (markdown_path, output_path) tuples
+        template: Compiled Template
+        basepath: Base path for the site
+        cache: Optional RenderCache
+        profile: Whether to time each page's pipeline stages
+        trace: Whether to make a trace event for each page
+        writer: OutputWriter for the pages (defaults to a new one)
+        resolver: UrlResolver for the pages (defaults to a new one)
+        search: Whether to collect each page's search terms
+        links: Whether to collect each page's link and image URLs
+
+    Returns:
+        tuple: A list with one (error message or None, cache hit, stage
+        timings or None, trace event or None, PageTerms or None, PageLinks
+        or None) tuple per page in the chunk, and the writer's WriteStats
+    """
+    if writer is None:
+        writer = OutputWriter()
+    if resolver is None:
+        resolver = UrlResolver(basepath)
+    results = []
+    with parser_hooks(profile):
+        for markdown_path, output_path in chunk:
+            results.append(_render_chunk_page(markdown_path, output_path, template, basepath, cache, profile, trace,
+                                              writer, resolver, search, links))
+    return results, writer.stats
+
+
+def _render_chunk_page(markdown_path, output_path, template, basepath, cache, profile, trace, writer, resolver,
+                       search, links):
+    timer = begin_page(markdown_path) if profile else NULL_TIMER
+    start = perf_counter_ns() if trace else 0
+    page_terms = PageTerms() if search else None
+    page_links = PageLinks() if links else None
+    try:
+        print(f"Generating page from {markdown_path} to {output_path}")
+        hit = render_page(markdown_path, template, output_path, basepath, cache, timer, writer, resolver,
+                          page_terms, page_links)
+        error = None
+    except Exception as e:
+        hit = False
+        error = f"{type(e).__name__}: {e}"
+        page_terms = page_links = None
+    timings = timer.finish()
+    event = None
+    if trace:
+        args = {"output": output_path, "cache_hit": hit}
+        if error is not None:
+            args["error"] = error
+        event = make_event(markdown_path, "page", start, perf_counter_ns(), args)
+    return error, hit, timings if error is None else None, event, page_terms, page_links
+
+
+def _chunked(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def render_pages(pages, template, basepath="/", jobs=1, chunk_size=None, cache=None, profile=False, trace=False,
+                 writer=None, resolver=None, search=False, links=False):
+    """
+    Render a list of pages, serially or fanned out over a process pool.
+
+    Pages are split into chunks so each worker task amortizes its start-up
+    cost over several pages. Results are returned in the order of the input
+    list regardless of which worker finished first.
+
+    Args:
+        pages: List of (markdown_path, output_path) tuples
+        template: Compiled Template, shared by every page
+        basepath: Base path for the site (defaults to '/')
+        jobs: Number of worker processes (1 renders in this process)
+        chunk_size: Pages per worker task (defaults to about four tasks per job)
+        cache: Optional RenderCache shared by every worker
+        profile: Whether to time each page's pipeline stages
+        trace: Whether to make a trace event for each page
+        writer: Optional OutputWriter. Serial builds write through it, and
+            worker processes add their writers' counts to its stats.
+        resolver: Optional UrlResolver, copied to each worker process
+        search: Whether to collect each page's search terms
+        links: Whether to collect each page's link and image URLs
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath="/"):
+    Returns:
+        list: One (error message or None, cache hit, stage timings or None,
+        trace event or None, PageTerms or None, PageLinks or None) tuple
+        per page
+    """
+    if writer is None:
+        writer = OutputWriter()
+
+    if jobs <= 1 or len(pages) <= 1:
+        results, stats = _render_chunk(pages, template, basepath, cache, profile, trace, writer, resolver, search,
+                                       links)
+        return results
+
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(pages) // (jobs * 4)))
+    chunks = _chunked(pages, chunk_size)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(_render_chunk, chunk, template, basepath, cache, profile, trace, None, resolver,
+                                   search, links) for chunk in chunks]
+        for chunk, future in zip(chunks, futures):
+            try:
+                chunk_results, stats = future.result()
+            except Exception as e:
+                # The worker itself died; blame every page in its chunk
+                results.extend((f"{type(e).__name__}: {e}", False, None, None, None, None) for _ in chunk)
+                continue
+            results.extend(chunk_results)
+            writer.stats.add(stats)
+    return results
+
+
+def render_pages_pipelined(pages, template, basepath="/", io_threads=DEFAULT_IO_THREADS, depth=DEFAULT_DEPTH,
+                           cache=None, profile=False, trace=False, writer=None, resolver=None, search=False,
+                           links=False):
+    """
+    Render a list of pages with reading, rendering and writing overlapped.
+
+    Reader threads prefetch markdown files while this thread renders, and
+    writer threads write the finished pages (see pipeline.run_pipeline).
+    On slow storage the I/O then hides behind the CPU work instead of
+    alternating with it. Bounded queues between the stages keep at most
+    about 2 * depth pages in memory.
+
+    Args:
+        pages: List of (markdown_path, output_path) tuples
+        template: Compiled Template, shared by every page
+        basepath: Base path for the site (defaults to '/')
+        io_threads: Number of reader threads and of writer threads
+        depth: Pages each stage may run ahead of the next
+        cache: Optional RenderCache
+        profile: Whether to time each page's pipeline stages
+        trace: Whether to record read, render and write trace events
+        writer: OutputWriter shared by the writer threads (defaults to a new one)
+        resolver: UrlResolver for the pages (defaults to a new one)
+        search: Whether to collect each page's search terms
+        links: Whether to collect each page's link and image URLs
+
+    Returns:
+        list: One (error message or None, cache hit, stage timings or None,
+        None, PageTerms or None, PageLinks or None) tuple per page, like
+        render_pages. Trace events are recorded
+        directly since every stage runs in this process.
+    """
+    if writer is None:
+        writer = OutputWriter()
+    if resolver is None:
+        resolver = UrlResolver(basepath)
+    hits = [False] * len(pages)
+    timings = [None] * len(pages)
+    terms = [PageTerms() if search else None for _ in pages]
+    page_links = [PageLinks() if links else None for _ in pages]
+
+    def read(item):
+        index, markdown_path, output_path = item
+        start = perf_counter_ns()
+        if os.path.getsize(markdown_path) > STREAMING_THRESHOLD:
+            # Too large to prefetch; render_page streams it instead
+            content = None
+        else:
+            with open(markdown_path, 'r', encoding='utf-8') as file:
+                content = file.read()
+        end = perf_counter_ns()
+        if trace:
+            add_event(make_event(markdown_path, "page,read", start, end))
+        return content, end - start
+
+    def process(item, data):
+        index, markdown_path, output_path = item
+        content, read_ns = data
+        print(f"Generating page from {markdown_path} to {output_path}")
+        start = perf_counter_ns()
+        timer = begin_page(markdown_path) if profile else NULL_TIMER
+        try:
+            if content is None:
+                hits[index] = render_page(markdown_path, template, output_path, basepath, cache, timer, writer,
+                                          resolver, terms[index], page_links[index])
+                return None
+            title, body, hits[index] = render_content(content, resolver, cache, timer, template.minify,
+                                                      terms[index], page_links[index])
+            page = template.render(Title=title, Content=body)
+            timer.lap("template")
+            return page
+        finally:
+            timings[index] = timer.finish()
+            if timings[index] is not None:
+                timings[index]["read"] += read_ns
+            if trace:
+                add_event(make_event(markdown_path, "page,render", start, perf_counter_ns(),
+                                     {"output": output_path, "cache_hit": hits[index]}))
+
+    def write(item, page):
+        index, markdown_path, output_path = item
+        if page is None:
+            return
+        start = perf_counter_ns()
+        writer.write(output_path, page)
+        end = perf_counter_ns()
+        if timings[index] is not None:
+            timings[index]["write"] += end - start
+        if trace:
+            add_event(make_event(markdown_path, "page,write", start, end))
+        print(f"Successfully generated {output_path}")
+
+    items = [(index, markdown_path, output_path) for index, (markdown_path, output_path) in enumerate(pages)]
+    with parser_hooks(profile):
+        errors = run_pipeline(items, read, process, write, io_threads, io_threads, depth)
+
+    return [
+        (None, hits[index], timings[index], None, terms[index], page_links[index]) if error is None
+        else (f"{type(error).__name__}: {error}", False, None, None, None, None)
+        for index, error in enumerate(errors)
+    ]
+
+
+class SiteBuilder:
+    """
+    Builds the pages of a site incrementally.
+
+    A manifest in the destination directory records each page's source hash,
+    template hash, basepath and output path, and only pages whose inputs
+    changed are rendered again. The builder keeps the manifest and the
+    compiled template between builds, so a long-running process such as
+    watch mode can rebuild a single page without reloading either.
+
+    With jobs > 1 the changed pages are rendered in a process pool. Pages are
+    always processed in sorted path order so the output and the manifest are
+    the same whatever the job count. A failing page does not stop the build;
+    all failures are reported together once every other page is written.
+
+    With a cache_dir, rendered page bodies are also kept in a RenderCache
+    there, so a page whose markdown was rendered before (in any earlier
+    build, for any template) is not parsed again.
+
+    With a profile (a profiling.BuildProfile), the time every rendered page
+    spends in each pipeline stage is recorded in it.
+
+    The mode picks how changed pages are rendered: "batch" reads, renders
+    and writes each page in turn (in jobs worker processes), while
+    "pipeline" overlaps reading and writing with rendering on io_threads
+    reader and writer threads (see render_pages_pipelined).
+
+    With assets (the assets table of an assets.AssetManifest), URLs of
+    static files in the template and the pages point at their fingerprinted
+    names. The table may change between builds. Every page is then rendered
+    again if a file the template links to changed, as for a template
+    change; otherwise only the pages linking to a changed or added file
+    are. With minify, the template and every page are written minified (see
+    template.minify_html).
+
+    With image_sizes (image_size.ImageSizes.sizes()), images whose URL
+    names a static image get width and height props. The entries each page
+    used are recorded in the manifest, so when the table changes only the
+    pages showing a changed or added image are rendered again.
+
+    With search, a search_index.SearchIndex in the destination directory is
+    kept up to date from the terms collected while pages are rendered.
+
+    With check_links, the link and image URLs of every page are collected
+    while it is rendered and recorded in the manifest. After each build they
+    are checked against the outputs of every page and static_files (paths
+    relative to the destination directory, such as SyncReport.files), and
+    the dangling ones are reported and kept in broken_links.
+    """
+
+    def __init__(self, dir_path_content, template_path, dest_dir_path, basepath="/", jobs=1, cache_dir=None,
+                 profile=None, mode="batch", io_threads=DEFAULT_IO_THREADS, assets=None, minify=False,
+                 search=False, check_links=False, static_files=(), image_sizes=None):
+        self.dir_path_content = dir_path_content
+        self.template_path = template_path
+        self.dest_dir_path = dest_dir_path
+        self.basepath = basepath
+        self.jobs = jobs
+        self.manifest = BuildManifest.load(os.path.join(dest_dir_path, MANIFEST_FILENAME))
+        self.template = None
+        self.template_hash = None
+        self._template_source = None
+        self._template_source_hash = None
+        self.cache = RenderCache(cache_dir) if cache_dir else None
+        self.profile = profile
+        if mode not in BUILD_MODES:
+            raise ValueError(f"Unknown build mode {mode!r}, expected one of {', '.join(BUILD_MODES)}")
+        self.mode = mode
+        self.io_threads = io_threads
+        self.assets = assets
+        self.minify = minify
+        self.image_sizes = image_sizes
+        self.search_index = SearchIndex.load(os.path.join(dest_dir_path, SEARCH_DIRNAME)) if search else None
+        self.check_links = check_links
+        self.static_files = static_files
+        self.broken_links = []
+
+    def find_sources(self):
+        """
+        Return every markdown file in the content directory, in sorted order.
+        """
+        sources = []
+        # Walk through all entries in the content directory
+        for root, dirs, files in os.walk(self.dir_path_content):
+            for filename in files:
+                # Check if the file is a markdown file
+                if filename.endswith('.md'):
+                    sources.append(os.path.join(root, filename))
+        sources.sort()
+        return sources
+
+    def _load_template(self):
+        # Compile the template once, and again only when its content or the
+        # settings it is compiled with change. Pages depend on the same
+        # settings, so the hash recorded for them covers these too. Of the
+        # asset table, only the entries the template links to matter.
+        source_hash = self.manifest.fingerprint(self.template_path)
+        if source_hash != self._template_source_hash:
+            with open(self.template_path, 'r', encoding='utf-8') as file:
+                self._template_source = file.read()
+            self._template_source_hash = source_hash
+        template_hash = source_hash
+        if self.assets or self.minify:
+            assets = None
+            if self.assets:
+                assets = {path: self.assets.get(path) for path in asset_paths(self._template_source)}
+            settings = json.dumps({"template": source_hash, "assets": assets, "minify": self.minify},
+                                  sort_keys=True)
+            template_hash = hashlib.sha256(settings.encode('utf-8')).hexdigest()
+        if template_hash != self.template_hash:
+            self.template = Template.compile(self._template_source, self.basepath, self.assets, self.minify)
+            self.template_hash = template_hash
+
+    def build(self, sources=None, save=True):
+        """
+        Render every page whose inputs changed.
+
+        Args:
+            sources: Markdown paths to consider. Defaults to the whole content
+                directory, in which case outputs of deleted sources are
+                removed. When given, any listed path that no longer exists
+                has its output removed.
+            save: Whether to write the manifest back to disk afterwards
+
+        Returns:
+            list: Output paths of the pages that were rendered
+
+        Raises:
+            BuildError: If any page failed to generate
+        """
+        # Ensure the destination directory exists. The writer remembers it,
+        # and every directory it creates for pages, for the rest of the build.
+        writer = OutputWriter()
+        writer.ensure_dir(self.dest_dir_path)
+        # Link and image URLs are resolved once per build
+        resolver = UrlResolver(self.basepath, self.assets, self.image_sizes)
+        with span("load template"):
+            self._load_template()
+
+        full_build = sources is None
+        if full_build:
+            with span("walk content", dir=self.dir_path_content):
+                sources = self.find_sources()
+        else:
+            deleted = [path for path in sources if not os.path.exists(path)]
+            sources = sorted(path for path in sources if os.path.exists(path))
+
+        # Skip pages whose source, template, basepath and the static file
+        # entries they used are unchanged, unless they are missing from the
+        # search index or have no recorded links
+        collect_links = self.check_links or resolver.has_tables
+        pending = []
+        skipped = 0
+        with span("check freshness", sources=len(sources)):
+            for markdown_path in sources:
+                output_path = output_path_for(markdown_path, self.dir_path_content, self.dest_dir_path)
+                relative_output = os.path.relpath(output_path, self.dest_dir_path)
+                source_hash = self.manifest.fingerprint(markdown_path)
+                indexed = self.search_index is None or markdown_path in self.search_index.pages
+                entry = self.manifest.pages.get(markdown_path, {})
+                linked = not self.check_links or "links" in entry
+                current = resolver.dependencies_match(entry.get("dependencies", {}))
+                if indexed and linked and current and self.manifest.is_fresh(
+                        markdown_path, relative_output, source_hash, self.template_hash, self.basepath):
+                    skipped += 1
+                else:
+                    pending.append((markdown_path, output_path, relative_output, source_hash))
+
+        # Render the changed pages with the compiled template
+        start = time.perf_counter()
+        pages = [(markdown_path, output_path) for markdown_path, output_path, _, _ in pending]
+        with span("render pages", pages=len(pending), mode=self.mode):
+            if self.mode == "pipeline":
+                results = render_pages_pipelined(
+                    pages, self.template, self.basepath, self.io_threads, cache=self.cache,
+                    profile=self.profile is not None, trace=is_tracing(), writer=writer, resolver=resolver,
+                    search=self.search_index is not None, links=collect_links,
+                )
+            else:
+                results = render_pages(
+                    pages, self.template, self.basepath, self.jobs, cache=self.cache,
+                    profile=self.profile is not None, trace=is_tracing(), writer=writer, resolver=resolver,
+                    search=self.search_index is not None, links=collect_links,
+                )
+        elapsed = time.perf_counter() - start
+
+        rendered = []
+        errors = []
+        hits = 0
+        for (markdown_path, output_path, relative_output, source_hash), result in zip(pending, results):
+            error, hit, timings, event, page_terms, page_links = result
+            hits += hit
+            if timings is not None:
+                self.profile.add_page(markdown_path, timings)
+            if event is not None:
+                add_event(event)
+            if error is None:
+                links = page_links.links if page_links is not None else None
+                self.manifest.record(markdown_path, relative_output, source_hash, self.template_hash, self.basepath,
+                                     links, resolver.dependencies(links or []))
+                rendered.append(output_path)
+                if page_terms is not None:
+                    self.search_index.update(markdown_path, page_url(relative_output, self.basepath), page_terms)
+            else:
+                errors.append((markdown_path, error))
+
+        if full_build:
+            removed = self.manifest.remove_stale(sources)
+        else:
+            removed = [path for path in map(self.manifest.forget, deleted) if path is not None]
+        if save:
+            with span("save manifest"):
+                self.manifest.save()
+        if self.search_index is not None:
+            if full_build:
+                self.search_index.retain(sources)
+            else:
+                for markdown_path in deleted:
+                    self.search_index.remove(markdown_path)
+            with span("save search index"):
+                shards = self.search_index.save()
+
+        rate = len(rendered) / elapsed if elapsed > 0 else 0.0
+        if self.mode == "pipeline":
+            workers = f"pipeline, {self.io_threads} I/O thread(s)"
+        else:
+            workers = f"{self.jobs} job(s)"
+        print(f"Rendered {len(rendered)} pages, skipped {skipped} unchanged, removed {len(removed)} stale "
+              f"in {elapsed:.2f}s ({rate:.1f} pages/sec, {workers})")
+        print(writer.stats.summary())
+        if self.cache is not None:
+            with span("evict render cache"):
+                evicted = self.cache.evict() if full_build else 0
+            print(f"Render cache: {hits} hits, {len(pending) - hits} misses, {evicted} evicted")
+        if self.check_links:
+            with span("check links"):
+                self._check_links()
+        if self.search_index is not None:
+            print(f"Search index: {len(self.search_index.pages)} pages, {shards} shards updated")
+
+        if errors:
+            raise BuildError(errors)
+        return rendered
+
+    def _check_links(self):
+        # Every page's links are checked, as an unchanged page can link to
+        # one that was just removed
+        outputs = {entry["output"].replace(os.sep, "/") for entry in self.manifest.pages.values()}
+        targets = outputs | {path.replace(os.sep, "/") for path in self.static_files}
+        pages = [(source_path, entry["output"], entry.get("links", []))
+                 for source_path, entry in sorted(self.manifest.pages.items())]
+        self.broken_links = check_links(pages, targets)
+        total = sum(len(links) for _, _, links in pages)
+        print(f"Checked {total} links in {len(pages)} pages: {len(self.broken_links)} broken")
+        for broken_link in self.broken_links:
+            print(f"  {broken_link}")
+
+
+def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath="/", jobs=1, cache_dir=None):
     """
     Recursively generate HTML pages from markdown files in a directory.
+
+    Only pages whose source, template or basepath changed since the last
+    build are rendered, and outputs whose source has been deleted are
+    removed (see SiteBuilder).
     
     Args:
         dir_path_content: Path to the content directory containing markdown files
         template_path: Path to the HTML template file
         dest_dir_path: Path to the destination directory for generated HTML files
         basepath: Base path for the site (defaults to '/')
+        jobs: Number of worker processes used for rendering (defaults to 1)
+        cache_dir: Directory for the rendered page cache (no cache if None)
+
+    Raises:
+        BuildError: If any page failed to generate
     """
     print(f"Crawling directory: {dir_path_content}")
-    
-    # Ensure the destination directory exists
-    os.makedirs(dest_dir_path, exist_ok=True)
-    
-    # Walk through all entries in the content directory
-    for root, dirs, files in os.walk(dir_path_content):
-        for filename in files:
-            # Check if the file is a markdown file
-            if filename.endswith('.md'):
-                # Get the full path to the markdown file
-                markdown_path = os.path.join(root, filename)
-                
-                # Calculate the relative path from content directory to the markdown file
-                rel_path = os.path.relpath(markdown_path, dir_path_content)
-                
-                # Determine the output HTML path
-                if filename == 'index.md':
-                    # For index.md files, maintain the directory structure
-                    output_dir = os.path.join(dest_dir_path, os.path.dirname(rel_path))
-                    output_path = os.path.join(output_dir, 'index.html')
-                else:
-                    # For other markdown files, replace .md with .html
-                    output_dir = os.path.join(dest_dir_path, os.path.dirname(rel_path))
-                    output_name = os.path.splitext(filename)[0] + '.html'
-                    output_path = os.path.join(output_dir, output_name)
-                
-                # Create the output directory if it doesn't exist
-                os.makedirs(output_dir, exist_ok=True)
-                
-                # Generate the HTML page with the basepath
-                generate_page(markdown_path, template_path, output_path, basepath)
-    
-    print(f"Completed recursive page generation from {dir_path_content} to {dest_dir_path}")
\ No newline at end of file
+    SiteBuilder(dir_path_content, template_path, dest_dir_path, basepath, jobs, cache_dir).build()
+    print(f"Completed recursive page generation from {dir_path_content} to {dest_dir_path}")
@@ -0,0 +1,76 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Default number of threads for each I/O stage
+DEFAULT_IO_THREADS = 4
+
+# Default number of items each stage may run ahead of the next one
+DEFAULT_DEPTH = 16
+
+
+def run_pipeline(items, read, process, write, readers=DEFAULT_IO_THREADS, writers=DEFAULT_IO_THREADS,
+                 depth=DEFAULT_DEPTH):
+    """
+    Run items through a read, process, write pipeline with overlapping stages.
+
+    Reads run on a pool of reader threads and writes on a pool of writer
+    threads, while process runs on the calling thread in item order. The
+    stages are connected by bounded queues, so a slow stage holds the others
+    back instead of letting work pile up: at most depth items are read ahead
+    of process, and at most depth processed items wait to be written.
+
+    An exception in any stage is recorded against its item and the item
+    skips the stages after it. Other items carry on.
+
+    Args:
+        items: List of work items
+        read: Called with an item on a reader thread; returns its input
+        process: Called with an item and its input on the calling thread;
+            returns its output
+        write: Called with an item and its output on a writer thread
+        readers: Number of reader threads
+        writers: Number of writer threads
+        depth: Items each stage may run ahead of the next
+
+    Returns:
+        list: The exception raised for each item, or None if it succeeded
+    """
+    errors = [None] * len(items)
+    read_queue = queue.Queue(maxsize=depth)
+    write_slots = threading.BoundedSemaphore(depth)
+
+    with ThreadPoolExecutor(readers, thread_name_prefix="reader") as read_pool, \
+            ThreadPoolExecutor(writers, thread_name_prefix="writer") as write_pool:
+
+        def feed():
+            # Blocks once depth reads are waiting to be processed
+            for index, item in enumerate(items):
+                read_queue.put((index, read_pool.submit(read, item)))
+            read_queue.put(None)
+
+        threading.Thread(target=feed, name="feeder", daemon=True).start()
+
+        def written(future, index):
+            write_slots.release()
+            if future.exception() is not None:
+                errors[index] = future.exception()
+
+        while True:
+            entry = read_queue.get()
+            if entry is None:
+                break
+            index, read_future = entry
+            item = items[index]
+            try:
+                output = process(item, read_future.result())
+            except Exception as e:
+                errors[index] = e
+                continue
+
+            # Blocks once depth outputs are waiting to be written
+            write_slots.acquire()
+            write_future = write_pool.submit(write, item, output)
+            write_future.add_done_callback(lambda future, index=index: written(future, index))
+
+    return errors
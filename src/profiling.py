@@ -0,0 +1,242 @@
+import json
+import os
+from contextlib import contextmanager
+from time import perf_counter_ns
+
+# Pipeline stages timed for every page, in pipeline order. "cache" is
+# keying, looking up and storing the page in the render cache. "nodes" is
+# the part of parsing not spent in the three hooked parser functions:
+# building HTMLNodes and converting TextNodes.
+STAGES = ("read", "cache", "blocks", "classify", "inline", "nodes", "to_html", "template", "write")
+
+# Parser functions whose time is attributed to their own stage, as
+# (module, global name, stage). They run once per block or more, so they
+# are only wrapped with timers once profiling is switched on.
+HOOKED_FUNCTIONS = (
+    ("markdown_to_html", "markdown_to_blocks", "blocks"),
+    ("markdown_to_html", "classify_block", "classify"),
+    ("markdown_to_html", "parse_inline", "inline"),
+)
+
+# Percentiles reported for every stage
+PERCENTILES = (50, 90, 99)
+
+# The page being rendered in this process while profiling, if any
+_current_page = None
+
+
+class PageTimer:
+    """
+    Accumulates the time one page spends in each pipeline stage.
+
+    lap() charges the time since the previous lap to a stage. Time spent
+    in the hooked parser functions is charged to their own stages and
+    taken back out of "nodes" when the page finishes.
+    """
+
+    enabled = True
+
+    __slots__ = ("path", "stages", "_last")
+
+    def __init__(self, path):
+        self.path = path
+        self.stages = dict.fromkeys(STAGES, 0)
+        self._last = perf_counter_ns()
+
+    def lap(self, stage):
+        now = perf_counter_ns()
+        self.stages[stage] += now - self._last
+        self._last = now
+
+    def finish(self):
+        """
+        Stop timing the page.
+
+        Returns:
+            dict: stage -> nanoseconds
+        """
+        global _current_page
+        _current_page = None
+        hooked = self.stages["blocks"] + self.stages["classify"] + self.stages["inline"]
+        self.stages["nodes"] = max(self.stages["nodes"] - hooked, 0)
+        return self.stages
+
+
+class _NullTimer:
+    """
+    Stands in for PageTimer when profiling is off, so render_page can call
+    lap() unconditionally.
+    """
+
+    enabled = False
+
+    def lap(self, stage):
+        pass
+
+    def finish(self):
+        return None
+
+
+NULL_TIMER = _NullTimer()
+
+
+def begin_page(path):
+    """
+    Start timing a page. The hooked parser functions charge their time to
+    the returned timer until it finishes.
+    """
+    global _current_page
+    _current_page = PageTimer(path)
+    return _current_page
+
+
+def _timed(stage, func):
+    def timed(*args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if _current_page is not None:
+                _current_page.stages[stage] += perf_counter_ns() - start
+    timed.__wrapped__ = func
+    return timed
+
+
+def install_hooks():
+    """
+    Wrap the hooked parser functions with timers in this process.
+
+    Until this is called the parser runs its original functions, so
+    profiling costs nothing when it is off. Calling it again does nothing.
+
+    Returns:
+        list: (module, global name) of each function wrapped by this call
+    """
+    import importlib
+    installed = []
+    for module_name, name, stage in HOOKED_FUNCTIONS:
+        module = importlib.import_module(module_name)
+        func = getattr(module, name)
+        if not hasattr(func, "__wrapped__"):
+            setattr(module, name, _timed(stage, func))
+            installed.append((module, name))
+    return installed
+
+
+def uninstall_hooks():
+    """
+    Restore the original parser functions.
+    """
+    import importlib
+    for module_name, name, stage in HOOKED_FUNCTIONS:
+        module = importlib.import_module(module_name)
+        func = getattr(module, name)
+        setattr(module, name, getattr(func, "__wrapped__", func))
+
+
+@contextmanager
+def parser_hooks(enabled=True):
+    """
+    Wrap the hooked parser functions with timers for the duration of a
+    with block, if enabled.
+
+    Only the functions wrapped on entry are restored on exit, so nested
+    blocks leave the outer one's timers in place, and a later unprofiled
+    build in the same process (such as a watch mode rebuild) runs the
+    original functions again.
+    """
+    installed = install_hooks() if enabled else []
+    try:
+        yield
+    finally:
+        for module, name in installed:
+            setattr(module, name, getattr(module, name).__wrapped__)
+
+
+def percentile(sorted_values, pct):
+    """
+    Return the nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[rank - 1]
+
+
+class BuildProfile:
+    """
+    Collects per-page stage timings for a build and summarizes them.
+    """
+
+    def __init__(self, slowest=10):
+        self.slowest = slowest
+        self.pages = []
+
+    def add_page(self, path, stages):
+        """
+        Record the stage timings of one rendered page.
+
+        Args:
+            path: Path to the page's markdown source
+            stages: dict of stage -> nanoseconds
+        """
+        self.pages.append((path, stages))
+
+    def report(self):
+        """
+        Summarize the collected timings.
+
+        Returns:
+            dict: Page count, per-stage totals and percentiles in
+            milliseconds, and the slowest pages with their stage breakdown
+        """
+        stages = {}
+        for stage in STAGES:
+            values = sorted(timings[stage] for path, timings in self.pages)
+            summary = {"total_ms": _ms(sum(values))}
+            for pct in PERCENTILES:
+                summary[f"p{pct}_ms"] = _ms(percentile(values, pct))
+            summary["max_ms"] = _ms(values[-1] if values else 0)
+            stages[stage] = summary
+
+        by_total = sorted(self.pages, key=lambda page: sum(page[1].values()), reverse=True)
+        slowest = [
+            {
+                "path": path,
+                "total_ms": _ms(sum(timings.values())),
+                "stages_ms": {stage: _ms(timings[stage]) for stage in STAGES},
+            }
+            for path, timings in by_total[:self.slowest]
+        ]
+
+        return {
+            "pages": len(self.pages),
+            "total_ms": _ms(sum(sum(timings.values()) for path, timings in self.pages)),
+            "stages": stages,
+            "slowest_pages": slowest,
+        }
+
+    def write(self, path):
+        """
+        Write the report as JSON.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.report(), file, indent=1)
+
+    def summary_lines(self):
+        """
+        Format the per-stage totals as lines for the console.
+        """
+        report = self.report()
+        total = report["total_ms"] or 1
+        lines = [f"Profiled {report['pages']} pages ({report['total_ms']:.1f} ms rendering)"]
+        for stage, summary in report["stages"].items():
+            share = summary["total_ms"] / total * 100
+            lines.append(f"  {stage:<9}{summary['total_ms']:>10.1f} ms {share:5.1f}%"
+                         f"   p50 {summary['p50_ms']:.3f} ms   p99 {summary['p99_ms']:.3f} ms")
+        return lines
+
+
+def _ms(ns):
+    return round(ns / 1e6, 3)
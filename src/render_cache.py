@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+from utility import open_for_replace
+
+# Default cache location, next to the content directory
+CACHE_DIRNAME = ".ssg-cache"
+
+# Part of every cache key. Bump it whenever a change to the markdown
+# renderer changes the HTML it produces, so old entries are never reused.
+RENDERER_VERSION = "3"
+
+# Entries beyond this many bytes are evicted, least recently used first
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class RenderCache:
+    """
+    A persistent cache of rendered page bodies.
+
+    Each entry stores the title and body HTML rendered from one markdown
+    document (and anything else collected while rendering it, such as its
+    search terms), keyed by a hash of the renderer version, the settings the
+    body depends on (such as the basepath its URLs point under) and the
+    markdown text.
+    Entries are one file each, so worker processes can read and write the
+    cache without coordinating. A hit touches the entry's modification time,
+    and evict() removes the least recently used entries once the cache grows
+    past max_bytes.
+
+    The body does not depend on the template, so one entry serves builds
+    with any template.
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES, version=RENDERER_VERSION):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.version = version
+
+    def key(self, markdown, settings=""):
+        """
+        Return the cache key for a markdown document.
+
+        Args:
+            markdown: The markdown text
+            settings: A string describing the render settings, such as
+                UrlResolver.cache_key
+
+        Returns:
+            The hex digest identifying the document, settings and renderer version
+        """
+        digest = hashlib.sha256(self.version.encode('utf-8'))
+        digest.update(b"\0")
+        digest.update(settings.encode('utf-8'))
+        digest.update(b"\0")
+        digest.update(markdown.encode('utf-8'))
+        return digest.hexdigest()
+
+    def entry_path(self, key):
+        """
+        Return the file an entry is stored in. Entries are spread over
+        subdirectories named after the first two characters of the key.
+        """
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def get(self, key):
+        """
+        Look up a rendered document.
+
+        Args:
+            key: The key returned by key()
+
+        Returns:
+            tuple: (title, body_html, dict of extras stored with them), or
+            None on a miss
+        """
+        path = self.entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry["title"], entry["html"], entry.get("extras", {})
+
+    def put(self, key, title, html, extras=None):
+        """
+        Store a rendered document, with a dict of JSON-serializable extras
+        if given.
+
+        Failing to write the cache never fails the build; the document is
+        simply rendered again next time.
+        """
+        path = self.entry_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            entry = {"title": title, "html": html}
+            if extras:
+                entry["extras"] = extras
+            with open_for_replace(path) as file:
+                json.dump(entry, file)
+        except OSError:
+            pass
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache fits in max_bytes.
+
+        Returns:
+            int: Number of entries removed
+        """
+        entries = []
+        total = 0
+        for root, dirs, files in os.walk(self.cache_dir):
+            for filename in files:
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+                total += stat.st_size
+
+        removed = 0
+        entries.sort()
+        for mtime_ns, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,225 @@
+import json
+import os
+import re
+from collections import Counter
+from utility import open_for_replace
+
+# Directory in the output holding the index
+SEARCH_DIRNAME = "search"
+
+# Lists every indexed page: {"prefix_length": N, "pages": [[url, title], ...]}
+# A page's position in the list is its id in the postings. Ids of removed
+# pages are left as null so the ids of the other pages never change.
+PAGES_FILENAME = "pages.json"
+
+# Records what each page was indexed with, so a later build can remove
+# exactly its old postings
+STATE_FILENAME = ".search-state.json"
+SEARCH_STATE_VERSION = 1
+
+# Terms are grouped into shards named after their first characters, so a
+# browser searching for "rivendell" only loads search/ri.json
+PREFIX_LENGTH = 2
+
+# Runs of two or more word characters, after case folding
+TERM_PATTERN = re.compile(r"\w\w+")
+
+
+def _to_json(data):
+    # Compact, and encoded in one go, which uses the C encoder; json.dump
+    # falls back to the much slower pure Python one
+    return json.dumps(data, separators=(",", ":"), sort_keys=True)
+
+
+class PageTerms:
+    """
+    Collects the search terms of one page while it is rendered.
+
+    The page renderer passes it to the markdown converter as its text sink,
+    so the text of every inline node is counted as the node is made and the
+    finished HTML is never parsed again.
+    """
+
+    def __init__(self):
+        self.title = None
+        self.counts = Counter()
+
+    def add(self, text_nodes):
+        """
+        Count the terms in the text of a list of inline TextNodes.
+        """
+        text = " ".join([text_node.text for text_node in text_nodes])
+        self.counts.update(TERM_PATTERN.findall(text.casefold()))
+
+
+def page_url(output_path, basepath="/"):
+    """
+    Return the URL a page is served at.
+
+    Args:
+        output_path: Path of the page relative to the output directory
+        basepath: Base path for the site
+
+    Returns:
+        The URL, without the file name for index.html pages
+    """
+    url = basepath + output_path.replace(os.sep, "/")
+    if url.endswith("/index.html"):
+        url = url[:-len("index.html")]
+    return url
+
+
+class SearchIndex:
+    """
+    A client-side full-text search index, updated incrementally.
+
+    The index is an inverted index from term to postings, [page id, count]
+    pairs, written as one JSON file per term prefix in the search directory.
+    Pages are keyed by their markdown source, like the build manifest. Only
+    the shards holding terms a changed page gained or lost are read and
+    written again when the index is saved.
+    """
+
+    def __init__(self, search_dir):
+        self.search_dir = search_dir
+        # Source path -> id, url, title and term counts
+        self.pages = {}
+        self.urls = []
+        # Prefix -> term -> page id -> new count, or None to remove
+        self._changes = {}
+        self._pages_changed = False
+
+    @classmethod
+    def load(cls, search_dir):
+        """
+        Load an index's state from disk, or return an empty index if it is
+        missing, unreadable or written by a different version.
+
+        Args:
+            search_dir: Path to the search directory in the output
+
+        Returns:
+            SearchIndex: The loaded index
+        """
+        index = cls(search_dir)
+        try:
+            with open(os.path.join(search_dir, STATE_FILENAME), 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return index
+
+        if data.get("version") != SEARCH_STATE_VERSION:
+            return index
+
+        index.pages = data.get("pages", {})
+        index.urls = data.get("urls", [])
+        return index
+
+    def update(self, source_path, url, page_terms):
+        """
+        Replace what a page is indexed with.
+
+        Args:
+            source_path: Path to the page's markdown source
+            url: URL the page is served at
+            page_terms: The PageTerms collected while rendering it
+        """
+        entry = self.pages.get(source_path)
+        if entry is None:
+            entry = {"id": len(self.urls), "url": None, "title": None, "terms": {}}
+            self.urls.append(None)
+            self.pages[source_path] = entry
+
+        page_id = entry["id"]
+        old_terms = entry["terms"]
+        new_terms = dict(page_terms.counts)
+        for term in old_terms.keys() - new_terms.keys():
+            self._change(term, page_id, None)
+        for term, count in new_terms.items():
+            if old_terms.get(term) != count:
+                self._change(term, page_id, count)
+
+        if entry["url"] != url or entry["title"] != page_terms.title:
+            self.urls[page_id] = [url, page_terms.title]
+            self._pages_changed = True
+        entry.update(url=url, title=page_terms.title, terms=new_terms)
+
+    def remove(self, source_path):
+        """
+        Remove a page from the index, if it is in it.
+        """
+        entry = self.pages.pop(source_path, None)
+        if entry is None:
+            return
+        for term in entry["terms"]:
+            self._change(term, entry["id"], None)
+        self.urls[entry["id"]] = None
+        self._pages_changed = True
+
+    def retain(self, source_paths):
+        """
+        Remove every page whose source is not in source_paths.
+        """
+        source_paths = set(source_paths)
+        for source_path in [path for path in self.pages if path not in source_paths]:
+            self.remove(source_path)
+
+    def _change(self, term, page_id, count):
+        self._changes.setdefault(term[:PREFIX_LENGTH], {}).setdefault(term, {})[page_id] = count
+
+    def shard_path(self, prefix):
+        """
+        Return the file holding the postings of terms starting with prefix.
+        """
+        return os.path.join(self.search_dir, prefix + ".json")
+
+    def save(self):
+        """
+        Write the changed shards, the page list if it changed, and the state.
+
+        Returns:
+            int: Number of shards written or removed
+        """
+        os.makedirs(self.search_dir, exist_ok=True)
+        for prefix, changes in sorted(self._changes.items()):
+            self._save_shard(prefix, changes)
+        written = len(self._changes)
+        self._changes = {}
+
+        pages_path = os.path.join(self.search_dir, PAGES_FILENAME)
+        if self._pages_changed or not os.path.exists(pages_path):
+            with open_for_replace(pages_path) as file:
+                file.write(_to_json({"prefix_length": PREFIX_LENGTH, "pages": self.urls}))
+            self._pages_changed = False
+
+        state = {"version": SEARCH_STATE_VERSION, "pages": self.pages, "urls": self.urls}
+        with open_for_replace(os.path.join(self.search_dir, STATE_FILENAME)) as file:
+            file.write(_to_json(state))
+        return written
+
+    def _save_shard(self, prefix, changes):
+        path = self.shard_path(prefix)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                shard = json.load(file)
+        except (OSError, ValueError):
+            shard = {}
+
+        for term, page_counts in changes.items():
+            postings = {page_id: count for page_id, count in shard.get(term, [])}
+            for page_id, count in page_counts.items():
+                if count is None:
+                    postings.pop(page_id, None)
+                else:
+                    postings[page_id] = count
+            if postings:
+                shard[term] = sorted(postings.items())
+            else:
+                shard.pop(term, None)
+
+        if not shard:
+            if os.path.exists(path):
+                os.unlink(path)
+            return
+        with open_for_replace(path) as file:
+            file.write(_to_json(shard))
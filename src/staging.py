@@ -0,0 +1,132 @@
+import os
+import shutil
+import time
+
+# The next build is assembled here, next to the output directory
+STAGING_SUFFIX = ".staging"
+
+# The previous build is moved here while the new one is swapped in
+PREVIOUS_SUFFIX = ".previous"
+
+
+def link_tree(source_dir, dest_dir):
+    """
+    Recreate source_dir's directory tree in dest_dir with hard links to its files.
+
+    Files are copied instead if the filesystem does not support hard links.
+
+    Args:
+        source_dir: Directory to mirror
+        dest_dir: Directory to create the links in
+
+    Returns:
+        int: Number of files linked or copied
+    """
+    count = 0
+    for root, dirs, files in os.walk(source_dir):
+        target_root = os.path.join(dest_dir, os.path.relpath(root, source_dir))
+        os.makedirs(target_root, exist_ok=True)
+        for filename in files:
+            source_path = os.path.join(root, filename)
+            target_path = os.path.join(target_root, filename)
+            try:
+                os.link(source_path, target_path)
+            except OSError:
+                shutil.copy2(source_path, target_path)
+            count += 1
+    return count
+
+
+def recover_output(output_dir):
+    """
+    Clean up after a build that stopped part-way through publishing.
+
+    If the output directory is missing but the previous build is still set
+    aside, the previous build is put back. Otherwise the leftover previous
+    build is deleted.
+    """
+    previous_dir = output_dir + PREVIOUS_SUFFIX
+    if not os.path.isdir(previous_dir):
+        return
+    if os.path.lexists(output_dir):
+        shutil.rmtree(previous_dir)
+    else:
+        print(f"Restoring {output_dir} from {previous_dir}")
+        os.rename(previous_dir, output_dir)
+
+
+def stage_output(output_dir):
+    """
+    Create a staging directory for the next build of output_dir.
+
+    The staging directory starts as hard links to every file in the current
+    output, so an incremental build only writes the files that change.
+    Anything written into it must replace files rather than modify them in
+    place (see utility.open_for_replace), or the live output would change too.
+
+    Args:
+        output_dir: The published output directory
+
+    Returns:
+        The path of the staging directory
+    """
+    recover_output(output_dir)
+
+    staging_dir = output_dir + STAGING_SUFFIX
+    if os.path.lexists(staging_dir):
+        # Left over from a build that crashed
+        shutil.rmtree(staging_dir)
+    os.makedirs(staging_dir)
+
+    if os.path.isdir(output_dir):
+        linked = link_tree(output_dir, staging_dir)
+        print(f"Staging build in {staging_dir} ({linked} files linked from {output_dir})")
+    return staging_dir
+
+
+def publish_output(staging_dir, output_dir):
+    """
+    Make a finished staging directory the published output.
+
+    If output_dir is a symlink, a new symlink to the staged build replaces
+    it in one atomic rename. Otherwise the current output is renamed aside
+    and the staging directory renamed into its place. The output is then
+    missing only between two renames, and recover_output restores it if the
+    process dies in that window.
+
+    Args:
+        staging_dir: Directory holding the finished build
+        output_dir: The published output directory
+    """
+    if os.path.islink(output_dir):
+        _flip_symlink(staging_dir, output_dir)
+        return
+
+    previous_dir = output_dir + PREVIOUS_SUFFIX
+    if os.path.lexists(output_dir):
+        os.rename(output_dir, previous_dir)
+    os.rename(staging_dir, output_dir)
+    if os.path.isdir(previous_dir):
+        shutil.rmtree(previous_dir)
+    print(f"Published {output_dir}")
+
+
+def _flip_symlink(staging_dir, output_dir):
+    old_target = os.path.realpath(output_dir)
+
+    # Give the build a permanent name next to the symlink, then point at it
+    release_dir = f"{output_dir}-{time.time_ns()}"
+    os.rename(staging_dir, release_dir)
+    temp_link = output_dir + ".link"
+    if os.path.lexists(temp_link):
+        os.unlink(temp_link)
+    os.symlink(os.path.basename(release_dir), temp_link)
+    os.replace(temp_link, output_dir)
+    print(f"Published {output_dir} -> {release_dir}")
+
+    # Only delete the old build if it is one of ours
+    release_prefix = os.path.basename(output_dir) + "-"
+    if (os.path.basename(old_target).startswith(release_prefix) and
+            os.path.dirname(old_target) == os.path.dirname(os.path.realpath(release_dir)) and
+            os.path.isdir(old_target)):
+        shutil.rmtree(old_target)
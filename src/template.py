@@ -0,0 +1,230 @@
+import re
+from assets import fingerprint_path
+from htmlnode import UNQUOTED_VALUE
+
+# Matches a slot placeholder such as {{ Title }} or {{ Content }}
+SLOT_PATTERN = re.compile(r"\{\{ (\w+) \}\}")
+
+# Matches a root-relative href or src attribute, written with a leading
+# slash or with the {{ basepath }} placeholder
+ROOT_URL_PATTERN = re.compile(r'\b(href|src)="(/|\{\{ basepath \}\})([^"]*)"')
+
+# Elements whose content minify_html keeps exactly as written
+RAW_ELEMENT_PATTERN = re.compile(r"<(pre|textarea|script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+
+# Whitespace between two tags
+INTER_TAG_SPACE_PATTERN = re.compile(r">(\s+)<")
+
+# A start tag, and the attributes inside one
+START_TAG_PATTERN = re.compile(r"<[A-Za-z][^\s<>/]*([^<>]*)>")
+ATTRIBUTE_PATTERN = re.compile(r"""\s+([^\s"'<>/=]+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s"'=<>`]+))?""")
+
+
+def rewrite_root_urls(html, basepath):
+    """
+    Point root-relative href and src attributes at the basepath.
+
+    Args:
+        html: An HTML string
+        basepath: Base path for the site
+
+    Returns:
+        The HTML with href="/ and src="/ prefixed by the basepath
+    """
+    if basepath == "/":
+        return html
+    html = html.replace('href="/', f'href="{basepath}')
+    return html.replace('src="/', f'src="{basepath}')
+
+
+def rewrite_asset_urls(html, assets):
+    """
+    Point root-relative href and src attributes naming static files at
+    their fingerprinted names.
+
+    Args:
+        html: An HTML string
+        assets: Dict of static file path -> fingerprinted name
+
+    Returns:
+        The HTML with asset URLs replaced
+    """
+    def replace(match):
+        attribute, prefix, path = match.groups()
+        return f'{attribute}="{prefix}{fingerprint_path(path, assets)}"'
+
+    return ROOT_URL_PATTERN.sub(replace, html)
+
+
+def asset_paths(html):
+    """
+    Return the static file paths that root-relative href and src attributes
+    name, as rewrite_asset_urls looks them up.
+    """
+    paths = set()
+    for match in ROOT_URL_PATTERN.finditer(html):
+        path = match.group(3)
+        for separator in "?#":
+            path = path.split(separator, 1)[0]
+        paths.add(path)
+    return paths
+
+
+def _minify_attributes(match):
+    def attribute(match):
+        name, value = match.groups()
+        if value is None:
+            return f" {name}"
+        # An unquoted value would swallow the slash of a directly following "/>"
+        followed_by_slash = match.string.startswith("/", match.end())
+        if value[0] in "\"'" and UNQUOTED_VALUE.match(value[1:-1]) and not followed_by_slash:
+            value = value[1:-1]
+        return f" {name}={value}"
+
+    tag = match.group(0)
+    start = match.start(1) - match.start(0)
+    end = match.end(1) - match.start(0)
+    return tag[:start] + ATTRIBUTE_PATTERN.sub(attribute, tag[start:end]) + tag[end:]
+
+
+def _collapse_space(match):
+    # Indentation between tags goes; a space on one line may separate words
+    return "><" if "\n" in match.group(1) else "> <"
+
+
+def minify_html(html):
+    """
+    Minify hand-written HTML, such as a template, once at compile time.
+
+    Whitespace between tags is removed where it contains a line break and
+    collapsed to one space where it doesn't, quotes are dropped from
+    attribute values that don't need them, and leading and trailing
+    whitespace is removed. The content of pre, textarea, script and style
+    elements is left exactly as written.
+
+    Args:
+        html: An HTML string
+
+    Returns:
+        The minified HTML
+    """
+    # Set raw elements aside behind placeholder tags
+    raw = []
+
+    def set_aside(match):
+        raw.append(match.group(0))
+        return f"<\0{len(raw) - 1}>"
+
+    html = RAW_ELEMENT_PATTERN.sub(set_aside, html)
+    html = INTER_TAG_SPACE_PATTERN.sub(_collapse_space, html)
+    html = START_TAG_PATTERN.sub(_minify_attributes, html)
+    html = re.sub(r"<\0(\d+)>", lambda match: raw[int(match.group(1))], html)
+    return html.strip()
+
+
+class Template:
+    """
+    A page template compiled into literal text and named slots.
+
+    The template file is read and split once per build. The basepath is
+    substituted into the literal text at compile time, so rendering a page is
+    a single join of the literals and the slot values.
+
+    A template compiled with minify has its literal text minified, and its
+    minify attribute tells the page renderer to minify page bodies too.
+    """
+
+    def __init__(self, segments, minify=False):
+        # Even indexes are literal text, odd indexes are slot names
+        self.segments = segments
+        self.minify = minify
+
+    @classmethod
+    def compile(cls, source, basepath="/", assets=None, minify=False):
+        """
+        Compile template source text.
+
+        Root-relative URLs in the template are pointed at the basepath before
+        the {{ basepath }} placeholder is filled in, so URLs written with the
+        placeholder are not prefixed twice. With assets, URLs of static files
+        are first pointed at their fingerprinted names.
+
+        Args:
+            source: The template text
+            basepath: Base path for the site (defaults to '/')
+            assets: Optional dict of static file path -> fingerprinted name
+            minify: Whether to minify the template (see minify_html)
+
+        Returns:
+            Template: The compiled template
+        """
+        if assets:
+            source = rewrite_asset_urls(source, assets)
+        source = rewrite_root_urls(source, basepath)
+        source = source.replace('{{ basepath }}', basepath)
+        if minify:
+            source = minify_html(source)
+        return cls(SLOT_PATTERN.split(source), minify)
+
+    @classmethod
+    def load(cls, template_path, basepath="/", assets=None, minify=False):
+        """
+        Read and compile a template file.
+
+        Args:
+            template_path: Path to the HTML template file
+            basepath: Base path for the site (defaults to '/')
+            assets: Optional dict of static file path -> fingerprinted name
+            minify: Whether to minify the template and page bodies
+
+        Returns:
+            Template: The compiled template
+        """
+        with open(template_path, 'r', encoding='utf-8') as file:
+            return cls.compile(file.read(), basepath, assets, minify)
+
+    @property
+    def slots(self):
+        """
+        The slot names used by the template, in order of appearance.
+        """
+        return self.segments[1::2]
+
+    def render(self, **values):
+        """
+        Fill the template's slots.
+
+        Args:
+            values: Text for each slot, keyed by slot name. A value may also
+                be an iterable of string fragments.
+
+        Returns:
+            The rendered document
+
+        Raises:
+            KeyError: If a slot used by the template has no value
+        """
+        return "".join(self.iter_render(**values))
+
+    def iter_render(self, **values):
+        """
+        Generate the rendered document as a sequence of string fragments.
+
+        Accepts the same values as render. Iterable slot values are streamed
+        through without being joined first.
+        """
+        for i, segment in enumerate(self.segments):
+            if i % 2 == 0:
+                yield segment
+                continue
+            value = values[segment]
+            if isinstance(value, str):
+                yield value
+            else:
+                yield from value
+
+    def write_to(self, fp, **values):
+        """
+        Stream the rendered document into a writable text file object.
+        """
+        fp.writelines(self.iter_render(**values))
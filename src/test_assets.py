@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+from assets import AssetManifest, fingerprint_path, fingerprinted_name
+from utility import hash_file
+
+
+class TestFingerprintedName(unittest.TestCase):
+    def test_hash_goes_before_extension(self):
+        self.assertEqual(fingerprinted_name("index.css", "1a2b3c4d5e6f"), "index.1a2b3c4d.css")
+        self.assertEqual(fingerprinted_name(os.path.join("images", "a.png"), "1a2b3c4d5e6f"),
+                         os.path.join("images", "a.1a2b3c4d.png"))
+        self.assertEqual(fingerprinted_name("LICENSE", "1a2b3c4d5e6f"), "LICENSE.1a2b3c4d")
+
+
+class TestFingerprintPath(unittest.TestCase):
+    def test_maps_static_paths_and_keeps_suffixes(self):
+        assets = {"index.css": "index.1a2b3c4d.css"}
+        self.assertEqual(fingerprint_path("index.css", assets), "index.1a2b3c4d.css")
+        self.assertEqual(fingerprint_path("index.css?v=2#top", assets), "index.1a2b3c4d.css?v=2#top")
+        self.assertEqual(fingerprint_path("blog/post", assets), "blog/post")
+
+
+class TestAssetManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "static", "index.css")
+        self.manifest_path = os.path.join(self.tmp.name, "docs", "asset-manifest.json")
+        self.write("body {}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, content):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write(content)
+
+    def test_add_hashes_only_changed_files(self):
+        manifest = AssetManifest(self.manifest_path)
+        self.assertEqual(manifest.add("index.css", self.path), fingerprinted_name("index.css", hash_file(self.path)))
+
+        # The recorded hash is trusted while size and mtime are unchanged
+        manifest.fingerprints["index.css"]["hash"] = "cafebabe00"
+        self.assertEqual(manifest.add("index.css", self.path), "index.cafebabe.css")
+
+        self.write("body { margin: 0 }")
+        self.assertEqual(manifest.add("index.css", self.path), fingerprinted_name("index.css", hash_file(self.path)))
+
+    def test_save_load_and_retain(self):
+        manifest = AssetManifest(self.manifest_path)
+        name = manifest.add("index.css", self.path)
+        manifest.assets["gone.css"] = "gone.00000000.css"
+        manifest.retain(["index.css"])
+        manifest.save()
+
+        loaded = AssetManifest.load(self.manifest_path)
+        self.assertEqual(loaded.assets, {"index.css": name})
+        self.assertEqual(loaded.fingerprints, manifest.fingerprints)
+
+    def test_load_missing_file(self):
+        manifest = AssetManifest.load(self.manifest_path)
+        self.assertEqual(manifest.assets, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from block_parser import BlockType, block_to_block_type
+from block_parser import BlockType, block_to_block_type, classify_block
 
 class TestBlockParser(unittest.TestCase):
     def test_paragraph(self):
@@ -104,6 +104,25 @@ class TestBlockParser(unittest.TestCase):
         block = "1. Item 1\nThis is not a list item\n2. Item 2"
         self.assertEqual(block_to_block_type(block), BlockType.PARAGRAPH)
     
+    def test_long_ordered_list(self):
+        # Test a list with thousands of items, including multi-digit numbers
+        block = "\n".join(f"{i}. Item {i}" for i in range(1, 3001))
+        self.assertEqual(block_to_block_type(block), BlockType.ORDERED_LIST)
+        
+        # Test that a gap late in a long list is still caught
+        block = block.replace("2500. ", "2501. ")
+        self.assertEqual(block_to_block_type(block), BlockType.PARAGRAPH)
+    
+    def test_classify_block_returns_lines(self):
+        # Test that the lines come back with the type
+        block_type, lines = classify_block("- Item 1\n- Item 2")
+        self.assertEqual(block_type, BlockType.UNORDERED_LIST)
+        self.assertEqual(lines, ["- Item 1", "- Item 2"])
+        
+        block_type, lines = classify_block("```\ncode\n```")
+        self.assertEqual(block_type, BlockType.CODE)
+        self.assertEqual(lines, ["```", "code", "```"])
+    
     def test_empty_block(self):
         # Test empty block
         block = ""
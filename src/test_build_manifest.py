@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from build_manifest import BuildManifest
+from utility import hash_file
+
+class TestBuildManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.manifest_path = os.path.join(self.dir, "docs", ".build-manifest.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        return path
+
+    def test_fingerprint_uses_stat_cache(self):
+        path = self.write("page.md", "# Title")
+        manifest = BuildManifest(self.manifest_path)
+        first = manifest.fingerprint(path)
+        self.assertEqual(first, hash_file(path))
+
+        # A cached fingerprint is trusted while size and mtime are unchanged
+        manifest.fingerprints[path]["hash"] = "cached"
+        self.assertEqual(manifest.fingerprint(path), "cached")
+
+        # Changing the file invalidates the cached hash
+        self.write("page.md", "# Other title")
+        self.assertEqual(manifest.fingerprint(path), hash_file(path))
+
+    def test_is_fresh(self):
+        output = self.write("docs/page.html", "<html></html>")
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record("page.md", "page.html", "abc", "tpl", "/")
+
+        self.assertTrue(manifest.is_fresh("page.md", "page.html", "abc", "tpl", "/"))
+        self.assertFalse(manifest.is_fresh("page.md", "page.html", "xyz", "tpl", "/"))
+        self.assertFalse(manifest.is_fresh("page.md", "page.html", "abc", "new", "/"))
+        self.assertFalse(manifest.is_fresh("page.md", "page.html", "abc", "tpl", "/repo/"))
+        self.assertFalse(manifest.is_fresh("other.md", "other.html", "abc", "tpl", "/"))
+
+        # A missing output is never fresh
+        os.unlink(output)
+        self.assertFalse(manifest.is_fresh("page.md", "page.html", "abc", "tpl", "/"))
+
+    def test_save_and_load(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record("page.md", "page.html", "abc", "tpl", "/")
+        manifest.save()
+
+        loaded = BuildManifest.load(self.manifest_path)
+        self.assertEqual(loaded.pages, manifest.pages)
+
+    def test_load_missing_file(self):
+        manifest = BuildManifest.load(self.manifest_path)
+        self.assertEqual(manifest.pages, {})
+        self.assertEqual(manifest.fingerprints, {})
+
+    def test_remove_stale(self):
+        kept = self.write("docs/kept.html", "kept")
+        stale = self.write("docs/blog/stale.html", "stale")
+        stale_gz = self.write("docs/blog/stale.html.gz", "compressed")
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record("kept.md", "kept.html", "a", "tpl", "/")
+        manifest.record("blog/stale.md", os.path.join("blog", "stale.html"), "b", "tpl", "/")
+
+        removed = manifest.remove_stale(["kept.md"])
+
+        self.assertEqual(removed, [os.path.join("blog", "stale.html")])
+        self.assertTrue(os.path.exists(kept))
+        self.assertFalse(os.path.exists(stale))
+        self.assertFalse(os.path.exists(stale_gz))
+        self.assertNotIn("blog/stale.md", manifest.pages)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import gzip
+import os
+import tempfile
+import unittest
+import compression
+from compression import compress_outputs, gzip_bytes
+
+
+class TestGzipBytes(unittest.TestCase):
+    def test_round_trip_and_deterministic(self):
+        data = b"<p>hello</p>" * 100
+        self.assertEqual(gzip.decompress(gzip_bytes(data)), data)
+        self.assertEqual(gzip_bytes(data), gzip_bytes(data))
+
+
+class TestCompressOutputs(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.docs = self.tmp.name
+        self.write("index.html", "<html>" + "<p>Home</p>" * 50 + "</html>")
+        self.write(os.path.join("blog", "index.html"), "<html>" + "<p>Post</p>" * 50 + "</html>")
+        self.write("index.css", "body { margin: 0 }\n" * 20)
+        self.write(os.path.join("images", "a.png"), "PNGDATA")
+        self.write("pages.json", "{}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, rel_path, content):
+        path = os.path.join(self.docs, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+
+    def test_compresses_text_outputs_only(self):
+        report = compress_outputs(self.docs, threads=2)
+        self.assertEqual(report.compressed_files, 3)
+        with open(os.path.join(self.docs, "index.html"), 'rb') as file:
+            original = file.read()
+        with gzip.open(os.path.join(self.docs, "index.html.gz"), 'rb') as file:
+            self.assertEqual(file.read(), original)
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "images", "a.png.gz")))
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "pages.json.gz")))
+
+        files, original_bytes, compressed_bytes = report.types[".html"]
+        self.assertEqual(files, 2)
+        self.assertLess(compressed_bytes, original_bytes)
+        self.assertIn(".css", report.types)
+        self.assertTrue(any(line.strip().startswith(".html") for line in report.summary_lines()))
+
+    def test_unchanged_content_is_skipped(self):
+        compress_outputs(self.docs)
+        report = compress_outputs(self.docs)
+        self.assertEqual((report.compressed_files, report.skipped_files), (0, 3))
+        # Ratios still cover every output
+        self.assertEqual(report.types[".html"][0], 2)
+
+        # Rewriting the same content is still a skip; new content is not
+        self.write("index.css", "body { margin: 0 }\n" * 20)
+        self.write("index.html", "<html>changed</html>")
+        report = compress_outputs(self.docs)
+        self.assertEqual((report.compressed_files, report.skipped_files), (1, 2))
+        with gzip.open(os.path.join(self.docs, "index.html.gz"), 'rb') as file:
+            self.assertEqual(file.read(), b"<html>changed</html>")
+
+    def test_gz_is_replaced_not_modified(self):
+        compress_outputs(self.docs)
+        gz_path = os.path.join(self.docs, "index.html.gz")
+        linked = os.path.join(self.tmp.name, "linked.gz")
+        os.link(gz_path, linked)
+        self.write("index.html", "<html>changed</html>")
+        compress_outputs(self.docs)
+        self.assertNotEqual(os.stat(gz_path).st_ino, os.stat(linked).st_ino)
+
+    def test_unreadable_outputs_are_reported_not_fatal(self):
+        real_compress = compression._compress_file
+
+        def vanishing(path, entry):
+            if path.endswith("index.css"):
+                raise FileNotFoundError(2, "No such file or directory", path)
+            return real_compress(path, entry)
+
+        compression._compress_file = vanishing
+        try:
+            report = compress_outputs(self.docs)
+        finally:
+            compression._compress_file = real_compress
+        self.assertEqual(report.compressed_files, 2)
+        self.assertEqual([rel_path for rel_path, _ in report.failed], ["index.css"])
+        self.assertIn("Could not compress 1 files:", report.summary_lines())
+
+        # It is compressed once it can be read again
+        report = compress_outputs(self.docs)
+        self.assertEqual((report.compressed_files, report.failed), (1, []))
+
+    def test_stale_gz_is_removed(self):
+        compress_outputs(self.docs)
+        os.unlink(os.path.join(self.docs, "blog", "index.html"))
+        report = compress_outputs(self.docs)
+        self.assertEqual(report.removed_files, 1)
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "blog", "index.html.gz")))
+
+
+if __name__ == "__main__":
+    unittest.main()
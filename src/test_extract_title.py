@@ -41,5 +41,12 @@ Just some text
         with self.assertRaises(Exception):
             extract_title(markdown)
 
+    def test_extract_title_from_lines(self):
+        lines = iter(["Intro\n", "# Hello \n", "More\n"])
+        self.assertEqual(extract_title(lines), "Hello")
+        # Lines after the title are not consumed
+        self.assertEqual(next(lines), "More\n")
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
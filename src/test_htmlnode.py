@@ -1,5 +1,8 @@
 import unittest
+from io import StringIO
 from htmlnode import HTMLNode, LeafNode, ValueError, TextNode, TextType, text_node_to_html_node
+from node_memory import measure_node_memory
+from url_resolver import UrlResolver
 
 class TestHTMLNode(unittest.TestCase):
     def test_init_with_defaults(self):
@@ -58,6 +61,24 @@ class TestHTMLNode(unittest.TestCase):
         node = HTMLNode(None, "text", None, None)
         self.assertEqual(node.to_html(), "text")
     
+    def test_iter_html(self):
+        # Joining the fragments gives the same HTML as to_html
+        node = HTMLNode("div", None, [
+            HTMLNode("p", None, [LeafNode(None, "Hello "), LeafNode("b", "world")], None),
+            LeafNode("a", "link", {"href": "/blog"}),
+        ], None)
+        fragments = list(node.iter_html())
+        self.assertGreater(len(fragments), 1)
+        self.assertEqual("".join(fragments), node.to_html())
+        self.assertEqual(node.to_html(), '<div><p>Hello <b>world</b></p><a href="/blog">link</a></div>')
+
+    def test_write_to(self):
+        # Test streaming into a file object
+        node = HTMLNode("ul", None, [LeafNode("li", "one"), LeafNode("li", "two")], None)
+        output = StringIO()
+        node.write_to(output)
+        self.assertEqual(output.getvalue(), "<ul><li>one</li><li>two</li></ul>")
+    
     def test_repr(self):
         # Test the __repr__ method
         node = HTMLNode("div", "content", [], {"class": "container"})
@@ -107,6 +128,14 @@ class TestLeafNode(unittest.TestCase):
         ]
         self.assertIn(node.to_html(), possible_outputs)
     
+    def test_leaf_iter_html(self):
+        # A leaf renders as a single fragment
+        node = LeafNode("a", "Click me", {"href": "https://www.google.com"})
+        self.assertEqual(list(node.iter_html()), ['<a href="https://www.google.com">Click me</a>'])
+        output = StringIO()
+        node.write_to(output)
+        self.assertEqual(output.getvalue(), node.to_html())
+    
     def test_leaf_to_html_examples(self):
         # Test the specific examples given in the requirements
         node = LeafNode("p", "This is a paragraph of text.")
@@ -177,6 +206,37 @@ class TestTextNodeToHtmlNode(unittest.TestCase):
         self.assertEqual(html_node.value, "")  # Empty string value for img tags
         self.assertEqual(html_node.props, {"src": "https://www.example.com/image.jpg", "alt": "Image alt text"})
     
+    def test_minify_drops_unneeded_attribute_quotes(self):
+        node = HTMLNode("p", None, [
+            LeafNode("a", "x", {"href": "/blog/post?a=b", "title": "Two words"}),
+            LeafNode("img", "", {"src": "/a.png", "alt": ""}),
+            HTMLNode("pre", None, [LeafNode("code", '  <a href="/">\n\n  x')]),
+        ])
+        expected = ('<p><a href="/blog/post?a=b" title="Two words">x</a><img src=/a.png alt=""></img>'
+                    '<pre><code>  <a href="/">\n\n  x</code></pre></p>')
+        self.assertEqual(node.to_html(minify=True), expected)
+        self.assertEqual("".join(node.iter_html(minify=True)), expected)
+        output = StringIO()
+        node.write_to(output, minify=True)
+        self.assertEqual(output.getvalue(), expected)
+
+    def test_resolver_rewrites_link_and_image_urls(self):
+        resolver = UrlResolver("/repo/")
+        link_node = TextNode("Link", TextType.LINK)
+        link_node.set_url("/about")
+        link = text_node_to_html_node(link_node, resolver)
+        self.assertEqual(link.props, {"href": "/repo/about"})
+        image_node = TextNode("Alt", TextType.IMAGE)
+        image_node.set_url("/images/a.png")
+        image = text_node_to_html_node(image_node, resolver)
+        self.assertEqual(image.props, {"src": "/repo/images/a.png", "alt": "Alt"})
+        resolver = UrlResolver("/repo/", image_sizes={"images/a.png": [640, 480]})
+        image = text_node_to_html_node(image_node, resolver)
+        self.assertEqual(image.props, {"src": "/repo/images/a.png", "alt": "Alt", "width": "640", "height": "480"})
+        # Other nodes are untouched even if their text looks like a URL
+        code = text_node_to_html_node(TextNode('href="/about"', TextType.CODE), resolver)
+        self.assertEqual(code.value, 'href="/about"')
+
     def test_invalid_node_type(self):
         # Test that a non-TextNode raises an exception
         with self.assertRaises(Exception):
@@ -190,5 +250,17 @@ class TestTextNodeToHtmlNode(unittest.TestCase):
         self.assertEqual(html_node.value, "This is a text node")
 
 
+class TestNodeMemory(unittest.TestCase):
+    def test_slots_leave_no_instance_dict(self):
+        for node in (HTMLNode("div"), LeafNode("b", "x"), TextNode("x", TextType.TEXT)):
+            self.assertFalse(hasattr(node, "__dict__"), type(node).__name__)
+
+    def test_bytes_per_node(self):
+        # benchmarks/run.py reports the figures; this only guards against a regression
+        for name, result in measure_node_memory().items():
+            before, after = result["before"], result["after"]
+            self.assertLess(after, before, f"{name}: {before:.0f} bytes/node before, {after:.0f} after")
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
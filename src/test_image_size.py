@@ -0,0 +1,115 @@
+import os
+import struct
+import tempfile
+import unittest
+from image_size import ImageSizes, probe_size
+
+
+def png_header(width, height):
+    return (b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">II", width, height)
+            + b"\x08\x06\x00\x00\x00" + b"\x00" * 4)
+
+
+def exif_segment(orientation, byte_order=">"):
+    # An APP1 segment whose first IFD holds a resolution tag, then the orientation
+    tiff = (b"MM" if byte_order == ">" else b"II") + struct.pack(byte_order + "HI", 42, 8)
+    ifd = struct.pack(byte_order + "H", 2)
+    ifd += struct.pack(byte_order + "HHII", 0x011A, 5, 1, 38)
+    ifd += struct.pack(byte_order + "HHIHH", 0x0112, 3, 1, orientation, 0)
+    ifd += struct.pack(byte_order + "I", 0)
+    body = b"Exif\x00\x00" + tiff + ifd + b"\x00" * 8
+    return b"\xff\xe1" + struct.pack(">H", len(body) + 2) + body
+
+
+def jpeg_header(width, height, marker=0xC0, exif=b""):
+    # SOI, an APP0 segment to skip, fill bytes, then the start of frame
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + b"\x00" * 9
+    sof = bytes([0xFF, 0xFF, marker]) + struct.pack(">HBHHB", 11, 8, height, width, 3) + b"\x00" * 6
+    return b"\xff\xd8" + app0 + exif + sof + b"\xff\xda" + b"\x00" * 32
+
+
+class TestProbeSize(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, data):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'wb') as file:
+            file.write(data)
+        return path
+
+    def test_png_and_jpeg_headers(self):
+        self.assertEqual(probe_size(self.write("a.png", png_header(1100, 438))), (1100, 438))
+        self.assertEqual(probe_size(self.write("b.jpg", jpeg_header(640, 480))), (640, 480))
+        # Progressive JPEGs use a different start of frame marker
+        self.assertEqual(probe_size(self.write("c.jpg", jpeg_header(800, 600, 0xC2))), (800, 600))
+
+    def test_jpeg_exif_orientation(self):
+        # Phone photos store the sensor's landscape frame and a quarter turn
+        for orientation, expected in ((1, (4032, 3024)), (3, (4032, 3024)), (6, (3024, 4032)), (8, (3024, 4032))):
+            for byte_order in (">", "<"):
+                data = jpeg_header(4032, 3024, exif=exif_segment(orientation, byte_order))
+                self.assertEqual(probe_size(self.write("photo.jpg", data)), expected, (orientation, byte_order))
+        # APP1 segments that are not EXIF are skipped
+        xmp = b"\xff\xe1" + struct.pack(">H", 12) + b"http://ns\x00"
+        self.assertEqual(probe_size(self.write("xmp.jpg", jpeg_header(640, 480, exif=xmp))), (640, 480))
+
+    def test_unreadable_files(self):
+        self.assertIsNone(probe_size(self.write("a.png", png_header(10, 10)[:20])))
+        self.assertIsNone(probe_size(self.write("b.jpg", b"\xff\xd8\xff\xda" + b"\x00" * 8)))
+        self.assertIsNone(probe_size(self.write("c.png", b"GIF89a")))
+        self.assertIsNone(probe_size(os.path.join(self.tmp.name, "missing.png")))
+
+
+class TestImageSizes(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.tmp.name, "static")
+        os.makedirs(os.path.join(self.static, "images"))
+        self.table_path = os.path.join(self.tmp.name, "docs", ".image-sizes.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, rel_path, data):
+        with open(os.path.join(self.static, rel_path), 'wb') as file:
+            file.write(data)
+
+    def add_all(self, table):
+        for rel_path in sorted(os.listdir(os.path.join(self.static, "images"))):
+            rel_path = os.path.join("images", rel_path)
+            table.add(rel_path, os.path.join(self.static, rel_path))
+        table.save()
+
+    def test_unchanged_images_are_not_probed_again(self):
+        self.write(os.path.join("images", "a.png"), png_header(64, 32))
+        self.write(os.path.join("images", "b.jpg"), jpeg_header(20, 10))
+        self.write(os.path.join("images", "notes.txt"), b"not an image")
+        table = ImageSizes.load(self.table_path)
+        self.add_all(table)
+        self.assertEqual(table.probed, 2)
+        self.assertEqual(table.sizes(), {"images/a.png": [64, 32], "images/b.jpg": [20, 10]})
+
+        table = ImageSizes.load(self.table_path)
+        self.add_all(table)
+        self.assertEqual(table.probed, 0)
+
+        self.write(os.path.join("images", "a.png"), png_header(128, 64) + b"\x00")
+        table = ImageSizes.load(self.table_path)
+        self.add_all(table)
+        self.assertEqual(table.probed, 1)
+        self.assertEqual(table.sizes()["images/a.png"], [128, 64])
+
+    def test_removed_images_are_forgotten(self):
+        table = ImageSizes(self.table_path)
+        self.write("a.png", png_header(1, 1))
+        table.add("a.png", os.path.join(self.static, "a.png"))
+        table.retain([])
+        self.assertEqual(table.sizes(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
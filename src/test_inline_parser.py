@@ -0,0 +1,88 @@
+import unittest
+from htmlnode import TextNode, TextType
+from inline_parser import parse_inline
+from text_processing import split_nodes_delimiter, split_nodes_image, split_nodes_link
+
+
+def as_tuples(nodes):
+    return [(node.text, node.text_type, node.url) for node in nodes]
+
+
+class TestParseInline(unittest.TestCase):
+    def test_plain_text(self):
+        self.assertEqual(as_tuples(parse_inline("Just text")), [("Just text", TextType.TEXT, None)])
+
+    def test_empty_text(self):
+        self.assertEqual(as_tuples(parse_inline("")), [("", TextType.TEXT, None)])
+
+    def test_all_inline_types(self):
+        text = "This is **text** with an _italic_ word and a `code block` and an ![obi wan image](https://i.imgur.com/fJRm4vk.jpg) and a [link](https://boot.dev)"
+        self.assertEqual(as_tuples(parse_inline(text)), [
+            ("This is ", TextType.TEXT, None),
+            ("text", TextType.BOLD, None),
+            (" with an ", TextType.TEXT, None),
+            ("italic", TextType.ITALIC, None),
+            (" word and a ", TextType.TEXT, None),
+            ("code block", TextType.CODE, None),
+            (" and an ", TextType.TEXT, None),
+            ("obi wan image", TextType.IMAGE, "https://i.imgur.com/fJRm4vk.jpg"),
+            (" and a ", TextType.TEXT, None),
+            ("link", TextType.LINK, "https://boot.dev"),
+        ])
+
+    def test_matches_multi_pass_pipeline(self):
+        texts = [
+            "**bold** at the start and `code` at the end `x`",
+            "Images ![a](/a.png) and ![](/b.png) then [link](/c) [](/d)",
+            "Bold that spans\n**two\nlines** and _italic_\ntext",
+            "Empty `` code and **** bold are dropped",
+            "Special chars: ![image with (brackets)](https://example.com/special.jpg)",
+        ]
+        for text in texts:
+            nodes = [TextNode(text, TextType.TEXT)]
+            nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+            nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+            nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+            nodes = split_nodes_image(nodes)
+            nodes = split_nodes_link(nodes)
+            self.assertEqual(as_tuples(parse_inline(text)), as_tuples(nodes), text)
+
+    def test_unclosed_delimiter_is_plain_text(self):
+        self.assertEqual(
+            as_tuples(parse_inline("An unclosed `code span")),
+            [("An unclosed `code span", TextType.TEXT, None)],
+        )
+
+    def test_link_url_is_not_split_by_delimiters(self):
+        # The link starts first, so underscores in its URL are not italics
+        self.assertEqual(as_tuples(parse_inline("See [docs](/my_page_name)")), [
+            ("See ", TextType.TEXT, None),
+            ("docs", TextType.LINK, "/my_page_name"),
+        ])
+
+    def test_link_label_keeps_delimiters(self):
+        # The link starts first, so its label is not parsed for bold
+        self.assertEqual(as_tuples(parse_inline("[**b**](/x) and **c**")), [
+            ("**b**", TextType.LINK, "/x"),
+            (" and ", TextType.TEXT, None),
+            ("c", TextType.BOLD, None),
+        ])
+
+    def test_link_inside_delimited_span_is_text(self):
+        # The bold span starts first, so the link syntax inside it is its text
+        self.assertEqual(as_tuples(parse_inline("**see [a](/a)** [b](/b)")), [
+            ("see [a](/a)", TextType.BOLD, None),
+            (" ", TextType.TEXT, None),
+            ("b", TextType.LINK, "/b"),
+        ])
+
+    def test_stray_brackets_before_image(self):
+        self.assertEqual(as_tuples(parse_inline("[Note] see ![diagram](/d.png) here")), [
+            ("[Note] see ", TextType.TEXT, None),
+            ("diagram", TextType.IMAGE, "/d.png"),
+            (" here", TextType.TEXT, None),
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
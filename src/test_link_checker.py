@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+from htmlnode import TextNode, TextType
+from link_checker import PageLinks, check_links, exists, target_path
+
+
+class TestPageLinks(unittest.TestCase):
+    def test_only_links_and_images_are_kept(self):
+        page_links = PageLinks()
+        page_links.add([
+            TextNode("text", TextType.TEXT),
+            TextNode("link", TextType.LINK).set_url("/a"),
+            TextNode("alt", TextType.IMAGE).set_url("b.png"),
+        ])
+        page_links.add([TextNode("again", TextType.LINK).set_url("/a")])
+        self.assertEqual(page_links.links, [["link", "/a"], ["image", "b.png"]])
+
+
+class TestTargetPath(unittest.TestCase):
+    def test_relative_and_root_relative_urls(self):
+        self.assertEqual(target_path("/images/a.png", "blog/index.html"), "images/a.png")
+        self.assertEqual(target_path("../about?x=1#team", "blog/post/index.html"), "blog/about")
+        self.assertEqual(target_path("my%20file.txt", "index.html"), "my file.txt")
+        self.assertEqual(target_path("/", "blog/index.html"), "")
+
+    def test_unchecked_urls(self):
+        for url in ("https://example.com/", "mailto:a@b.c", "//cdn.example.com/x.js", "#top", ""):
+            self.assertIsNone(target_path(url, "index.html"), url)
+
+
+class TestExists(unittest.TestCase):
+    def test_resolves_like_a_static_server(self):
+        targets = {"index.html", "blog/index.html", "about.html", "a.png"}
+        for path in ("", "blog", "blog/", "about", "about.html", "a.png"):
+            self.assertTrue(exists(path, targets), path)
+        self.assertFalse(exists("b.png", targets))
+        self.assertFalse(exists("blog/post", targets))
+
+
+class TestCheckLinks(unittest.TestCase):
+    def test_broken_links_have_their_source_line(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "index.md")
+            with open(source, 'w', encoding='utf-8') as file:
+                file.write("# Home\n\n[ok](about)\n\n- ![pic](/b.png)\n")
+            pages = [(source, "index.html", [["link", "about"], ["image", "/b.png"]])]
+            broken = check_links(pages, {"index.html", "about.html"})
+        self.assertEqual([str(broken_link) for broken_link in broken],
+                         [f"{source}:5: image target /b.png does not exist"])
+
+
+if __name__ == "__main__":
+    unittest.main()
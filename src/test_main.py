@@ -0,0 +1,27 @@
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+from unittest import mock
+from main import main, parse_args
+from page_generator import BuildError
+
+
+class TestParseArgs(unittest.TestCase):
+    def test_jobs_must_be_positive(self):
+        self.assertEqual(parse_args(["--jobs", "4"]).jobs, 4)
+        for value in ("0", "-2", "two"):
+            with redirect_stderr(StringIO()), self.assertRaises(SystemExit):
+                parse_args(["--jobs", value])
+
+
+class TestMain(unittest.TestCase):
+    def test_failed_build_reports_errors_and_exits_non_zero(self):
+        error = BuildError([("content/index.md", "ValueError: bad block")])
+        output = StringIO()
+        with mock.patch("main.run_profiled", side_effect=error), redirect_stdout(output):
+            self.assertEqual(main([]), 1)
+        self.assertIn("content/index.md: ValueError: bad block", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from markdown import extract_markdown_images, extract_markdown_links
+from markdown import extract_markdown_images, extract_markdown_links, iter_markdown_spans
 
 class TestMarkdownParser(unittest.TestCase):
     def test_extract_markdown_images(self):
@@ -70,6 +70,35 @@ class TestMarkdownParser(unittest.TestCase):
         expected = [("link with (brackets)", "https://example.com/special")]
         self.assertListEqual(extract_markdown_links(text), expected)
         
+        # Test that images are not reported as links
+        text = "An ![image](https://example.com/a.png) and a [link](https://example.com)"
+        expected = [("link", "https://example.com")]
+        self.assertListEqual(extract_markdown_links(text), expected)
+    
+    def test_iter_markdown_spans(self):
+        # Test that spans cover the full syntax and tell images from links
+        text = "A [link](/a) then ![img](/b.png)"
+        spans = list(iter_markdown_spans(text))
+        self.assertEqual(spans, [
+            (2, 12, False, "link", "/a"),
+            (18, 32, True, "img", "/b.png"),
+        ])
+        self.assertEqual(text[2:12], "[link](/a)")
+        self.assertEqual(text[18:32], "![img](/b.png)")
+        
+        # Test that the same link repeated is reported each time
+        text = "[x](/y) [x](/y)"
+        self.assertEqual([span[:2] for span in iter_markdown_spans(text)], [(0, 7), (8, 15)])
+
+    def test_stray_brackets_before_a_span(self):
+        # Test that bracketed text before an image or link is not part of it
+        text = "[Note] see ![diagram](/d.png) here"
+        self.assertListEqual(extract_markdown_images(text), [("diagram", "/d.png")])
+        self.assertListEqual(extract_markdown_links(text), [])
+
+        text = "[Note] see [the docs](/docs) here"
+        self.assertListEqual(extract_markdown_links(text), [("the docs", "/docs")])
+        
         
         
         
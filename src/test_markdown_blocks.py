@@ -1,5 +1,7 @@
 import unittest
-from markdown_blocks import markdown_to_blocks
+import os
+import tempfile
+from markdown_blocks import iter_markdown_blocks, markdown_to_blocks, read_markdown_blocks
 
 class TestMarkdownToBlocks(unittest.TestCase):
     def test_markdown_to_blocks(self):
@@ -108,5 +110,31 @@ And another paragraph."""
         self.assertEqual(blocks, expected)
 
 
+
+class TestIterMarkdownBlocks(unittest.TestCase):
+    SAMPLE = "  # Title \n\n\nPara one\nline two\n\n\n\n- a\n- b\n \n```\ncode\n\n```\n\n"
+
+    def test_matches_markdown_to_blocks_for_any_chunking(self):
+        expected = markdown_to_blocks(self.SAMPLE)
+        for size in range(1, len(self.SAMPLE) + 1):
+            chunks = [self.SAMPLE[i:i + size] for i in range(0, len(self.SAMPLE), size)]
+            self.assertEqual(list(iter_markdown_blocks(chunks)), expected, size)
+
+    def test_separator_split_across_chunks(self):
+        self.assertEqual(list(iter_markdown_blocks(["a\n", "\nb", "\n", "\n", "c"])), ["a", "b", "c"])
+
+    def test_empty_input(self):
+        self.assertEqual(list(iter_markdown_blocks([])), [])
+        self.assertEqual(list(iter_markdown_blocks(["", "\n\n", ""])), [])
+
+    def test_read_markdown_blocks_from_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "doc.md")
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(self.SAMPLE)
+            blocks = list(read_markdown_blocks(path, chunk_size=3))
+        self.assertEqual(blocks, markdown_to_blocks(self.SAMPLE))
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -113,6 +113,11 @@ function example() {
         self.assertIn("<b>bold</b>", html)
         self.assertIn("<i>italic</i>", html)
 
+    def test_accepts_iterable_of_blocks(self):
+        md = "# Title\n\nSome **bold** text\n\n- one\n- two"
+        blocks = iter(["# Title", "Some **bold** text", "- one\n- two"])
+        self.assertEqual(markdown_to_html_node(blocks).to_html(), markdown_to_html_node(md).to_html())
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
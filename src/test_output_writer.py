@@ -0,0 +1,100 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from output_writer import OutputWriter, WriteStats
+
+
+class TestOutputWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.docs = os.path.join(self.tmp.name, "docs")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_bytes(self, path):
+        with open(path, 'rb') as file:
+            return file.read()
+
+    def test_text_is_written_as_utf8_in_one_write(self):
+        writer = OutputWriter()
+        path = os.path.join(self.docs, "blog", "index.html")
+        written = writer.write(path, "<p>café</p>")
+        self.assertEqual(self.read_bytes(path), "<p>café</p>".encode('utf-8'))
+        self.assertEqual(written, len("<p>café</p>".encode('utf-8')))
+        self.assertEqual((writer.stats.files, writer.stats.open, writer.stats.write, writer.stats.rename), (1, 1, 1, 1))
+        self.assertFalse(os.path.exists(path + ".tmp"))
+
+    def test_directories_are_created_once(self):
+        writer = OutputWriter()
+        for i in range(5):
+            writer.write(os.path.join(self.docs, "blog", f"post{i}.html"), "x")
+        # The parent of a created directory is known to exist too
+        writer.write(os.path.join(self.docs, "index.html"), "x")
+        self.assertEqual(writer.stats.mkdir, 1)
+        self.assertEqual(writer.stats.mkdir_skipped, 5)
+
+    def test_fragments_are_buffered(self):
+        writer = OutputWriter(buffer_size=64)
+        path = os.path.join(self.docs, "big.html")
+        writer.write(path, ("<p>%d</p>" % i for i in range(100)))
+        self.assertEqual(self.read_bytes(path), "".join("<p>%d</p>" % i for i in range(100)).encode('utf-8'))
+        size = os.path.getsize(path)
+        self.assertLessEqual(writer.stats.write, size // 64 + 2)
+
+    def test_existing_hard_link_is_replaced_not_modified(self):
+        path = os.path.join(self.docs, "index.html")
+        OutputWriter().write(path, "old")
+        link = os.path.join(self.tmp.name, "live.html")
+        os.link(path, link)
+        OutputWriter().write(path, "new")
+        self.assertEqual(self.read_bytes(link), b"old")
+        self.assertEqual(self.read_bytes(path), b"new")
+
+    def test_failed_write_leaves_no_temp_file(self):
+        writer = OutputWriter()
+        path = os.path.join(self.docs, "index.html")
+
+        def fragments():
+            yield "partial"
+            raise RuntimeError("render failed")
+
+        with self.assertRaises(RuntimeError):
+            writer.write(path, fragments())
+        self.assertEqual(os.listdir(self.docs), [])
+
+    def test_directory_removed_after_creation_is_recreated(self):
+        writer = OutputWriter()
+        writer.write(os.path.join(self.docs, "blog", "a.html"), "a")
+        shutil.rmtree(self.docs)
+        writer.write(os.path.join(self.docs, "blog", "b.html"), "b")
+        self.assertEqual(self.read_bytes(os.path.join(self.docs, "blog", "b.html")), b"b")
+
+    def test_shared_between_threads(self):
+        writer = OutputWriter()
+        threads = [
+            threading.Thread(target=lambda n=n: [writer.write(os.path.join(self.docs, f"d{i % 3}", f"{n}-{i}.html"), "x")
+                                                 for i in range(20)])
+            for n in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(writer.stats.files, 80)
+        self.assertEqual(writer.stats.mkdir + writer.stats.mkdir_skipped, 80)
+
+
+class TestWriteStats(unittest.TestCase):
+    def test_add(self):
+        a, b = WriteStats(), WriteStats()
+        a.write, b.write, b.mkdir = 2, 3, 1
+        a.add(b)
+        self.assertEqual((a.write, a.mkdir), (5, 1))
+        self.assertIn("5 write", a.summary())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,365 @@
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+import page_generator
+from page_generator import BuildError, SiteBuilder, generate_pages_recursive, output_path_for
+
+TEMPLATE = "<html><title>{{ Title }}</title><body>{{ Content }}</body></html>"
+
+
+class TestOutputPathFor(unittest.TestCase):
+    def test_index_and_named_pages(self):
+        self.assertEqual(
+            output_path_for(os.path.join("content", "blog", "index.md"), "content", "docs"),
+            os.path.join("docs", "blog", "index.html"),
+        )
+        self.assertEqual(
+            output_path_for(os.path.join("content", "sample.md"), "content", "docs"),
+            os.path.join("docs", "sample.html"),
+        )
+
+
+class TestGeneratePagesRecursive(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.docs = os.path.join(self.tmp.name, "docs")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        self.write(self.template, TEMPLATE)
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome")
+        self.write(os.path.join(self.content, "blog", "post", "index.md"), "# Post\n\nBody")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, content):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+
+    def build(self, basepath="/", jobs=1, cache_dir=None):
+        output = StringIO()
+        with redirect_stdout(output):
+            generate_pages_recursive(self.content, self.template, self.docs, basepath, jobs=jobs, cache_dir=cache_dir)
+        return output.getvalue()
+
+    def read_outputs(self):
+        outputs = {}
+        for root, dirs, files in os.walk(self.docs):
+            for filename in files:
+                path = os.path.join(root, filename)
+                with open(path, encoding='utf-8') as file:
+                    outputs[os.path.relpath(path, self.docs)] = file.read()
+        return outputs
+
+    def test_first_build_renders_everything(self):
+        log = self.build()
+        self.assertIn("Rendered 2 pages, skipped 0 unchanged", log)
+        self.assertIn("Wrote 2 files", log)
+        self.assertIn("2 open, 2 write, 2 rename", log)
+        with open(os.path.join(self.docs, "index.html"), encoding='utf-8') as file:
+            self.assertEqual(file.read(), "<html><title>Home</title><body><div><h1>Home</h1><p>Welcome</p></div></body></html>")
+
+    def test_unchanged_rebuild_skips_pages(self):
+        self.build()
+        log = self.build()
+        self.assertIn("Rendered 0 pages, skipped 2 unchanged", log)
+
+    def test_only_changed_page_is_rendered(self):
+        self.build()
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome back")
+        log = self.build()
+        self.assertIn("Rendered 1 pages, skipped 1 unchanged", log)
+
+    def test_template_and_basepath_changes_rebuild(self):
+        self.build()
+        self.assertIn("Rendered 2 pages", self.build(basepath="/repo/"))
+        self.write(self.template, TEMPLATE + "\n")
+        self.assertIn("Rendered 2 pages", self.build(basepath="/repo/"))
+
+    def test_deleted_source_removes_output(self):
+        self.build()
+        os.unlink(os.path.join(self.content, "blog", "post", "index.md"))
+        log = self.build()
+        self.assertIn("removed 1 stale", log)
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "blog", "post", "index.html")))
+
+    def test_parallel_build_matches_serial(self):
+        for i in range(10):
+            self.write(os.path.join(self.content, "pages", f"page{i}.md"), f"# Page {i}\n\nText **{i}**")
+        self.build()
+        serial = self.read_outputs()
+
+        for root, dirs, files in os.walk(self.docs):
+            for filename in files:
+                os.unlink(os.path.join(root, filename))
+        log = self.build(jobs=3)
+        self.assertIn("pages/sec, 3 job(s)", log)
+        self.assertEqual(self.read_outputs(), serial)
+
+    def test_render_cache_reuses_bodies_across_builds(self):
+        cache_dir = os.path.join(self.tmp.name, ".ssg-cache")
+        self.assertIn("Render cache: 0 hits, 2 misses", self.build(cache_dir=cache_dir))
+        expected = self.read_outputs()["index.html"]
+
+        # A new template re-renders every page from the cache
+        self.write(self.template, TEMPLATE + "\n")
+        self.assertIn("Render cache: 2 hits, 0 misses", self.build(cache_dir=cache_dir))
+        # Link URLs depend on the basepath, so a new one is a miss
+        self.assertIn("Render cache: 0 hits, 2 misses", self.build("/repo/", jobs=2, cache_dir=cache_dir))
+        self.write(self.template, TEMPLATE)
+        self.assertIn("Render cache: 2 hits, 0 misses", self.build("/repo/", jobs=2, cache_dir=cache_dir))
+        with open(os.path.join(self.docs, "index.html"), encoding='utf-8') as file:
+            self.assertIn("<h1>Home</h1>", file.read())
+
+        # Changing the content is a miss
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nChanged")
+        self.assertIn("Render cache: 0 hits, 1 misses", self.build("/repo/", cache_dir=cache_dir))
+
+        self.write(self.template, TEMPLATE)
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome")
+        self.build(cache_dir=cache_dir)
+        self.assertEqual(self.read_outputs()["index.html"], expected)
+
+    def test_basepath_rewrites_links_but_not_code(self):
+        self.write(os.path.join(self.content, "index.md"),
+                   '# Home\n\n[About](/about) and ![Logo](/logo.png)\n\n```\n<a href="/about">\n```\n')
+        self.build(basepath="/repo/")
+        html = self.read_outputs()["index.html"]
+        self.assertIn('<a href="/repo/about">About</a>', html)
+        self.assertIn('<img src="/repo/logo.png" alt="Logo"', html)
+        self.assertIn('<code><a href="/about"></code>', html)
+
+    def test_asset_table_changes_rebuild_pages_using_them(self):
+        self.write(self.template, '<link href="{{ basepath }}index.css">' + TEMPLATE)
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n![Logo](/logo.png)")
+        assets = {"index.css": "index.11111111.css", "logo.png": "logo.11111111.png"}
+        builder = SiteBuilder(self.content, self.template, self.docs, "/repo/", assets=assets)
+        with redirect_stdout(StringIO()):
+            builder.build()
+        html = self.read_outputs()["index.html"]
+        self.assertIn('<link href="/repo/index.11111111.css">', html)
+        self.assertIn('<img src="/repo/logo.11111111.png"', html)
+
+        # Only the page showing a changed file is rendered again
+        assets["logo.png"] = "logo.22222222.png"
+        assets["unused.png"] = "unused.11111111.png"
+        with redirect_stdout(StringIO()):
+            self.assertEqual(builder.build(), [os.path.join(self.docs, "index.html")])
+        self.assertIn('<img src="/repo/logo.22222222.png"', self.read_outputs()["index.html"])
+
+        # Every page is when a file the template links to changes
+        assets["index.css"] = "index.22222222.css"
+        with redirect_stdout(StringIO()):
+            self.assertEqual(len(builder.build()), 2)
+        self.assertIn('<link href="/repo/index.22222222.css">', self.read_outputs()[os.path.join("blog", "post", "index.html")])
+
+    def test_image_size_changes_rebuild_only_pages_showing_them(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n![Logo](/logo.png) ![Other](other.png)")
+        cache_dir = os.path.join(self.tmp.name, ".ssg-cache")
+
+        def build(image_sizes):
+            builder = SiteBuilder(self.content, self.template, self.docs, "/repo/", cache_dir=cache_dir,
+                                  image_sizes=image_sizes)
+            with redirect_stdout(StringIO()) as output:
+                rendered = builder.build()
+            return [os.path.relpath(path, self.docs) for path in rendered], output.getvalue()
+
+        rendered, _ = build({"logo.png": [64, 32]})
+        self.assertEqual(len(rendered), 2)
+        html = self.read_outputs()["index.html"]
+        self.assertIn('<img src="/repo/logo.png" alt="Logo" width="64" height="32">', html)
+        self.assertIn('<img src="other.png" alt="Other">', html)
+
+        # Adding an image no page shows renders nothing
+        self.assertEqual(build({"logo.png": [64, 32], "unused.png": [1, 1]})[0], [])
+
+        rendered, _ = build({"logo.png": [128, 64]})
+        self.assertEqual(rendered, ["index.html"])
+        self.assertIn('width="128" height="64"', self.read_outputs()["index.html"])
+
+        # Cached bodies are reused only while the images they show are the same
+        self.write(self.template, TEMPLATE + "\n")
+        rendered, log = build({"logo.png": [128, 64], "unused.png": [1, 1]})
+        self.assertIn("Render cache: 2 hits, 0 misses", log)
+        self.write(self.template, TEMPLATE)
+        rendered, log = build({"logo.png": [64, 32]})
+        self.assertIn("Render cache: 1 hits, 1 misses", log)
+        self.assertIn('width="64" height="32"', self.read_outputs()["index.html"])
+
+    def test_minify_keeps_code_blocks_exact(self):
+        self.write(self.template, "<html>\n  <body>\n    <main>{{ Content }}</main>\n  </body>\n</html>\n")
+        self.write(os.path.join(self.content, "index.md"),
+                   "# Home\n\n[About](/about)\n\n```\n  <a href=\"/\">\n    indented  \n```\n")
+        outputs = {}
+        for streamed in (False, True):
+            threshold = page_generator.STREAMING_THRESHOLD
+            page_generator.STREAMING_THRESHOLD = 0 if streamed else threshold
+            try:
+                self.docs = os.path.join(self.tmp.name, f"docs{streamed}")
+                with redirect_stdout(StringIO()):
+                    SiteBuilder(self.content, self.template, self.docs, minify=True).build()
+            finally:
+                page_generator.STREAMING_THRESHOLD = threshold
+            outputs[streamed] = self.read_outputs()["index.html"]
+
+        self.assertEqual(outputs[True], outputs[False])
+        self.assertEqual(outputs[False],
+                         '<html><body><main><div><h1>Home</h1><p><a href=/about>About</a></p>'
+                         '<pre><code>  <a href="/">\n    indented  </code></pre></div></main></body></html>')
+
+    def test_search_index_is_built_from_rendered_pages(self):
+        cache_dir = os.path.join(self.tmp.name, ".ssg-cache")
+
+        def build(**kwargs):
+            with redirect_stdout(StringIO()):
+                SiteBuilder(self.content, self.template, self.docs, "/repo/", cache_dir=cache_dir, search=True,
+                            **kwargs).build()
+
+        def postings(prefix):
+            path = os.path.join(self.docs, "search", prefix + ".json")
+            if not os.path.exists(path):
+                return {}
+            with open(path, encoding='utf-8') as file:
+                return json.load(file)
+
+        # Pages built before search was enabled are indexed too
+        with redirect_stdout(StringIO()):
+            SiteBuilder(self.content, self.template, self.docs, "/repo/").build()
+        build()
+        self.assertEqual(postings("ho"), {"home": [[1, 1]]})
+        self.assertEqual(postings("bo"), {"body": [[0, 1]]})
+        with open(os.path.join(self.docs, "search", "pages.json"), encoding='utf-8') as file:
+            self.assertEqual(json.load(file)["pages"], [["/repo/blog/post/", "Post"], ["/repo/", "Home"]])
+
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nA **bold** [link](/x) ![alt text](/a.png)")
+        build()
+        self.assertEqual(postings("bo"), {"body": [[0, 1]], "bold": [[1, 1]]})
+        self.assertEqual(postings("al"), {"alt": [[1, 1]]})
+        self.assertEqual(postings("we"), {})
+
+        # Cached and streamed pages collect the same terms
+        self.write(self.template, TEMPLATE + "\n")
+        threshold = page_generator.STREAMING_THRESHOLD
+        for streaming in (threshold, 0):
+            page_generator.STREAMING_THRESHOLD = streaming
+            try:
+                build(mode="pipeline")
+            finally:
+                page_generator.STREAMING_THRESHOLD = threshold
+            self.assertEqual(postings("bo"), {"body": [[0, 1]], "bold": [[1, 1]]})
+            self.write(self.template, TEMPLATE)
+
+    def test_broken_links_are_reported_with_their_line(self):
+        cache_dir = os.path.join(self.tmp.name, ".ssg-cache")
+
+        def build(**kwargs):
+            builder = SiteBuilder(self.content, self.template, self.docs, "/repo/", cache_dir=cache_dir,
+                                  check_links=True, static_files={"images/a.png"}, **kwargs)
+            with redirect_stdout(StringIO()) as output:
+                builder.build()
+            return [str(broken_link) for broken_link in builder.broken_links], output.getvalue()
+
+        index = os.path.join(self.content, "index.md")
+        self.write(index, "# Home\n\n[post](blog/post/) [ok](/images/a.png)\n\n"
+                          "![missing](/images/b.png) [gone](/about#team)")
+        broken, log = build()
+        self.assertEqual(broken, [f"{index}:5: image target /images/b.png does not exist",
+                                  f"{index}:5: link target /about#team does not exist"])
+        self.assertIn("Checked 4 links in 2 pages: 2 broken", log)
+
+        # Unchanged pages are checked from their recorded links, and a page
+        # that is added fixes the links to it
+        self.write(os.path.join(self.content, "about.md"), "# About\n\n[home](/)")
+        broken, log = build(mode="pipeline")
+        self.assertEqual(broken, [f"{index}:5: image target /images/b.png does not exist"])
+        self.assertIn("Rendered 1 pages, skipped 2 unchanged", log)
+
+        # Cached bodies keep their links
+        self.write(self.template, TEMPLATE + "\n")
+        broken, log = build()
+        self.assertIn("Rendered 3 pages", log)
+        self.assertEqual(len(broken), 1)
+
+    def test_large_pages_are_streamed_with_same_output(self):
+        self.write(os.path.join(self.content, "index.md"),
+                   "Intro with a [link](/about)\n\n# Home\n\n```\ncode\n\nblock\n```\n\n- a\n- b\n")
+        self.build(basepath="/repo/")
+        expected = self.read_outputs()["index.html"]
+
+        threshold = page_generator.STREAMING_THRESHOLD
+        page_generator.STREAMING_THRESHOLD = 0
+        try:
+            # Changing the basepath forces both builds to render the page
+            log = self.build(basepath="/")
+            log += self.build(basepath="/repo/")
+        finally:
+            page_generator.STREAMING_THRESHOLD = threshold
+        self.assertIn("(streamed)", log)
+        self.assertEqual(self.read_outputs()["index.html"], expected)
+
+    def test_pipeline_build_matches_batch(self):
+        for i in range(10):
+            self.write(os.path.join(self.content, "pages", f"page{i}.md"), f"# Page {i}\n\n[Link](/page{i})")
+        self.write(os.path.join(self.content, "broken.md"), "No title here")
+
+        outputs = {}
+        for mode in ("batch", "pipeline"):
+            self.docs = os.path.join(self.tmp.name, mode)
+            with redirect_stdout(StringIO()):
+                builder = SiteBuilder(self.content, self.template, self.docs, "/repo/", mode=mode, io_threads=2)
+                with self.assertRaises(BuildError) as context:
+                    builder.build()
+            self.assertEqual([path for path, message in context.exception.errors],
+                             [os.path.join(self.content, "broken.md")])
+            outputs[mode] = self.read_outputs()
+            del outputs[mode][".build-manifest.json"]
+        self.assertEqual(len(outputs["pipeline"]), 12)
+        self.assertEqual(outputs["pipeline"], outputs["batch"])
+
+    def test_unknown_build_mode(self):
+        with self.assertRaises(ValueError):
+            SiteBuilder(self.content, self.template, self.docs, mode="turbo")
+
+    def test_errors_are_aggregated_per_page(self):
+        self.write(os.path.join(self.content, "broken1.md"), "No title here")
+        self.write(os.path.join(self.content, "broken2.md"), "Still no title")
+        with self.assertRaises(BuildError) as context:
+            self.build(jobs=2)
+
+        failed = [path for path, message in context.exception.errors]
+        self.assertEqual(failed, [os.path.join(self.content, "broken1.md"), os.path.join(self.content, "broken2.md")])
+        # The good pages were still written and recorded
+        self.assertTrue(os.path.exists(os.path.join(self.docs, "index.html")))
+        self.assertIn("skipped 2 unchanged", self.build_ignoring_errors())
+
+    def test_site_builder_rebuilds_listed_sources(self):
+        with redirect_stdout(StringIO()):
+            builder = SiteBuilder(self.content, self.template, self.docs)
+            builder.build()
+
+            home = os.path.join(self.content, "index.md")
+            post = os.path.join(self.content, "blog", "post", "index.md")
+            self.write(home, "# Home\n\nEdited")
+            os.unlink(post)
+            rendered = builder.build(sources=[home, post], save=False)
+
+        self.assertEqual(rendered, [os.path.join(self.docs, "index.html")])
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "blog", "post", "index.html")))
+        self.assertNotIn(post, builder.manifest.pages)
+
+    def build_ignoring_errors(self):
+        output = StringIO()
+        with redirect_stdout(output):
+            try:
+                generate_pages_recursive(self.content, self.template, self.docs)
+            except BuildError:
+                pass
+        return output.getvalue()
+
+
+if __name__ == "__main__":
+    unittest.main()
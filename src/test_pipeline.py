@@ -0,0 +1,96 @@
+import threading
+import time
+import unittest
+from pipeline import run_pipeline
+
+
+class TestRunPipeline(unittest.TestCase):
+    def test_items_are_processed_in_order(self):
+        processed = []
+        written = {}
+        lock = threading.Lock()
+
+        def read(item):
+            # Later items finish reading first
+            time.sleep((10 - item) / 1000)
+            return item * 2
+
+        def process(item, data):
+            processed.append(item)
+            return data + 1
+
+        def write(item, output):
+            with lock:
+                written[item] = output
+
+        errors = run_pipeline(list(range(10)), read, process, write, readers=4, writers=2, depth=3)
+        self.assertEqual(errors, [None] * 10)
+        self.assertEqual(processed, list(range(10)))
+        self.assertEqual(written, {item: item * 2 + 1 for item in range(10)})
+
+    def test_errors_are_recorded_per_item_and_stage(self):
+        def read(item):
+            if item == 1:
+                raise OSError("unreadable")
+            return item
+
+        def process(item, data):
+            if item == 2:
+                raise ValueError("bad markdown")
+            return data
+
+        written = []
+
+        def write(item, output):
+            if item == 3:
+                raise OSError("disk full")
+            written.append(item)
+
+        errors = run_pipeline([0, 1, 2, 3, 4], read, process, write)
+        self.assertEqual([type(error).__name__ if error else None for error in errors],
+                         [None, "OSError", "ValueError", "OSError", None])
+        self.assertEqual(sorted(written), [0, 4])
+
+    def test_slow_writer_holds_back_processing(self):
+        depth = 2
+        pending = []
+        peak = [0]
+        lock = threading.Lock()
+
+        def process(item, data):
+            with lock:
+                pending.append(item)
+                peak[0] = max(peak[0], len(pending))
+            return item
+
+        def write(item, output):
+            time.sleep(0.005)
+            with lock:
+                pending.remove(item)
+
+        run_pipeline(list(range(20)), lambda item: item, process, write, writers=1, depth=depth)
+        # depth outputs may wait for the writer, plus the one being processed
+        self.assertLessEqual(peak[0], depth + 1)
+
+    def test_slow_processing_holds_back_reads(self):
+        depth = 3
+        reads = []
+        gaps = []
+
+        def read(item):
+            reads.append(item)
+            return item
+
+        def process(item, data):
+            time.sleep(0.005)
+            gaps.append(len(reads) - item)
+            return data
+
+        run_pipeline(list(range(20)), read, process, lambda item, output: None, depth=depth)
+        self.assertEqual(len(gaps), 20)
+        # Queued reads, the one the feeder is blocked on, and this item
+        self.assertLessEqual(max(gaps), depth + 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+import block_parser
+import markdown_to_html
+from page_generator import SiteBuilder
+from profiling import STAGES, BuildProfile, install_hooks, parser_hooks, percentile, uninstall_hooks
+
+TEMPLATE = "<html><title>{{ Title }}</title><body>{{ Content }}</body></html>"
+
+
+class TestPercentile(unittest.TestCase):
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 90), 7)
+        self.assertEqual(percentile([], 50), 0)
+
+
+class TestHooks(unittest.TestCase):
+    def tearDown(self):
+        uninstall_hooks()
+
+    def test_parser_is_untouched_until_hooks_are_installed(self):
+        self.assertIs(markdown_to_html.classify_block, block_parser.classify_block)
+        install_hooks()
+        install_hooks()
+        self.assertIs(markdown_to_html.classify_block.__wrapped__, block_parser.classify_block)
+        uninstall_hooks()
+        self.assertIs(markdown_to_html.classify_block, block_parser.classify_block)
+
+    def test_parser_hooks_restore_only_what_they_installed(self):
+        with parser_hooks():
+            wrapped = markdown_to_html.classify_block
+            with parser_hooks():
+                pass
+            self.assertIs(markdown_to_html.classify_block, wrapped)
+        self.assertIs(markdown_to_html.classify_block, block_parser.classify_block)
+
+        with parser_hooks(enabled=False):
+            self.assertIs(markdown_to_html.classify_block, block_parser.classify_block)
+
+
+class TestBuildProfile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        self.write(self.template, TEMPLATE)
+        for i in range(4):
+            self.write(os.path.join(self.content, f"page{i}.md"), f"# Page {i}\n\n" + "Some **bold** text\n\n" * (i + 1))
+
+    def tearDown(self):
+        uninstall_hooks()
+        self.tmp.cleanup()
+
+    def write(self, path, content):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+
+    def build(self, dest, jobs=1, profile=None, cache_dir=None):
+        with redirect_stdout(StringIO()):
+            SiteBuilder(self.content, self.template, dest, jobs=jobs, cache_dir=cache_dir, profile=profile).build()
+        outputs = {}
+        for filename in sorted(os.listdir(dest)):
+            if filename.endswith(".html"):
+                with open(os.path.join(dest, filename), encoding='utf-8') as file:
+                    outputs[filename] = file.read()
+        return outputs
+
+    def test_report_covers_every_page_and_stage(self):
+        profile = BuildProfile(slowest=2)
+        self.build(os.path.join(self.tmp.name, "docs"), profile=profile)
+        report = profile.report()
+
+        self.assertEqual(report["pages"], 4)
+        self.assertEqual(list(report["stages"]), list(STAGES))
+        for summary in report["stages"].values():
+            self.assertLessEqual(summary["p50_ms"], summary["p99_ms"])
+            self.assertLessEqual(summary["p99_ms"], summary["max_ms"])
+        self.assertGreater(report["stages"]["inline"]["total_ms"], 0)
+        self.assertEqual(len(report["slowest_pages"]), 2)
+
+    def test_profiled_output_matches_unprofiled(self):
+        plain = self.build(os.path.join(self.tmp.name, "plain"))
+        profile = BuildProfile()
+        profiled = self.build(os.path.join(self.tmp.name, "profiled"), jobs=2, profile=profile)
+        self.assertEqual(profiled, plain)
+        self.assertEqual(profile.report()["pages"], 4)
+
+    def test_profiled_build_restores_the_parser(self):
+        self.build(os.path.join(self.tmp.name, "docs"), profile=BuildProfile())
+        self.assertIs(markdown_to_html.classify_block, block_parser.classify_block)
+
+    def test_cache_lookups_have_their_own_stage(self):
+        profile = BuildProfile()
+        self.build(os.path.join(self.tmp.name, "docs"), profile=profile, cache_dir=os.path.join(self.tmp.name, "cache"))
+        self.assertGreater(profile.report()["stages"]["cache"]["total_ms"], 0)
+
+    def test_write_report(self):
+        profile = BuildProfile()
+        self.build(os.path.join(self.tmp.name, "docs"), profile=profile)
+        path = os.path.join(self.tmp.name, "profile.json")
+        profile.write(path)
+        self.assertTrue(os.path.getsize(path) > 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
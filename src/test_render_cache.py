@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from render_cache import RenderCache
+
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp.name, ".ssg-cache")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_miss_then_hit(self):
+        cache = RenderCache(self.cache_dir)
+        key = cache.key("# Title\n\nBody")
+        self.assertIsNone(cache.get(key))
+        cache.put(key, "Title", "<div><h1>Title</h1></div>")
+        self.assertEqual(cache.get(key), ("Title", "<div><h1>Title</h1></div>", {}))
+
+    def test_extras_are_stored_with_the_body(self):
+        cache = RenderCache(self.cache_dir)
+        key = cache.key("# Title")
+        cache.put(key, "Title", "<div><h1>Title</h1></div>", {"terms": {"title": 1}})
+        self.assertEqual(cache.get(key), ("Title", "<div><h1>Title</h1></div>", {"terms": {"title": 1}}))
+
+    def test_key_depends_on_content_settings_and_version(self):
+        cache = RenderCache(self.cache_dir)
+        self.assertEqual(cache.key("# A"), cache.key("# A"))
+        self.assertNotEqual(cache.key("# A"), cache.key("# B"))
+        self.assertNotEqual(cache.key("# A", "basepath=/"), cache.key("# A", "basepath=/repo/"))
+        self.assertNotEqual(cache.key("# A"), RenderCache(self.cache_dir, version="old").key("# A"))
+
+    def test_corrupt_entry_is_a_miss(self):
+        cache = RenderCache(self.cache_dir)
+        key = cache.key("# A")
+        cache.put(key, "A", "<h1>A</h1>")
+        with open(cache.entry_path(key), 'w', encoding='utf-8') as file:
+            file.write("{not json")
+        self.assertIsNone(cache.get(key))
+
+    def test_evict_removes_least_recently_used(self):
+        cache = RenderCache(self.cache_dir)
+        keys = [cache.key(f"# Page {i}") for i in range(3)]
+        for age, key in enumerate(keys):
+            cache.put(key, "T", "x" * 100)
+            # Oldest first: keys[0] was used longest ago
+            os.utime(cache.entry_path(key), ns=(age * 10**9, age * 10**9))
+        size = os.path.getsize(cache.entry_path(keys[0]))
+
+        # A hit makes keys[0] the most recently used entry
+        self.assertIsNotNone(cache.get(keys[0]))
+
+        cache.max_bytes = size * 2
+        self.assertEqual(cache.evict(), 1)
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNotNone(cache.get(keys[2]))
+
+    def test_evict_keeps_cache_within_bound(self):
+        cache = RenderCache(self.cache_dir)
+        self.assertEqual(cache.evict(), 0)
+        cache.put(cache.key("# A"), "A", "<h1>A</h1>")
+        self.assertEqual(cache.evict(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
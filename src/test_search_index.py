@@ -0,0 +1,88 @@
+import json
+import os
+import tempfile
+import unittest
+from search_index import PAGES_FILENAME, PageTerms, SearchIndex, page_url
+from htmlnode import TextNode, TextType
+
+
+def terms(title, text):
+    page_terms = PageTerms()
+    page_terms.title = title
+    page_terms.add([TextNode(text, TextType.TEXT)])
+    return page_terms
+
+
+class TestPageTerms(unittest.TestCase):
+    def test_terms_are_case_folded_words(self):
+        page_terms = PageTerms()
+        page_terms.add([TextNode("The Hobbit, the RETURN", TextType.TEXT), TextNode("of a king", TextType.BOLD)])
+        self.assertEqual(dict(page_terms.counts), {"the": 2, "hobbit": 1, "return": 1, "of": 1, "king": 1})
+
+
+class TestPageUrl(unittest.TestCase):
+    def test_index_pages_drop_file_name(self):
+        self.assertEqual(page_url(os.path.join("blog", "tom", "index.html"), "/repo/"), "/repo/blog/tom/")
+        self.assertEqual(page_url("index.html"), "/")
+        self.assertEqual(page_url("sample.html"), "/sample.html")
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.search_dir = os.path.join(self.tmp.name, "search")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def shard(self, prefix):
+        with open(os.path.join(self.search_dir, prefix + ".json"), encoding='utf-8') as file:
+            return json.load(file)
+
+    def pages(self):
+        with open(os.path.join(self.search_dir, PAGES_FILENAME), encoding='utf-8') as file:
+            return json.load(file)["pages"]
+
+    def test_postings_are_sharded_by_prefix(self):
+        index = SearchIndex(self.search_dir)
+        index.update("a.md", "/a.html", terms("A", "hobbit hobbit house"))
+        index.update("b.md", "/b.html", terms("B", "hobbit ring"))
+        self.assertEqual(index.save(), 2)
+
+        self.assertEqual(self.shard("ho"), {"hobbit": [[0, 2], [1, 1]], "house": [[0, 1]]})
+        self.assertEqual(self.shard("ri"), {"ring": [[1, 1]]})
+        self.assertEqual(self.pages(), [["/a.html", "A"], ["/b.html", "B"]])
+
+    def test_updates_rewrite_only_changed_shards(self):
+        index = SearchIndex(self.search_dir)
+        index.update("a.md", "/a.html", terms("A", "hobbit ring"))
+        index.update("b.md", "/b.html", terms("B", "wizard"))
+        index.save()
+        wizard_mtime = os.stat(os.path.join(self.search_dir, "wi.json")).st_mtime_ns
+
+        index = SearchIndex.load(self.search_dir)
+        index.update("a.md", "/a.html", terms("A", "hobbit elf"))
+        self.assertEqual(index.save(), 2)
+        self.assertEqual(self.shard("el"), {"elf": [[0, 1]]})
+        self.assertFalse(os.path.exists(os.path.join(self.search_dir, "ri.json")))
+        self.assertEqual(os.stat(os.path.join(self.search_dir, "wi.json")).st_mtime_ns, wizard_mtime)
+
+        # Unchanged pages change nothing
+        index.update("b.md", "/b.html", terms("B", "wizard"))
+        self.assertEqual(index.save(), 0)
+
+    def test_removed_pages_keep_other_ids(self):
+        index = SearchIndex(self.search_dir)
+        index.update("a.md", "/a.html", terms("A", "hobbit"))
+        index.update("b.md", "/b.html", terms("B", "hobbit"))
+        index.save()
+
+        index = SearchIndex.load(self.search_dir)
+        index.retain(["b.md"])
+        index.save()
+        self.assertEqual(self.shard("ho"), {"hobbit": [[1, 1]]})
+        self.assertEqual(self.pages(), [None, ["/b.html", "B"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
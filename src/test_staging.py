@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from staging import publish_output, recover_output, stage_output
+from utility import open_for_replace
+
+
+class TestStaging(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.docs = os.path.join(self.tmp.name, "docs")
+        self.write(os.path.join(self.docs, "index.html"), "old index")
+        self.write(os.path.join(self.docs, "blog", "post.html"), "old post")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, content):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+
+    def read(self, path):
+        with open(path, encoding='utf-8') as file:
+            return file.read()
+
+    def stage(self):
+        with redirect_stdout(StringIO()):
+            return stage_output(self.docs)
+
+    def publish(self, staging):
+        with redirect_stdout(StringIO()):
+            publish_output(staging, self.docs)
+
+    def test_staged_files_are_hard_links(self):
+        staging = self.stage()
+        live = os.stat(os.path.join(self.docs, "blog", "post.html"))
+        staged = os.stat(os.path.join(staging, "blog", "post.html"))
+        self.assertEqual(live.st_ino, staged.st_ino)
+
+    def test_replacing_staged_file_leaves_live_file_alone(self):
+        staging = self.stage()
+        with open_for_replace(os.path.join(staging, "index.html")) as file:
+            file.write("new index")
+        self.assertEqual(self.read(os.path.join(self.docs, "index.html")), "old index")
+        self.assertEqual(self.read(os.path.join(staging, "index.html")), "new index")
+
+    def test_publish_swaps_in_staged_build(self):
+        staging = self.stage()
+        with open_for_replace(os.path.join(staging, "index.html")) as file:
+            file.write("new index")
+        self.publish(staging)
+        self.assertEqual(self.read(os.path.join(self.docs, "index.html")), "new index")
+        self.assertEqual(self.read(os.path.join(self.docs, "blog", "post.html")), "old post")
+        self.assertFalse(os.path.exists(staging))
+        self.assertFalse(os.path.exists(self.docs + ".previous"))
+
+    def test_stage_without_existing_output(self):
+        docs = os.path.join(self.tmp.name, "fresh")
+        with redirect_stdout(StringIO()):
+            staging = stage_output(docs)
+            self.assertEqual(os.listdir(staging), [])
+            publish_output(staging, docs)
+        self.assertTrue(os.path.isdir(docs))
+
+    def test_leftover_staging_is_discarded(self):
+        staging = self.stage()
+        self.write(os.path.join(staging, "junk.html"), "junk")
+        staging = self.stage()
+        self.assertFalse(os.path.exists(os.path.join(staging, "junk.html")))
+
+    def test_recover_restores_previous_output(self):
+        # Interrupted between the two renames of publish_output
+        os.rename(self.docs, self.docs + ".previous")
+        with redirect_stdout(StringIO()):
+            recover_output(self.docs)
+        self.assertEqual(self.read(os.path.join(self.docs, "index.html")), "old index")
+        self.assertFalse(os.path.exists(self.docs + ".previous"))
+
+    def test_recover_discards_previous_when_output_exists(self):
+        os.makedirs(self.docs + ".previous")
+        recover_output(self.docs)
+        self.assertFalse(os.path.exists(self.docs + ".previous"))
+        self.assertTrue(os.path.isdir(self.docs))
+
+    def test_symlinked_output_is_flipped(self):
+        release = os.path.join(self.tmp.name, "site-1")
+        os.rename(self.docs, release)
+        site = os.path.join(self.tmp.name, "site")
+        os.symlink("site-1", site)
+
+        with redirect_stdout(StringIO()):
+            staging = stage_output(site)
+            with open_for_replace(os.path.join(staging, "index.html")) as file:
+                file.write("new index")
+            publish_output(staging, site)
+
+        self.assertTrue(os.path.islink(site))
+        self.assertNotEqual(os.readlink(site), "site-1")
+        self.assertEqual(self.read(os.path.join(site, "index.html")), "new index")
+        self.assertFalse(os.path.exists(release))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+from io import StringIO
+from template import Template, asset_paths, minify_html, rewrite_asset_urls, rewrite_root_urls
+
+SOURCE = """<html>
+<head><title>{{ Title }}</title><link href="{{ basepath }}index.css" /></head>
+<body><a href="/">Home</a><article>{{ Content }}</article></body>
+</html>"""
+
+
+class TestRewriteRootUrls(unittest.TestCase):
+    def test_rewrites_href_and_src(self):
+        html = '<a href="/blog">x</a><img src="/images/a.png" alt="">'
+        self.assertEqual(
+            rewrite_root_urls(html, "/repo/"),
+            '<a href="/repo/blog">x</a><img src="/repo/images/a.png" alt="">',
+        )
+
+    def test_default_basepath_is_unchanged(self):
+        html = '<a href="/blog">x</a>'
+        self.assertIs(rewrite_root_urls(html, "/"), html)
+
+
+class TestRewriteAssetUrls(unittest.TestCase):
+    def test_rewrites_static_file_urls(self):
+        assets = {"index.css": "index.1a2b3c4d.css"}
+        html = '<link href="{{ basepath }}index.css"><link href="/index.css?v=1"><a href="/blog">x</a>'
+        self.assertEqual(
+            rewrite_asset_urls(html, assets),
+            '<link href="{{ basepath }}index.1a2b3c4d.css"><link href="/index.1a2b3c4d.css?v=1"><a href="/blog">x</a>',
+        )
+
+    def test_compile_points_template_at_fingerprinted_assets(self):
+        template = Template.compile(SOURCE, "/repo/", {"index.css": "index.1a2b3c4d.css"})
+        html = template.render(Title="T", Content="C")
+        self.assertIn('<link href="/repo/index.1a2b3c4d.css" />', html)
+        self.assertIn('<a href="/repo/">Home</a>', html)
+
+    def test_asset_paths_are_the_root_relative_urls(self):
+        self.assertEqual(asset_paths(SOURCE + '<img src="/logo.png?v=2">'), {"index.css", "", "logo.png"})
+
+
+class TestMinifyHtml(unittest.TestCase):
+    def test_collapses_whitespace_between_tags(self):
+        html = "<!doctype html>\n<html>\n  <body>\n    <b>a</b> <i>b</i>\n  </body>\n</html>\n"
+        self.assertEqual(minify_html(html), "<!doctype html><html><body><b>a</b> <i>b</i></body></html>")
+
+    def test_drops_quotes_where_safe(self):
+        html = '<meta charset="utf-8" /><meta content="a, b" name=\'x\'><input disabled  value=""><link href="/"/>'
+        self.assertEqual(minify_html(html),
+                         '<meta charset=utf-8 /><meta content="a, b" name=x><input disabled value=""><link href="/"/>')
+
+    def test_raw_elements_are_kept_exactly(self):
+        html = '<div>\n  <pre class="x">\n  a  </pre>\n  <script>\nif (a >\n  <b) {}\n</script>\n</div>'
+        self.assertEqual(minify_html(html),
+                         '<div><pre class="x">\n  a  </pre><script>\nif (a >\n  <b) {}\n</script></div>')
+
+    def test_compile_with_minify(self):
+        template = Template.compile(SOURCE, "/repo/", minify=True)
+        self.assertTrue(template.minify)
+        self.assertEqual(
+            template.render(Title="T", Content="<p>C</p>"),
+            "<html><head><title>T</title><link href=/repo/index.css /></head>"
+            "<body><a href=/repo/>Home</a><article><p>C</p></article></body></html>",
+        )
+
+
+class TestTemplate(unittest.TestCase):
+    def test_compile_splits_slots(self):
+        template = Template.compile(SOURCE)
+        self.assertEqual(template.slots, ["Title", "Content"])
+
+    def test_render(self):
+        template = Template.compile(SOURCE)
+        html = template.render(Title="Hello", Content="<p>Hi</p>")
+        expected = SOURCE.replace("{{ basepath }}", "/").replace("{{ Title }}", "Hello").replace("{{ Content }}", "<p>Hi</p>")
+        self.assertEqual(html, expected)
+
+    def test_basepath_substituted_at_compile_time(self):
+        template = Template.compile(SOURCE, "/repo/")
+        html = template.render(Title="T", Content="")
+        self.assertIn('<link href="/repo/index.css" />', html)
+        self.assertIn('<a href="/repo/">Home</a>', html)
+        self.assertNotIn("{{ basepath }}", "".join(template.segments))
+
+    def test_slot_values_are_not_reinterpreted(self):
+        template = Template.compile(SOURCE)
+        html = template.render(Title="{{ Content }}", Content="{{ basepath }}")
+        self.assertIn("<title>{{ Content }}</title>", html)
+        self.assertIn("<article>{{ basepath }}</article>", html)
+
+    def test_iterable_slot_values_are_streamed(self):
+        template = Template.compile(SOURCE)
+        fragments = iter(["<p>", "Hi", "</p>"])
+        output = StringIO()
+        template.write_to(output, Title="Hello", Content=fragments)
+        self.assertEqual(output.getvalue(), template.render(Title="Hello", Content="<p>Hi</p>"))
+
+    def test_missing_slot_value(self):
+        template = Template.compile(SOURCE)
+        with self.assertRaises(KeyError):
+            template.render(Title="Only a title")
+
+
+if __name__ == "__main__":
+    unittest.main()
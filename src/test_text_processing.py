@@ -218,6 +218,17 @@ class TestSplitNodesImage(unittest.TestCase):
         self.assertEqual(new_nodes[2].text, " empty alt")
 
 
+    def test_stray_brackets_before_image(self):
+        # Test that bracketed text before an image stays plain text
+        node = TextNode("[Note] see ![diagram](/d.png) here", TextType.TEXT)
+        new_nodes = split_nodes_image([node])
+        self.assertEqual([(n.text, n.text_type, n.url) for n in new_nodes], [
+            ("[Note] see ", TextType.TEXT, None),
+            ("diagram", TextType.IMAGE, "/d.png"),
+            (" here", TextType.TEXT, None),
+        ])
+
+
 class TestSplitNodesLink(unittest.TestCase):
     def test_single_link(self):
         # Test with a single link
@@ -234,6 +245,16 @@ class TestSplitNodesLink(unittest.TestCase):
         self.assertEqual(new_nodes[1].text_type, TextType.LINK)
         self.assertEqual(new_nodes[1].url, "https://www.boot.dev")
     
+    def test_stray_brackets_before_link(self):
+        # Test that bracketed text before a link stays plain text
+        node = TextNode("[Note] see [the docs](/docs) here", TextType.TEXT)
+        new_nodes = split_nodes_link([node])
+        self.assertEqual([(n.text, n.text_type, n.url) for n in new_nodes], [
+            ("[Note] see ", TextType.TEXT, None),
+            ("the docs", TextType.LINK, "/docs"),
+            (" here", TextType.TEXT, None),
+        ])
+
     def test_multiple_links(self):
         # Test with multiple links
         node = TextNode(
@@ -252,6 +273,18 @@ class TestSplitNodesLink(unittest.TestCase):
         self.assertEqual(new_nodes[3].text_type, TextType.LINK)
         self.assertEqual(new_nodes[3].url, "https://www.youtube.com/@bootdotdev")
     
+    def test_links_and_images_mixed(self):
+        # Test that images are left in place as text when splitting links
+        node = TextNode("See ![img](/a.png) and [docs](/docs)", TextType.TEXT)
+        new_nodes = split_nodes_link([node])
+        
+        self.assertEqual(len(new_nodes), 2)
+        self.assertEqual(new_nodes[0].text, "See ![img](/a.png) and ")
+        self.assertEqual(new_nodes[0].text_type, TextType.TEXT)
+        self.assertEqual(new_nodes[1].text, "docs")
+        self.assertEqual(new_nodes[1].text_type, TextType.LINK)
+        self.assertEqual(new_nodes[1].url, "/docs")
+    
     def test_no_links(self):
         # Test with no links
         node = TextNode("This is text with no links", TextType.TEXT)
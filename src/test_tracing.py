@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from page_generator import SiteBuilder
+from tracing import is_tracing, make_event, span, start_tracing, stop_tracing
+from utility import copy_directory
+
+TEMPLATE = "<html><title>{{ Title }}</title><body>{{ Content }}</body></html>"
+
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        stop_tracing()
+        self.tmp.cleanup()
+
+    def write(self, path, content):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+
+    def test_span_does_nothing_when_not_tracing(self):
+        self.assertFalse(is_tracing())
+        with span("idle"):
+            pass
+        self.assertIsNone(stop_tracing())
+
+    def test_spans_become_complete_events(self):
+        recorder = start_tracing()
+        with span("outer", pages=2):
+            with span("inner", "page"):
+                pass
+        trace = recorder.to_json()
+
+        names = [event["name"] for event in trace["traceEvents"] if event["ph"] == "X"]
+        self.assertEqual(names, ["outer", "inner"])
+        outer, inner = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+        self.assertEqual(outer["args"], {"pages": 2})
+        self.assertEqual(inner["cat"], "page")
+        self.assertGreaterEqual(inner["ts"], outer["ts"])
+        self.assertLessEqual(inner["ts"] + inner["dur"], outer["ts"] + outer["dur"])
+        self.assertEqual(outer["pid"], os.getpid())
+
+    def test_worker_processes_are_named(self):
+        recorder = start_tracing()
+        event = make_event("page.md", "page", recorder.origin_ns, recorder.origin_ns + 5000)
+        event["pid"] = os.getpid() + 1
+        recorder.add(event)
+        metadata = [event for event in recorder.to_json()["traceEvents"] if event["ph"] == "M"]
+        self.assertEqual([event["args"]["name"].split(" (")[0] for event in metadata], ["worker 1", "build"])
+
+    def test_build_records_phases_and_pages(self):
+        content = os.path.join(self.tmp.name, "content")
+        template = os.path.join(self.tmp.name, "template.html")
+        static = os.path.join(self.tmp.name, "static")
+        docs = os.path.join(self.tmp.name, "docs")
+        self.write(template, TEMPLATE)
+        self.write(os.path.join(static, "index.css"), "body {}")
+        for i in range(4):
+            self.write(os.path.join(content, f"page{i}.md"), f"# Page {i}\n\nText")
+
+        recorder = start_tracing()
+        with redirect_stdout(StringIO()):
+            copy_directory(static, docs)
+            SiteBuilder(content, template, docs, jobs=2).build()
+        events = [event for event in recorder.to_json()["traceEvents"] if event["ph"] == "X"]
+
+        names = {event["name"] for event in events}
+        self.assertTrue({"walk content", "check freshness", "render pages", "save manifest", "index.css"} <= names)
+        pages = [event for event in events if event["cat"] == "page"]
+        self.assertEqual(sorted(event["name"] for event in pages),
+                         [os.path.join(content, f"page{i}.md") for i in range(4)])
+        self.assertTrue(all(event["pid"] != os.getpid() for event in pages))
+        self.assertTrue(all("tid" in event for event in pages))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from url_resolver import UrlResolver
+
+
+class TestUrlResolver(unittest.TestCase):
+    def test_root_relative_urls_move_under_basepath(self):
+        resolver = UrlResolver("/repo/")
+        self.assertEqual(resolver.resolve("/"), "/repo/")
+        self.assertEqual(resolver.resolve("/blog/post"), "/repo/blog/post")
+
+    def test_other_urls_are_left_alone(self):
+        resolver = UrlResolver("/repo/")
+        for url in ("about", "../up", "#top", "https://example.com/", "mailto:a@example.com",
+                    "//cdn.example.com/x.js"):
+            self.assertEqual(resolver.resolve(url), url)
+
+    def test_root_basepath_changes_nothing(self):
+        self.assertEqual(UrlResolver().resolve("/blog/post"), "/blog/post")
+
+    def test_static_files_point_at_fingerprinted_names(self):
+        resolver = UrlResolver("/repo/", {"images/a.png": "images/a.1a2b3c4d.png"})
+        self.assertEqual(resolver.resolve("/images/a.png"), "/repo/images/a.1a2b3c4d.png")
+        self.assertEqual(resolver.resolve("/images/b.png"), "/repo/images/b.png")
+        self.assertEqual(UrlResolver(assets={"a.png": "a.1a2b3c4d.png"}).resolve("/a.png"), "/a.1a2b3c4d.png")
+
+    def test_image_sizes_are_looked_up_by_root_relative_url(self):
+        resolver = UrlResolver("/repo/", {"a.png": "a.1a2b3c4d.png"}, {"a.png": [640, 480]})
+        self.assertEqual(resolver.image_size("/a.png?v=2#top"), [640, 480])
+        for url in ("a.png", "/b.png", "//cdn.example.com/a.png", "https://example.com/a.png"):
+            self.assertIsNone(resolver.image_size(url), url)
+        self.assertIsNone(UrlResolver().image_size("/a.png"))
+
+    def test_dependencies_cover_only_the_images_a_page_shows(self):
+        resolver = UrlResolver("/repo/", image_sizes={"a.png": [640, 480], "b.png": [1, 1]})
+        links = [["image", "/a.png"], ["image", "/new.png"], ["link", "/b.png"], ["image", "c.png"]]
+        dependencies = resolver.dependencies(links)
+        self.assertEqual(dependencies, {"images": {"a.png": [640, 480], "new.png": None}})
+        self.assertTrue(resolver.dependencies_match(dependencies))
+
+        # Unrelated entries don't matter; changed and added ones do
+        self.assertTrue(UrlResolver(image_sizes={"a.png": [640, 480], "d.png": [2, 2]})
+                        .dependencies_match(dependencies))
+        self.assertFalse(UrlResolver(image_sizes={"a.png": [320, 240]}).dependencies_match(dependencies))
+        self.assertFalse(UrlResolver(image_sizes={"a.png": [640, 480], "new.png": [8, 8]})
+                         .dependencies_match(dependencies))
+
+        # So does turning the table on or off
+        self.assertEqual(UrlResolver().dependencies(links), {})
+        self.assertFalse(resolver.dependencies_match({}))
+        self.assertFalse(UrlResolver().dependencies_match(dependencies))
+        self.assertTrue(UrlResolver().dependencies_match({"images": {"new.png": None}}))
+
+    def test_dependencies_cover_only_the_assets_a_page_links_to(self):
+        resolver = UrlResolver("/", {"index.css": "index.1.css", "a.png": "a.1.png"})
+        dependencies = resolver.dependencies([["link", "/index.css?v=1"], ["image", "/new.png"], ["link", "about"]])
+        self.assertEqual(dependencies, {"assets": {"index.css": "index.1.css", "new.png": None}})
+        self.assertTrue(UrlResolver("/", {"index.css": "index.1.css", "a.png": "a.2.png"})
+                        .dependencies_match(dependencies))
+        self.assertFalse(UrlResolver("/", {"index.css": "index.2.css"}).dependencies_match(dependencies))
+        self.assertFalse(UrlResolver("/", {"index.css": "index.1.css", "new.png": "new.1.png"})
+                         .dependencies_match(dependencies))
+
+    def test_results_are_memoized(self):
+        resolver = UrlResolver("/repo/")
+        calls = []
+        resolve = resolver._resolve
+        resolver._resolve = lambda url: calls.append(url) or resolve(url)
+        for _ in range(3):
+            self.assertEqual(resolver.resolve("/a"), "/repo/a")
+        self.assertEqual(calls, ["/a"])
+
+    def test_cache_key_depends_on_basepath(self):
+        self.assertEqual(UrlResolver("/repo/").cache_key, UrlResolver("/repo/").cache_key)
+        self.assertNotEqual(UrlResolver("/").cache_key, UrlResolver("/repo/").cache_key)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from assets import AssetManifest
+from image_size import ImageSizes
+from utility import copy_directory
+
+
+class TestCopyDirectory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.tmp.name, "static")
+        self.docs = os.path.join(self.tmp.name, "docs")
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        self.write(os.path.join(self.static, "images", "a.png"), "PNGDATA")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, content):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+
+    def read(self, path):
+        with open(path, encoding='utf-8') as file:
+            return file.read()
+
+    def sync(self, checksum=False):
+        with redirect_stdout(StringIO()):
+            return copy_directory(self.static, self.docs, checksum=checksum)
+
+    def test_first_sync_copies_everything(self):
+        report = self.sync()
+        self.assertEqual(report.copied_files, 2)
+        self.assertEqual(report.copied_bytes, len("body {}") + len("PNGDATA"))
+        self.assertEqual(self.read(os.path.join(self.docs, "images", "a.png")), "PNGDATA")
+
+    def test_unchanged_files_are_skipped(self):
+        self.sync()
+        report = self.sync()
+        self.assertEqual(report.copied_files, 0)
+        self.assertEqual(report.skipped_files, 2)
+        self.assertEqual(report.skipped_bytes, len("body {}") + len("PNGDATA"))
+
+    def test_changed_file_is_copied(self):
+        self.sync()
+        self.write(os.path.join(self.static, "index.css"), "body { margin: 0 }")
+        report = self.sync()
+        self.assertEqual(report.copied_files, 1)
+        self.assertEqual(self.read(os.path.join(self.docs, "index.css")), "body { margin: 0 }")
+
+    def test_checksum_ignores_mtime_only_changes(self):
+        self.sync()
+        css = os.path.join(self.static, "index.css")
+        os.utime(css, ns=(0, 0))
+        self.assertEqual(self.sync(checksum=True).copied_files, 0)
+        self.assertEqual(self.sync().copied_files, 1)
+
+    def test_orphans_removed_but_other_files_kept(self):
+        self.sync()
+        page = os.path.join(self.docs, "index.html")
+        self.write(page, "<html></html>")
+        os.unlink(os.path.join(self.static, "images", "a.png"))
+
+        report = self.sync()
+
+        self.assertEqual(report.removed_files, 1)
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "images")))
+        self.assertTrue(os.path.exists(page))
+
+    def test_orphans_lose_their_gz(self):
+        self.sync()
+        self.write(os.path.join(self.docs, "index.css.gz"), "compressed")
+        os.unlink(os.path.join(self.static, "index.css"))
+
+        self.sync()
+
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "index.css")))
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "index.css.gz")))
+
+    def test_assets_are_also_copied_under_fingerprinted_names(self):
+        manifest_path = os.path.join(self.docs, "asset-manifest.json")
+        with redirect_stdout(StringIO()):
+            copy_directory(self.static, self.docs, assets=AssetManifest.load(manifest_path))
+        assets = AssetManifest.load(manifest_path).assets
+        self.assertEqual(sorted(assets), [os.path.join("images", "a.png"), "index.css"])
+        old_name = assets["index.css"]
+        self.assertEqual(self.read(os.path.join(self.docs, old_name)), "body {}")
+        self.assertEqual(self.read(os.path.join(self.docs, "index.css")), "body {}")
+        # The fingerprinted name shares the plain copy's data
+        self.assertTrue(os.path.samefile(os.path.join(self.docs, old_name), os.path.join(self.docs, "index.css")))
+
+        # A change publishes a new name and removes the old one
+        self.write(os.path.join(self.static, "index.css"), "body { margin: 0 }")
+        with redirect_stdout(StringIO()):
+            report = copy_directory(self.static, self.docs, assets=AssetManifest.load(manifest_path))
+        new_name = AssetManifest.load(manifest_path).assets["index.css"]
+        self.assertNotEqual(new_name, old_name)
+        self.assertEqual((report.copied_files, report.linked_files), (1, 1))
+        self.assertEqual(report.removed_files, 1)
+        self.assertFalse(os.path.exists(os.path.join(self.docs, old_name)))
+        self.assertEqual(self.read(os.path.join(self.docs, new_name)), "body { margin: 0 }")
+
+    def test_image_sizes_are_recorded_and_saved(self):
+        table_path = os.path.join(self.docs, ".image-sizes.json")
+        with open(os.path.join(self.static, "images", "a.png"), 'wb') as file:
+            file.write(b"\x89PNG\r\n\x1a\n\x00\x00\x00\x0dIHDR\x00\x00\x00\x10\x00\x00\x00\x08")
+        with redirect_stdout(StringIO()):
+            copy_directory(self.static, self.docs, images=ImageSizes.load(table_path))
+        self.assertEqual(ImageSizes.load(table_path).sizes(), {"images/a.png": [16, 8]})
+
+    def test_missing_source(self):
+        with redirect_stdout(StringIO()):
+            report = copy_directory(os.path.join(self.tmp.name, "missing"), self.docs)
+        self.assertEqual(report.copied_files, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+import http.client
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from watch import LiveReloadServer, RELOAD_PATH, RELOAD_SCRIPT, diff_snapshots, inject_reload_script, snapshot, watch
+
+
+class TestSnapshots(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        return path
+
+    def test_snapshot_files_and_directories(self):
+        page = self.write(os.path.join("content", "index.md"), "# Home")
+        template = self.write("template.html", "<html></html>")
+        files = snapshot([os.path.join(self.dir, "content"), template])
+        self.assertEqual(sorted(files), sorted([page, template]))
+
+    def test_diff_snapshots(self):
+        kept = self.write("kept.md", "kept")
+        changed = self.write("changed.md", "before")
+        removed = self.write("removed.md", "removed")
+        before = snapshot([self.dir])
+
+        self.write("changed.md", "after, and longer")
+        os.unlink(removed)
+        added = self.write("added.md", "added")
+        after = snapshot([self.dir])
+
+        self.assertEqual(diff_snapshots(before, after), sorted([changed, removed, added]))
+        self.assertNotIn(kept, diff_snapshots(before, after))
+        self.assertEqual(diff_snapshots(after, after), [])
+
+    def test_incremental_snapshots_match_full_ones(self):
+        directories = {}
+        self.write(os.path.join("a", "kept.md"), "kept")
+        removed = self.write(os.path.join("a", "b", "removed.md"), "removed")
+        self.assertEqual(snapshot([self.dir], directories), snapshot([self.dir]))
+
+        self.write(os.path.join("a", "kept.md"), "changed, and longer")
+        os.unlink(removed)
+        os.rmdir(os.path.dirname(removed))
+        self.write(os.path.join("c", "added.md"), "added")
+        self.assertEqual(snapshot([self.dir], directories), snapshot([self.dir]))
+        self.assertNotIn(os.path.dirname(removed), directories)
+
+    def test_unchanged_directories_are_not_listed_again(self):
+        page = self.write(os.path.join("content", "index.md"), "# Home")
+        # Old enough that a listing can't have raced a change
+        for path in (os.path.dirname(page), self.dir):
+            os.utime(path, ns=(0, 0))
+        directories = {}
+        snapshot([self.dir], directories)
+
+        self.write(os.path.join("content", "index.md"), "# Home, edited")
+        os.utime(os.path.dirname(page), ns=(0, 0))
+        with mock.patch("os.scandir", side_effect=AssertionError("listed again")):
+            files = snapshot([self.dir], directories)
+        self.assertEqual(files, snapshot([self.dir]))
+
+
+class StopWatching(Exception):
+    pass
+
+
+class TestWatch(unittest.TestCase):
+    def test_edit_is_noticed_well_under_100ms(self):
+        # A one-page rebuild takes a few ms, so noticing the edit is most of
+        # the save-to-reload time
+        with tempfile.TemporaryDirectory() as content:
+            for i in range(500):
+                path = os.path.join(content, f"section{i % 20}", f"page{i}.md")
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'w', encoding='utf-8') as file:
+                    file.write(f"# Page {i}")
+            page = os.path.join(content, "section3", "page3.md")
+            noticed = []
+
+            def on_change(changed):
+                noticed.append((time.perf_counter(), changed))
+                raise StopWatching
+
+            def run():
+                with self.assertRaises(StopWatching):
+                    watch([content], on_change)
+
+            thread = threading.Thread(target=run)
+            thread.start()
+            # Let the first snapshot finish
+            time.sleep(0.2)
+            saved = time.perf_counter()
+            with open(page, 'w', encoding='utf-8') as file:
+                file.write("# Page 3, edited")
+            thread.join(5)
+
+            self.assertEqual(len(noticed), 1)
+            noticed_at, changed = noticed[0]
+            self.assertEqual(changed, [page])
+            self.assertLess(noticed_at - saved, 0.08)
+
+
+class TestInjectReloadScript(unittest.TestCase):
+    def test_injects_before_body_close(self):
+        html = "<html><body><p>Hi</p></body></html>"
+        self.assertEqual(inject_reload_script(html), f"<html><body><p>Hi</p>{RELOAD_SCRIPT}</body></html>")
+
+    def test_appends_without_body(self):
+        self.assertEqual(inject_reload_script("<p>Hi</p>"), "<p>Hi</p>" + RELOAD_SCRIPT)
+
+
+class TestLiveReloadServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.tmp.name, "index.html"), 'w', encoding='utf-8') as file:
+            file.write("<html><body>Home</body></html>")
+        self.server = LiveReloadServer(self.tmp.name, port=0, host="127.0.0.1")
+        self.server.start()
+        self.port = self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def get(self, path):
+        connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=5)
+        connection.request("GET", path)
+        return connection.getresponse()
+
+    def test_html_pages_get_reload_script(self):
+        response = self.get("/")
+        self.assertEqual(response.status, 200)
+        self.assertIn(RELOAD_SCRIPT, response.read().decode('utf-8'))
+
+    def test_reload_event(self):
+        response = self.get(RELOAD_PATH)
+        self.assertEqual(response.getheader("Content-Type"), "text/event-stream")
+
+        lines = []
+        reader = threading.Thread(target=lambda: lines.append(response.fp.readline()))
+        reader.start()
+        # Keep notifying until the handler has subscribed and picked one up
+        while reader.is_alive():
+            self.server.notify_reload()
+            reader.join(0.05)
+        self.assertEqual(lines, [b"data: reload\n"])
+
+
+if __name__ == "__main__":
+    unittest.main()
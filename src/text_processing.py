@@ -1,5 +1,5 @@
 from htmlnode import TextNode, TextType
-from markdown import extract_markdown_images, extract_markdown_links
+from markdown import iter_markdown_spans
 
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
     """
@@ -67,17 +67,13 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
     return new_nodes
 
 
-def split_nodes_image(old_nodes):
+def _split_nodes_spans(old_nodes, images):
     """
-    Split TextNodes of type TEXT that contain markdown image syntax ![alt](url).
-    
-    Args:
-        old_nodes: List of TextNode objects
-    
-    Returns:
-        List of TextNode objects with markdown images converted to IMAGE nodes
+    Split TextNodes of type TEXT around either their markdown images or their
+    markdown links, using the spans found by a single scan of each node.
     """
     new_nodes = []
+    text_type = TextType.IMAGE if images else TextType.LINK
     
     for old_node in old_nodes:
         # Only process TEXT type nodes, add others as-is
@@ -87,46 +83,47 @@ def split_nodes_image(old_nodes):
         
         # Process the text for this node
         text = old_node.text
+        split_nodes = []
+        position = 0
         
-        # Extract all markdown images
-        images = extract_markdown_images(text)
-        
-        if not images:
-            # No images found, keep the node as is
-            new_nodes.append(old_node)
-            continue
-        
-        # Process text with images
-        remaining_text = text
-        
-        for alt_text, url in images:
-            # Find the position of the image syntax
-            image_syntax = f"![{alt_text}]({url})"
-            start_pos = remaining_text.find(image_syntax)
-            
-            if start_pos == -1:
-                # This shouldn't happen if extract_markdown_images is working correctly
+        for start, end, is_image, label, url in iter_markdown_spans(text):
+            if is_image != images:
                 continue
             
-            # Add text before the image if it exists
-            if start_pos > 0:
-                new_nodes.append(TextNode(remaining_text[:start_pos], TextType.TEXT))
+            # Add text before the image or link if it exists
+            if start > position:
+                split_nodes.append(TextNode(text[position:start], TextType.TEXT))
             
-            # Add the image node
-            image_node = TextNode(alt_text, TextType.IMAGE)
-            image_node.set_url(url)
-            new_nodes.append(image_node)
-            
-            # Update remaining text
-            remaining_text = remaining_text[start_pos + len(image_syntax):]
+            # Add the image or link node
+            split_nodes.append(TextNode(label, text_type).set_url(url))
+            position = end
+        
+        if not split_nodes:
+            # Nothing found, keep the node as is
+            new_nodes.append(old_node)
+            continue
         
         # Add any remaining text
-        if remaining_text:
-            new_nodes.append(TextNode(remaining_text, TextType.TEXT))
+        if position < len(text):
+            split_nodes.append(TextNode(text[position:], TextType.TEXT))
+        new_nodes.extend(split_nodes)
     
     return new_nodes
 
 
+def split_nodes_image(old_nodes):
+    """
+    Split TextNodes of type TEXT that contain markdown image syntax ![alt](url).
+    
+    Args:
+        old_nodes: List of TextNode objects
+    
+    Returns:
+        List of TextNode objects with markdown images converted to IMAGE nodes
+    """
+    return _split_nodes_spans(old_nodes, images=True)
+
+
 def split_nodes_link(old_nodes):
     """
     Split TextNodes of type TEXT that contain markdown link syntax [text](url).
@@ -137,53 +134,4 @@ def split_nodes_link(old_nodes):
     Returns:
         List of TextNode objects with markdown links converted to LINK nodes
     """
-    new_nodes = []
-    
-    for old_node in old_nodes:
-        # Only process TEXT type nodes, add others as-is
-        if old_node.text_type != TextType.TEXT:
-            new_nodes.append(old_node)
-            continue
-        
-        # Process the text for this node
-        text = old_node.text
-        
-        # Extract all markdown links (but not images)
-        links = extract_markdown_links(text)
-        # Filter out any image matches that might have been caught
-        links = [(anchor, url) for anchor, url in links if not text.find(f"![{anchor}]({url})") >= 0]
-        
-        if not links:
-            # No links found, keep the node as is
-            new_nodes.append(old_node)
-            continue
-        
-        # Process text with links
-        remaining_text = text
-        
-        for anchor_text, url in links:
-            # Find the position of the link syntax
-            link_syntax = f"[{anchor_text}]({url})"
-            start_pos = remaining_text.find(link_syntax)
-            
-            if start_pos == -1:
-                # This shouldn't happen if extract_markdown_links is working correctly
-                continue
-            
-            # Add text before the link if it exists
-            if start_pos > 0:
-                new_nodes.append(TextNode(remaining_text[:start_pos], TextType.TEXT))
-            
-            # Add the link node
-            link_node = TextNode(anchor_text, TextType.LINK)
-            link_node.set_url(url)
-            new_nodes.append(link_node)
-            
-            # Update remaining text
-            remaining_text = remaining_text[start_pos + len(link_syntax):]
-        
-        # Add any remaining text
-        if remaining_text:
-            new_nodes.append(TextNode(remaining_text, TextType.TEXT))
-    
-    return new_nodes
\ No newline at end of file
+    return _split_nodes_spans(old_nodes, images=False)
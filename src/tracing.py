@@ -0,0 +1,148 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from time import perf_counter_ns
+
+# The recorder collecting spans in this process while tracing, if any
+_recorder = None
+
+
+def make_event(name, category, start_ns, end_ns, args=None):
+    """
+    Build a complete ("X") trace event for a span in the calling thread.
+
+    Timestamps are perf_counter_ns values, which share one clock across
+    the processes of a build, so events made in worker processes line up
+    with the parent's once they are sent back to it.
+
+    Args:
+        name: Span name shown in the trace viewer
+        category: Comma-separated categories for filtering
+        start_ns: perf_counter_ns() when the span started
+        end_ns: perf_counter_ns() when the span ended
+        args: Optional dict of extra details shown for the span
+
+    Returns:
+        dict: The event, with raw nanosecond timestamps
+    """
+    event = {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": start_ns,
+        "dur": end_ns - start_ns,
+        "pid": os.getpid(),
+        "tid": threading.get_native_id(),
+    }
+    if args:
+        event["args"] = args
+    return event
+
+
+class TraceRecorder:
+    """
+    Collects spans and writes them in the Trace Event Format, which trace
+    viewers such as Perfetto and chrome://tracing open directly.
+    """
+
+    def __init__(self):
+        self.origin_ns = perf_counter_ns()
+        self.events = []
+
+    def add(self, event):
+        """
+        Record an event made by make_event, in this or a worker process.
+        """
+        self.events.append(event)
+
+    def to_json(self):
+        """
+        Return the trace as a JSON-serializable dict.
+
+        Timestamps are converted to microseconds since the recorder started,
+        and every process is named so workers are told apart in the viewer.
+        """
+        parent = os.getpid()
+        pids = sorted({event["pid"] for event in self.events} | {parent})
+        trace_events = []
+        for number, pid in enumerate(pid for pid in pids if pid != parent):
+            trace_events.append(_process_name(pid, f"worker {number + 1} (pid {pid})"))
+        trace_events.append(_process_name(parent, f"build (pid {parent})"))
+
+        for event in sorted(self.events, key=lambda event: event["ts"]):
+            event = dict(event)
+            event["ts"] = (event["ts"] - self.origin_ns) / 1000
+            event["dur"] = event["dur"] / 1000
+            trace_events.append(event)
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write(self, path):
+        """
+        Write the trace to a JSON file.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_json(), file)
+
+
+def _process_name(pid, name):
+    return {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": name}}
+
+
+def start_tracing():
+    """
+    Start recording spans in this process.
+
+    Returns:
+        TraceRecorder: The recorder spans are added to
+    """
+    global _recorder
+    _recorder = TraceRecorder()
+    return _recorder
+
+
+def stop_tracing():
+    """
+    Stop recording spans.
+
+    Returns:
+        TraceRecorder: The recorder that was active, or None
+    """
+    global _recorder
+    recorder, _recorder = _recorder, None
+    return recorder
+
+
+def is_tracing():
+    return _recorder is not None
+
+
+def add_event(event):
+    """
+    Add an event to the active recorder, if tracing.
+    """
+    if _recorder is not None:
+        _recorder.add(event)
+
+
+@contextmanager
+def span(name, category="build", **args):
+    """
+    Record the time spent in a with block as a span. Does nothing unless
+    tracing is on.
+
+    Args:
+        name: Span name shown in the trace viewer
+        category: Comma-separated categories for filtering
+        **args: Extra details shown for the span
+    """
+    if _recorder is None:
+        yield
+        return
+    start = perf_counter_ns()
+    try:
+        yield
+    finally:
+        # The recorder may have been stopped inside the block
+        add_event(make_event(name, category, start, perf_counter_ns(), args))
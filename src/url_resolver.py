@@ -0,0 +1,133 @@
+from assets import fingerprint_path
+
+
+def static_path(url):
+    """
+    Return the static file path a root-relative URL names, without its
+    leading slash, query string or fragment, or None for other URLs.
+    """
+    if not url.startswith("/") or url.startswith("//"):
+        return None
+    for separator in "?#":
+        url = url.split(separator, 1)[0]
+    return url[1:]
+
+
+class UrlResolver:
+    """
+    Resolves the URLs of links and images to what a page should point at.
+
+    Root-relative URLs ("/blog/post") are moved under the basepath
+    ("/repo/blog/post"). Relative URLs, absolute URLs, fragments and
+    protocol-relative URLs ("//cdn.example.com/x") are left alone. With an
+    asset table, root-relative URLs of static files are also pointed at
+    their fingerprinted names ("/index.css" -> "/index.1a2b3c4d.css").
+    With an image size table, the dimensions of images are looked up by
+    the same root-relative URLs. Which entries of either table a page used
+    is reported by dependencies(), so a page only depends on the static
+    files it links to and shows rather than on the whole tables.
+
+    The resolver is applied to href and src props as link and image nodes
+    are built, so text that merely looks like a URL attribute, such as an
+    example inside a code block, is never touched. A site links to the same
+    targets over and over, so every resolved URL is memoized; one resolver
+    serves a whole build.
+    """
+
+    def __init__(self, basepath="/", assets=None, image_sizes=None):
+        self.basepath = basepath
+        self.assets = assets or {}
+        self.image_sizes = image_sizes or {}
+        self._resolved = {}
+        # A string that differs between resolvers that resolve some URL
+        # differently, for keying cached pages
+        self.cache_key = f"basepath={basepath}"
+
+    def resolve(self, url):
+        """
+        Return the URL a page should use for url.
+        """
+        try:
+            return self._resolved[url]
+        except KeyError:
+            pass
+        resolved = self._resolve(url)
+        self._resolved[url] = resolved
+        return resolved
+
+    def _resolve(self, url):
+        if not url.startswith("/") or url.startswith("//"):
+            return url
+        path = url[1:]
+        if self.assets:
+            path = fingerprint_path(path, self.assets)
+        return self.basepath + path
+
+    def image_size(self, url):
+        """
+        Return the [width, height] of the static image url points at, or
+        None if it is unknown, such as for relative or absolute URLs.
+        """
+        if not self.image_sizes:
+            return None
+        path = static_path(url)
+        return None if path is None else self.image_sizes.get(path)
+
+    @property
+    def has_tables(self):
+        """
+        Whether pages depend on static file tables, so their dependencies()
+        need recording.
+        """
+        return bool(self.assets or self.image_sizes)
+
+    def dependencies(self, links):
+        """
+        Return the static file table entries a page was rendered with.
+
+        Args:
+            links: The page's [kind, url] pairs, as collected by
+                link_checker.PageLinks
+
+        Returns:
+            dict: One key per table that is set: "assets" maps the static
+            path of every root-relative URL to its fingerprinted name, and
+            "images" the static path of every root-relative image to its
+            [width, height]. Paths without an entry map to None. Record it
+            with the page and pass it to dependencies_match() to find out
+            whether the page is still current.
+        """
+        dependencies = {}
+        if self.assets:
+            dependencies["assets"] = {}
+        if self.image_sizes:
+            dependencies["images"] = {}
+        if not dependencies:
+            return dependencies
+        for kind, url in links:
+            path = static_path(url)
+            if path is None:
+                continue
+            if self.assets:
+                dependencies["assets"][path] = self.assets.get(path)
+            if self.image_sizes and kind == "image":
+                dependencies["images"][path] = self.image_sizes.get(path)
+        return dependencies
+
+    def dependencies_match(self, dependencies):
+        """
+        Check whether a page recorded with dependencies() would render the
+        same with this resolver's tables.
+
+        A page rendered without a table does not match while the table is
+        set, and one that used entries of a table no longer set does not
+        match either.
+        """
+        for name, table in (("assets", self.assets), ("images", self.image_sizes)):
+            recorded = dependencies.get(name)
+            if recorded is None:
+                if table:
+                    return False
+            elif not all(table.get(path) == value for path, value in recorded.items()):
+                return False
+        return True
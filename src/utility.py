@@ -1,52 +1,304 @@
+import hashlib
+import json
 import os
 import shutil
+from contextlib import contextmanager
+from tracing import span
 
-def copy_directory(source_dir, dest_dir):
+# Records which files in the destination were copied from the source
+# directory, so files that disappear from the source can be removed without
+# touching anything else in the destination (such as generated pages)
+SYNC_MANIFEST_FILENAME = ".static-manifest.json"
+
+
+def hash_file(path):
+    """
+    Compute the SHA-256 hex digest of a file's contents.
+
+    Args:
+        path: Path to the file to hash
+
+    Returns:
+        The hex digest string
     """
-    Recursively copies all contents from source_dir to dest_dir.
-    First deletes all contents of dest_dir to ensure a clean copy.
-    
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_file(path, fingerprints, key=None, stat=None):
+    """
+    Return the content hash of a file, re-reading it only when its size or
+    modification time differs from the fingerprint recorded for it.
+
+    Args:
+        path: Path to the file
+        fingerprints: Dict of key -> size, mtime and hash, updated in place
+        key: Key the fingerprint is recorded under (defaults to path)
+        stat: The file's os.stat result, if the caller already has it
+
+    Returns:
+        The hex digest of the file's contents
+    """
+    if key is None:
+        key = path
+    if stat is None:
+        stat = os.stat(path)
+    cached = fingerprints.get(key)
+    if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+        return cached["hash"]
+
+    content_hash = hash_file(path)
+    fingerprints[key] = {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "hash": content_hash,
+    }
+    return content_hash
+
+
+@contextmanager
+def open_for_replace(path, mode='w', encoding='utf-8'):
+    """
+    Open a temporary file that replaces path once it is closed.
+
+    Readers never see a half-written file, and if path is a hard link
+    shared with another directory the other copy is left untouched. If the
+    block raises, the temporary file is removed and path is unchanged.
+
+    Args:
+        path: Path of the file to write
+        mode: 'w' for text or 'wb' for bytes
+        encoding: Text encoding (ignored in binary mode)
+    """
+    temp_path = path + ".tmp"
+    if 'b' in mode:
+        encoding = None
+    try:
+        with open(temp_path, mode, encoding=encoding) as file:
+            yield file
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+class SyncReport:
+    """
+    Counts of what a directory sync did.
+    """
+
+    def __init__(self):
+        # Paths of every file the destination holds from the source,
+        # relative to it
+        self.files = set()
+        self.copied_files = 0
+        self.copied_bytes = 0
+        self.linked_files = 0
+        self.skipped_files = 0
+        self.skipped_bytes = 0
+        self.removed_files = 0
+
+    def __repr__(self):
+        return (f"SyncReport(copied={self.copied_files} files/{self.copied_bytes} bytes, "
+                f"skipped={self.skipped_files} files/{self.skipped_bytes} bytes, "
+                f"removed={self.removed_files} files)")
+
+
+def _is_unchanged(source_path, dest_path, source_stat, checksum):
+    """
+    Check whether dest_path already holds the same file as source_path.
+
+    Without checksum, files match when size and modification time match
+    (copies keep the source's modification time). With checksum, files
+    of the same size are compared by content hash.
+    """
+    try:
+        dest_stat = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+
+    if dest_stat.st_size != source_stat.st_size:
+        return False
+
+    if checksum:
+        return hash_file(source_path) == hash_file(dest_path)
+
+    return dest_stat.st_mtime_ns == source_stat.st_mtime_ns
+
+
+def _copy_file(source_path, dest_path):
+    """
+    Copy a file with its metadata, replacing any existing destination file.
+
+    The copy is written next to the destination and renamed over it, so a
+    reader never sees a half-written file and an existing file that is
+    hard-linked elsewhere is replaced rather than overwritten in place.
+    """
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    temp_path = dest_path + ".tmp"
+    shutil.copy2(source_path, temp_path)
+    os.replace(temp_path, dest_path)
+
+
+def _link_file(existing_path, dest_path):
+    """
+    Hard-link dest_path to an existing file, replacing any existing
+    destination file the same way _copy_file does.
+
+    Returns:
+        bool: False if the file system can't link it, in which case nothing
+        was changed
+    """
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    temp_path = dest_path + ".tmp"
+    try:
+        if os.path.lexists(temp_path):
+            os.unlink(temp_path)
+        os.link(existing_path, temp_path)
+    except OSError:
+        return False
+    os.replace(temp_path, dest_path)
+    return True
+
+
+def remove_output(path):
+    """
+    Remove an output file along with the .gz sibling compression.py may
+    have written for it, so a build without --gzip leaves no orphaned .gz.
+    """
+    os.unlink(path)
+    try:
+        os.unlink(path + ".gz")
+    except FileNotFoundError:
+        pass
+
+
+def _remove_empty_dirs(path, stop_dir):
+    """
+    Remove path and its parents while they are empty, stopping at stop_dir.
+    """
+    stop_dir = os.path.abspath(stop_dir)
+    path = os.path.abspath(path)
+    while path != stop_dir and path.startswith(stop_dir):
+        try:
+            os.rmdir(path)
+        except OSError:
+            return
+        path = os.path.dirname(path)
+
+
+def copy_directory(source_dir, dest_dir, checksum=False, assets=None, images=None):
+    """
+    Sync all contents of source_dir into dest_dir.
+
+    Only files that are new or changed are copied. A file is unchanged when
+    its size and modification time match the copy in dest_dir, or, with
+    checksum, when its content hash matches. Files previously copied from
+    source_dir that no longer exist there are removed. Other files in
+    dest_dir are left alone.
+
+    With assets (an assets.AssetManifest), every file is also published
+    under its fingerprinted name, as a hard link to the plain copy where
+    the file system allows it, and the manifest is updated and saved. With
+    images (an image_size.ImageSizes), the dimensions of every PNG and JPEG
+    are recorded, and the table is saved.
+
     Args:
         source_dir: Path to the source directory
         dest_dir: Path to the destination directory
+        checksum: Whether to compare file contents instead of modification times
+        assets: Optional AssetManifest recording the fingerprinted names
+        images: Optional ImageSizes recording image dimensions
+
+    Returns:
+        SyncReport: What was copied, skipped and removed
     """
+    report = SyncReport()
+
     # Make sure the source directory exists
     if not os.path.exists(source_dir):
         print(f"Error: Source directory '{source_dir}' does not exist.")
-        return
-    
+        return report
+
     # Create the destination directory if it doesn't exist
     if not os.path.exists(dest_dir):
         print(f"Creating destination directory: {dest_dir}")
         os.makedirs(dest_dir)
-    else:
-        # Delete all contents of the destination directory
-        print(f"Cleaning destination directory: {dest_dir}")
-        for item in os.listdir(dest_dir):
-            item_path = os.path.join(dest_dir, item)
-            try:
-                if os.path.isfile(item_path) or os.path.islink(item_path):
-                    os.unlink(item_path)
-                    print(f"Deleted file: {item_path}")
-                elif os.path.isdir(item_path):
-                    shutil.rmtree(item_path)
-                    print(f"Deleted directory: {item_path}")
-            except Exception as e:
-                print(f"Error: {e}")
-    
-    # Copy all contents from source to destination
-    print(f"Copying from {source_dir} to {dest_dir}")
-    for item in os.listdir(source_dir):
-        s = os.path.join(source_dir, item)
-        d = os.path.join(dest_dir, item)
-        
-        if os.path.isdir(s):
-            # Recursively copy subdirectory
-            print(f"Copying directory: {s} -> {d}")
-            shutil.copytree(s, d, dirs_exist_ok=True)
-        else:
-            # Copy file
-            print(f"Copying file: {s} -> {d}")
-            shutil.copy2(s, d)
-    
-    print("Copy completed successfully!")
\ No newline at end of file
+
+    manifest_path = os.path.join(dest_dir, SYNC_MANIFEST_FILENAME)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as file:
+            previous_files = set(json.load(file))
+    except (OSError, ValueError):
+        previous_files = set()
+
+    # Copy new and changed files from source to destination
+    print(f"Syncing from {source_dir} to {dest_dir}")
+    current_files = set()
+    source_files = set()
+    for root, dirs, files in os.walk(source_dir):
+        dirs.sort()
+        for filename in sorted(files):
+            source_path = os.path.join(root, filename)
+            rel_path = os.path.relpath(source_path, source_dir)
+            source_files.add(rel_path)
+            source_stat = os.stat(source_path)
+
+            # The plain name stays, for references that are not rewritten
+            # (such as url() in stylesheets or /favicon.ico)
+            dest_names = [rel_path]
+            if assets is not None:
+                dest_names.append(assets.add(rel_path, source_path, source_stat))
+            if images is not None:
+                images.add(rel_path, source_path, source_stat)
+
+            plain_path = os.path.join(dest_dir, rel_path)
+            for dest_name in dest_names:
+                dest_path = os.path.join(dest_dir, dest_name)
+                current_files.add(dest_name)
+
+                if _is_unchanged(source_path, dest_path, source_stat, checksum):
+                    report.skipped_files += 1
+                    report.skipped_bytes += source_stat.st_size
+                    continue
+
+                # The plain copy comes first and is current by now, so other
+                # names share its data instead of holding a second copy
+                if dest_path != plain_path and _link_file(plain_path, dest_path):
+                    report.linked_files += 1
+                    continue
+
+                print(f"Copying file: {source_path} -> {dest_path}")
+                with span(dest_name, "static", bytes=source_stat.st_size):
+                    _copy_file(source_path, dest_path)
+                report.copied_files += 1
+                report.copied_bytes += source_stat.st_size
+
+    # Remove files that were copied before but are gone from the source
+    for rel_path in sorted(previous_files - current_files):
+        dest_path = os.path.join(dest_dir, rel_path)
+        if os.path.isfile(dest_path) or os.path.islink(dest_path):
+            remove_output(dest_path)
+            print(f"Deleted file: {dest_path}")
+            report.removed_files += 1
+            _remove_empty_dirs(os.path.dirname(dest_path), dest_dir)
+
+    with open_for_replace(manifest_path) as file:
+        json.dump(sorted(current_files), file, indent=1)
+    report.files = current_files
+
+    if assets is not None:
+        assets.retain(source_files)
+        assets.save()
+    if images is not None:
+        images.retain(source_files)
+        images.save()
+
+    print(f"Copied {report.copied_files} files ({report.copied_bytes} bytes), "
+          f"linked {report.linked_files}, skipped {report.skipped_files} unchanged ({report.skipped_bytes} bytes), "
+          f"removed {report.removed_files}")
+    return report
@@ -0,0 +1,226 @@
+import functools
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+# Path of the server-sent events endpoint that tells browsers to reload
+RELOAD_PATH = "/__livereload"
+
+# Injected into every HTML page the development server sends
+RELOAD_SCRIPT = (
+    f'<script>new EventSource("{RELOAD_PATH}").onmessage = function () {{ location.reload(); }};</script>'
+)
+
+# How often an idle event stream sends a comment to keep the connection open
+KEEPALIVE_SECONDS = 15
+
+# Directories listed less than this long after their last change are listed
+# again on the next poll, since some filesystems only keep mtimes to the second
+RACY_NS = 2_000_000_000
+
+
+def snapshot(paths, directories=None):
+    """
+    Record the size and modification time of every file under the given paths.
+
+    Args:
+        paths: Files or directories to scan
+        directories: Optional dict of the directories seen by an earlier
+            snapshot of the same paths, updated in place. A directory whose
+            mtime has not changed since then is not listed again, so only
+            its files are stat'ed.
+
+    Returns:
+        dict: file path -> (size, mtime_ns)
+    """
+    if directories is None:
+        directories = {}
+    files = {}
+    seen = set()
+    for path in paths:
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            files[path] = (stat.st_size, stat.st_mtime_ns)
+            continue
+        pending = [path]
+        while pending:
+            dir_path = pending.pop()
+            listing = _list_directory(dir_path, directories)
+            if listing is None:
+                continue
+            seen.add(dir_path)
+            filenames, subdirs = listing
+            pending.extend(os.path.join(dir_path, name) for name in subdirs)
+            for filename in filenames:
+                file_path = os.path.join(dir_path, filename)
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    # Removed while we were walking; the next snapshot sees it
+                    continue
+                files[file_path] = (stat.st_size, stat.st_mtime_ns)
+    for dir_path in [dir_path for dir_path in directories if dir_path not in seen]:
+        del directories[dir_path]
+    return files
+
+
+def _list_directory(dir_path, directories):
+    # Returns (file names, subdirectory names), or None if the directory is gone
+    try:
+        mtime_ns = os.stat(dir_path).st_mtime_ns
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    cached = directories.get(dir_path)
+    # A listing taken within RACY_NS of the mtime may have missed an entry
+    # added later in the same tick of a coarse filesystem clock
+    if cached is not None and cached[0] == mtime_ns and cached[1] - mtime_ns >= RACY_NS:
+        return cached[2], cached[3]
+    listed_ns = time.time_ns()
+    filenames, subdirs = [], []
+    try:
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    filenames.append(entry.name)
+                elif not entry.is_symlink():
+                    subdirs.append(entry.name)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    directories[dir_path] = (mtime_ns, listed_ns, filenames, subdirs)
+    return filenames, subdirs
+
+
+def diff_snapshots(before, after):
+    """
+    List the files that were added, changed or removed between two snapshots.
+
+    Returns:
+        list: Sorted paths of every file that differs
+    """
+    changed = {path for path, stat in after.items() if before.get(path) != stat}
+    changed.update(path for path in before if path not in after)
+    return sorted(changed)
+
+
+def inject_reload_script(html):
+    """
+    Add the live reload script to an HTML document, just before </body>.
+    """
+    index = html.rfind("</body>")
+    if index == -1:
+        return html + RELOAD_SCRIPT
+    return html[:index] + RELOAD_SCRIPT + html[index:]
+
+
+class LiveReloadHandler(SimpleHTTPRequestHandler):
+    """
+    Serves the built site, adding the reload script to HTML pages and
+    streaming reload events from RELOAD_PATH.
+    """
+
+    def do_GET(self):
+        request_path = self.path.split("?", 1)[0]
+        if request_path == RELOAD_PATH:
+            self._serve_events()
+            return
+
+        file_path = self.translate_path(self.path)
+        if os.path.isdir(file_path) and request_path.endswith("/"):
+            file_path = os.path.join(file_path, "index.html")
+        if file_path.endswith(".html") and os.path.isfile(file_path):
+            self._serve_html(file_path)
+            return
+
+        super().do_GET()
+
+    def _serve_html(self, file_path):
+        with open(file_path, 'r', encoding='utf-8') as file:
+            body = inject_reload_script(file.read()).encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _serve_events(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        server = self.server
+        generation = server.generation
+        try:
+            while True:
+                with server.changed:
+                    server.changed.wait_for(lambda: server.generation != generation, KEEPALIVE_SECONDS)
+                    current = server.generation
+                if current != generation:
+                    generation = current
+                    self.wfile.write(b"data: reload\n\n")
+                else:
+                    self.wfile.write(b": keepalive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        # Event streams stay open; only log ordinary requests
+        if not self.path.startswith(RELOAD_PATH):
+            super().log_message(format, *args)
+
+
+class LiveReloadServer(ThreadingHTTPServer):
+    """
+    A development server for the built site that can tell every open
+    browser tab to reload.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, directory, port=8888, host=""):
+        handler = functools.partial(LiveReloadHandler, directory=directory)
+        super().__init__((host, port), handler)
+        self.generation = 0
+        self.changed = threading.Condition()
+
+    def start(self):
+        """
+        Serve requests on a background thread.
+        """
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def notify_reload(self):
+        """
+        Send a reload event to every connected browser.
+        """
+        with self.changed:
+            self.generation += 1
+            self.changed.notify_all()
+
+
+def watch(paths, on_change, interval=0.05):
+    """
+    Poll files for changes and report them until interrupted.
+
+    Every poll stats the watched files, but only lists the directories that
+    changed since the previous poll.
+
+    Args:
+        paths: Files or directories to watch
+        on_change: Called with the sorted list of changed paths
+        interval: Seconds between polls
+    """
+    directories = {}
+    previous = snapshot(paths, directories)
+    while True:
+        time.sleep(interval)
+        current = snapshot(paths, directories)
+        changed = diff_snapshots(previous, current)
+        previous = current
+        if changed:
+            on_change(changed)